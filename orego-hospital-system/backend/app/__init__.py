@@ -13,12 +13,28 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    from app.utils.json_provider import create_json_provider
+    app.json = create_json_provider(app)
+    
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
     CORS(app, origins=app.config['CORS_ORIGINS'].split(','))
     migrate.init_app(app, db)
     
+    from app.middleware import tenancy, instrumentation, compression
+    tenancy.init_app(app)
+    # after_request hooks run in reverse order: instrumentation sees the compressed body
+    instrumentation.init_app(app)
+    compression.init_app(app)
+    
+    from app.services import notification_events, notification_service, outbox, discharge_search, slow_query_log
+    notification_events.init_app(app)
+    notification_service.init_app(app)
+    outbox.init_app(app)
+    discharge_search.init_app(app)
+    slow_query_log.init_app(app)
+    
     # Register blueprints
     from app.routes.auth import auth_bp
     from app.routes.users import users_bp
@@ -27,6 +43,10 @@ def create_app(config_class=Config):
     from app.routes.notifications import notifications_bp
     from app.routes.discharges import discharges_bp
     from app.routes.hospital import hospital_bp
+    from app.routes.analytics import analytics_bp
+    from app.routes.reference import reference_bp
+    from app.routes.metrics import metrics_bp
+    from app.routes.diagnostics import diagnostics_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(users_bp, url_prefix='/api/users')
@@ -35,5 +55,16 @@ def create_app(config_class=Config):
     app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
     app.register_blueprint(discharges_bp, url_prefix='/api/discharges')
     app.register_blueprint(hospital_bp, url_prefix='/api/hospital')
+    app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
+    app.register_blueprint(reference_bp, url_prefix='/api/reference')
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(diagnostics_bp, url_prefix='/api/diagnostics')
+    
+    # Register CLI commands
+    from app.commands import notifications_cli, outbox_cli, bookings_cli, discharges_cli
+    app.cli.add_command(notifications_cli)
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(bookings_cli)
+    app.cli.add_command(discharges_cli)
     
     return app
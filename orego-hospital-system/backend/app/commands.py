@@ -0,0 +1,98 @@
+import click
+from flask.cli import AppGroup
+
+notifications_cli = AppGroup('notifications', help='Notification maintenance commands')
+outbox_cli = AppGroup('outbox', help='Transactional outbox worker')
+bookings_cli = AppGroup('bookings', help='Booking maintenance commands')
+discharges_cli = AppGroup('discharges', help='Discharge record commands')
+
+@notifications_cli.command('repair-counters')
+@click.option('--user-id', default=None, help='Only recompute this user')
+@click.option('--batch-size', default=1000, show_default=True, help='Users per transaction')
+def repair_counters(user_id, batch_size):
+    """Recompute cached unread counters from the notification tables"""
+    from app.services import notification_service
+    
+    repaired = notification_service.repair_unread_counters(user_id=user_id, batch_size=batch_size)
+    click.echo(f'Recomputed unread counters for {repaired} users')
+
+@notifications_cli.command('archive')
+@click.option('--batch-size', default=None, type=int, help='Rows per transaction (default NOTIFICATION_ARCHIVE_BATCH_SIZE)')
+@click.option('--dry-run', is_flag=True, help='Only report how many rows would be archived')
+def archive_notifications(batch_size, dry_run):
+    """Archive read notifications and delete broadcasts past their retention period"""
+    from app.services import notification_retention
+    
+    reclaimed = notification_retention.archive_expired_notifications(batch_size=batch_size, dry_run=dry_run)
+    purged = notification_retention.purge_expired_broadcasts(batch_size=batch_size, dry_run=dry_run)
+    
+    verb = 'Would archive' if dry_run else 'Archived'
+    for notification_type, count in reclaimed.items():
+        label = 'other types' if notification_type == '*' else notification_type
+        click.echo(f'{verb} {count} notifications ({label})')
+    click.echo(f'{verb} {sum(reclaimed.values())} notifications in total')
+    
+    verb = 'Would delete' if dry_run else 'Deleted'
+    for notification_type, counts in purged.items():
+        label = 'other types' if notification_type == '*' else notification_type
+        click.echo(f"{verb} {counts['broadcasts']} broadcasts and {counts['receipts']} receipts ({label})")
+
+
+@outbox_cli.command('run')
+@click.option('--once', is_flag=True, help='Drain the pending events and exit')
+def run_outbox(once):
+    """Dispatch pending outbox events (booking and discharge notifications)"""
+    from flask import current_app
+    from app.services import outbox
+    
+    if not once:
+        click.echo('Outbox worker started, press Ctrl+C to stop')
+        outbox.run_worker(current_app._get_current_object())
+        return
+    
+    total = 0
+    while True:
+        processed = outbox.process_batch()
+        total += processed
+        if not processed:
+            break
+    click.echo(f'Dispatched {total} outbox events')
+
+@outbox_cli.command('purge')
+@click.option('--days', default=7, show_default=True, help='Delete processed events older than this')
+def purge_outbox(days):
+    """Delete outbox events that were processed successfully"""
+    from app.services import outbox
+    
+    deleted = outbox.purge_processed(days)
+    click.echo(f'Deleted {deleted} processed outbox events')
+
+@bookings_cli.command('remind')
+@click.option('--once', is_flag=True, help='Send the reminders that are due now and exit')
+def send_reminders(once):
+    """Send reminder notifications for upcoming bookings"""
+    from flask import current_app
+    from app.services import booking_reminders
+    
+    if not once:
+        click.echo('Reminder scheduler started, press Ctrl+C to stop')
+        booking_reminders.run_scheduler(current_app._get_current_object())
+        return
+    
+    sent = booking_reminders.dispatch_due()
+    click.echo(f'Sent {sent} booking reminders')
+
+@discharges_cli.command('export')
+@click.option('--month', default=None, help='YYYY-MM (default: all discharges)')
+@click.option('--format', 'fmt', type=click.Choice(['zip', 'ndjson']), default='zip', show_default=True)
+@click.option('--output', '-o', type=click.File('wb'), required=True, help='Destination file, - for stdout')
+def export_discharges(month, fmt, output):
+    """Export discharge summaries without loading them all into memory"""
+    from app.services import discharge_export
+    
+    date_from, date_to = discharge_export.month_range(month) if month else (None, None)
+    written = 0
+    for chunk in discharge_export.export(fmt, date_from, date_to):
+        output.write(chunk)
+        written += len(chunk)
+    click.echo(f'Wrote {written} bytes', err=True)
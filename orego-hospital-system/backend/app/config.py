@@ -1,4 +1,5 @@
 import os
+import json
 from datetime import timedelta
 
 class Config:
@@ -10,3 +11,54 @@ class Config:
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000')
     CORS_HEADERS = 'Content-Type'
+    
+    # Notification stream (Server-Sent Events)
+    NOTIFICATION_STREAM_BACKEND = os.getenv('NOTIFICATION_STREAM_BACKEND', 'auto')  # auto, local, postgres
+    NOTIFICATION_STREAM_HEARTBEAT = int(os.getenv('NOTIFICATION_STREAM_HEARTBEAT', '15'))
+    NOTIFICATION_STREAM_MAX_SECONDS = int(os.getenv('NOTIFICATION_STREAM_MAX_SECONDS', '300'))
+    NOTIFICATION_STREAM_REPLAY_LIMIT = int(os.getenv('NOTIFICATION_STREAM_REPLAY_LIMIT', '100'))
+    
+    # Notification retention: read notifications older than this many days
+    # (per type) are moved to notifications_archive by `flask notifications archive`,
+    # which also deletes broadcasts (and their receipts) of that age
+    NOTIFICATION_RETENTION_DAYS = json.loads(os.getenv(
+        'NOTIFICATION_RETENTION_DAYS',
+        '{"booking": 90, "discharge": 365, "alert": 30, "general": 60}'
+    ))
+    NOTIFICATION_RETENTION_DEFAULT_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DEFAULT_DAYS', '90'))
+    NOTIFICATION_ARCHIVE_BATCH_SIZE = int(os.getenv('NOTIFICATION_ARCHIVE_BATCH_SIZE', '1000'))
+    
+    # Transactional outbox worker
+    OUTBOX_INPROCESS_WORKER = os.getenv('OUTBOX_INPROCESS_WORKER', 'true').lower() == 'true'
+    OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '100'))
+    OUTBOX_POLL_INTERVAL = float(os.getenv('OUTBOX_POLL_INTERVAL', '1'))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '10'))
+    
+    # Booking reminders (hours before scheduled_date, comma separated)
+    BOOKING_REMINDER_HOURS = [int(hours) for hours in os.getenv('BOOKING_REMINDER_HOURS', '24,1').split(',') if hours.strip()]
+    BOOKING_REMINDER_TICK_SECONDS = int(os.getenv('BOOKING_REMINDER_TICK_SECONDS', '60'))
+    BOOKING_REMINDER_BATCH_SIZE = int(os.getenv('BOOKING_REMINDER_BATCH_SIZE', '500'))
+    
+    # Public hospital profile cache (seconds); also the Cache-Control max-age
+    HOSPITAL_PROFILE_CACHE_SECONDS = int(os.getenv('HOSPITAL_PROFILE_CACHE_SECONDS', '60'))
+    
+    # Response compression (gzip, or brotli when the brotli package is installed)
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))  # bytes; streamed responses are always compressed
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
+    COMPRESSION_MIMETYPES = ['application/json', 'application/x-ndjson', 'text/plain', 'text/html', 'text/csv']
+    
+    # Request metrics at /metrics (Prometheus text format); when METRICS_TOKEN is set
+    # scrapers must send it as a Bearer token. SERVER_TIMING adds a Server-Timing header.
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    SERVER_TIMING = os.getenv('SERVER_TIMING', 'false').lower() == 'true'
+    
+    # Slow-query log (admin: /api/diagnostics/slow-queries); a sample of entries gets an EXPLAIN
+    SLOW_QUERY_LOG_ENABLED = os.getenv('SLOW_QUERY_LOG_ENABLED', 'true').lower() == 'true'
+    SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '200'))
+    SLOW_QUERY_LOG_SIZE = int(os.getenv('SLOW_QUERY_LOG_SIZE', '200'))
+    SLOW_QUERY_EXPLAIN_SAMPLE = float(os.getenv('SLOW_QUERY_EXPLAIN_SAMPLE', '0.1'))  # 0..1
+    
+    # Views over their @query_budget raise QueryBudgetExceeded (always under TESTING) instead of logging a warning
+    QUERY_BUDGET_ENFORCE = os.getenv('QUERY_BUDGET_ENFORCE', 'false').lower() == 'true'
@@ -0,0 +1,121 @@
+"""
+Response compression negotiated with Accept-Encoding: brotli when the
+optional brotli package is installed and the client accepts it, gzip
+otherwise.
+
+Buffered responses are compressed when their body reaches
+COMPRESSION_MIN_SIZE. Streamed responses (size unknown up front) are always
+compressed, chunk by chunk with a sync flush after each one, so every chunk
+still reaches the client as soon as it is produced. Bodies kept in a cache
+are compressed once, at the highest level, with precompress() and served
+with send_precompressed(); the after_request hook leaves them alone.
+
+A compressed body is not byte-for-byte the identity one, so a strong ETag
+is weakened when compressing. Validators set by the app are weak from the
+start (they describe the data, not the bytes), so 200 and 304 responses
+carry the same tag and If-None-Match uses weak comparison. Vary:
+Accept-Encoding keeps shared caches from mixing the encodings.
+"""
+import gzip
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# In order of preference when the client accepts both equally
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def _negotiate(available):
+    best, best_quality = None, 0
+    for encoding in available:
+        quality = request.accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def _compressible(response):
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if 'Content-Encoding' in response.headers or response.direct_passthrough:
+        return False
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return False
+    return response.mimetype in current_app.config['COMPRESSION_MIMETYPES']
+
+def _compressor(encoding):
+    """(compress(chunk) -> bytes flushed up to chunk, finish() -> trailing bytes)"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=current_app.config['COMPRESSION_BROTLI_QUALITY'])
+        return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+    compressor = zlib.compressobj(current_app.config['COMPRESSION_GZIP_LEVEL'], zlib.DEFLATED, 31)  # 31: gzip container
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+def _weaken_etag(response):
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+def _compress_stream(chunks, encoding):
+    compress, finish = _compressor(encoding)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                yield compress(chunk)
+        yield finish()
+    finally:
+        # Closing the wrapper must still close the inner stream (and its request context)
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+def compress_response(response):
+    if not current_app.config['COMPRESSION_ENABLED'] or not _compressible(response):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _negotiate(ENCODINGS)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < current_app.config['COMPRESSION_MIN_SIZE']:
+            return response
+        compress, finish = _compressor(encoding)
+        response.set_data(compress(body) + finish())
+
+    response.headers['Content-Encoding'] = encoding
+    _weaken_etag(response)
+    return response
+
+def precompress(body):
+    """{encoding: body} for a body that is cached and served many times; empty below the size threshold"""
+    if len(body) < current_app.config['COMPRESSION_MIN_SIZE']:
+        return {}
+    variants = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=11)
+    return variants
+
+def send_precompressed(response, variants):
+    """Swap a cached response body for the best precompressed variant the client accepts"""
+    if variants and current_app.config['COMPRESSION_ENABLED']:
+        response.vary.add('Accept-Encoding')
+        encoding = _negotiate([encoding for encoding in ENCODINGS if encoding in variants])
+        if encoding is not None:
+            response.set_data(variants[encoding])
+            response.headers['Content-Encoding'] = encoding
+            _weaken_etag(response)
+    return response
+
+def init_app(app):
+    app.after_request(compress_response)
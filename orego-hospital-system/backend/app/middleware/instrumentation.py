@@ -0,0 +1,215 @@
+"""
+Per-route request metrics: latency, SQL statement count and time, response
+bytes. Rendered in the Prometheus text format by GET /metrics.
+
+before_request starts a RequestStats, the engine's cursor events add every
+statement run while it is current, and the response's close records it, so
+streamed responses are measured to their last byte (including the queries
+they run while streaming) rather than to their first. Series are labelled by
+blueprint, route rule (never the raw path, which would explode the label
+set), method and status.
+
+Figures are per worker process: each gunicorn worker keeps its own registry,
+so scrape every worker or read them as a sample. With SERVER_TIMING on,
+responses also carry a Server-Timing header (app and db time up to the
+moment the headers are sent) for the browser's network panel.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    __slots__ = ('started', 'queries', 'query_seconds')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last one is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Series:
+    __slots__ = ('latency', 'queries', 'query_seconds', 'response_bytes')
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.query_seconds = 0.0
+        self.response_bytes = 0
+
+
+class Registry:
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(self, labels, seconds, queries, query_seconds, response_bytes):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = Series()
+            series.latency.observe(seconds)
+            series.queries.observe(queries)
+            series.query_seconds += query_seconds
+            series.response_bytes += response_bytes
+
+    def snapshot(self):
+        with self._lock:
+            return sorted(self._series.items())
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+registry = Registry()
+
+
+def _label_set(labels, **extra):
+    blueprint, route, method, status = labels
+    pairs = {'blueprint': blueprint, 'route': route, 'method': method, 'status': status, **extra}
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in pairs.items())
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _histogram_lines(name, labels, histogram):
+    cumulative = 0
+    for bound, count in zip((*histogram.buckets, '+Inf'), histogram.counts):
+        cumulative += count
+        yield f'{name}_bucket{{{_label_set(labels, le=bound)}}} {cumulative}'
+    yield f'{name}_sum{{{_label_set(labels)}}} {histogram.total:.6f}'
+    yield f'{name}_count{{{_label_set(labels)}}} {histogram.count}'
+
+
+def render():
+    """The registry in the Prometheus text exposition format (version 0.0.4)"""
+    series = registry.snapshot()
+    lines = [
+        '# HELP orego_http_request_duration_seconds Time from request start to the last response byte.',
+        '# TYPE orego_http_request_duration_seconds histogram',
+    ]
+    for labels, stats in series:
+        lines.extend(_histogram_lines('orego_http_request_duration_seconds', labels, stats.latency))
+
+    lines += [
+        '# HELP orego_http_request_queries SQL statements executed per request.',
+        '# TYPE orego_http_request_queries histogram',
+    ]
+    for labels, stats in series:
+        lines.extend(_histogram_lines('orego_http_request_queries', labels, stats.queries))
+
+    lines += [
+        '# HELP orego_http_request_query_seconds_total Time spent executing SQL statements.',
+        '# TYPE orego_http_request_query_seconds_total counter',
+    ]
+    lines.extend(f'orego_http_request_query_seconds_total{{{_label_set(labels)}}} {stats.query_seconds:.6f}'
+                 for labels, stats in series)
+
+    lines += [
+        '# HELP orego_http_response_bytes_total Response body bytes sent, after compression.',
+        '# TYPE orego_http_response_bytes_total counter',
+    ]
+    lines.extend(f'orego_http_response_bytes_total{{{_label_set(labels)}}} {stats.response_bytes}'
+                 for labels, stats in series)
+
+    return '\n'.join(lines) + '\n'
+
+
+def _current_stats():
+    return g.get('_request_stats') if has_app_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_stats() is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats()
+    started = getattr(context, '_query_started', None)
+    if stats is not None and started is not None:
+        stats.queries += 1
+        stats.query_seconds += time.perf_counter() - started
+
+
+def _start_request():
+    g._request_stats = RequestStats()
+
+
+def _counted(chunks, counter):
+    try:
+        for chunk in chunks:
+            counter[0] += len(chunk)
+            yield chunk
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def _finish_request(response):
+    # The stats stay on g: a streamed body runs its queries after this hook
+    stats = g.get('_request_stats')
+    if stats is None:
+        return response
+
+    rule = request.url_rule
+    labels = (
+        request.blueprint or 'app',
+        rule.rule if rule is not None else 'unmatched',
+        request.method,
+        str(response.status_code)
+    )
+
+    if response.is_streamed:
+        counter = [0]
+        response.response = _counted(response.response, counter)
+        size = lambda: counter[0]
+    else:
+        length = response.calculate_content_length() or 0
+        size = lambda: length
+
+    if current_app.config['SERVER_TIMING']:
+        elapsed = (time.perf_counter() - stats.started) * 1000
+        response.headers.add(
+            'Server-Timing',
+            f'app;dur={elapsed:.1f}, db;dur={stats.query_seconds * 1000:.1f};desc="{stats.queries} queries"'
+        )
+
+    response.call_on_close(lambda: registry.record(
+        labels, time.perf_counter() - stats.started, stats.queries, stats.query_seconds, size()
+    ))
+    return response
+
+
+def init_app(app):
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
@@ -0,0 +1,78 @@
+"""
+Hospital (tenant) scoping, enforced in one place.
+
+The caller's hospital comes from the hospital_id claim of their JWT. Every
+ORM SELECT, UPDATE and DELETE issued while a hospital is known gets
+"hospital_id = :hospital" added for each TenantMixin model it touches, and
+new tenant rows are stamped with their hospital on flush. Requests without
+a hospital (login, public endpoints, ministry-level users) and background
+workers are not scoped; they address rows by id. Checks that must see every
+hospital (globally unique usernames) opt out with
+.execution_options(all_hospitals=True). Lazy and eager relationship loads
+are scoped too, so a row pointing at another hospital's row does not
+reveal it. Core statements on tables (update(Model.__table__), ...) and raw
+text() SQL are not rewritten; code that touches tenant tables that way must
+filter on current_hospital_id() itself (see app.services.allocations and
+app.services.discharge_search).
+"""
+from flask import has_request_context
+from flask_jwt_extended import get_jwt
+from sqlalchemy import event, func
+from sqlalchemy.orm import with_loader_criteria
+
+from app import db
+from app.models.tenant import TenantMixin
+
+def current_hospital_id():
+    if not has_request_context():
+        return None
+    try:
+        return get_jwt().get('hospital_id')
+    except RuntimeError:
+        # No verified JWT in this request
+        return None
+
+def token_claims(user):
+    """Extra JWT claims carrying the user's hospital"""
+    return {'hospital_id': user.hospital_id}
+
+def scoped(statement):
+    """
+    The statement limited to the caller's hospital. The session applies this
+    to everything it executes; read models that execute ORM-enabled selects
+    directly on the Connection (skipping ORM row processing) apply it themselves.
+    """
+    hospital_id = current_hospital_id()
+    if hospital_id is None:
+        return statement
+    return statement.options(
+        with_loader_criteria(TenantMixin, lambda cls: cls.hospital_id == hospital_id, include_aliases=True)
+    )
+
+def _scope_statement(execute_state):
+    if not (execute_state.is_select or execute_state.is_update or execute_state.is_delete):
+        return
+    # Refreshing attributes of an object that was already loaded (and scoped) by primary key
+    if execute_state.is_column_load:
+        return
+    if execute_state.execution_options.get('all_hospitals'):
+        return
+
+    execute_state.statement = scoped(execute_state.statement)
+
+def _assign_hospital(session, flush_context, instances):
+    hospital_id = current_hospital_id()
+    for obj in session.new:
+        if not isinstance(obj, TenantMixin) or obj.hospital_id is not None:
+            continue
+        source = obj.tenant_source()
+        if source is not None:
+            obj.hospital_id = func.coalesce(source, hospital_id) if hospital_id else source
+        elif hospital_id:
+            obj.hospital_id = hospital_id
+
+def init_app(app):
+    if not event.contains(db.session, 'do_orm_execute', _scope_statement):
+        event.listen(db.session, 'do_orm_execute', _scope_statement)
+    if not event.contains(db.session, 'before_flush', _assign_hospital):
+        event.listen(db.session, 'before_flush', _assign_hospital)
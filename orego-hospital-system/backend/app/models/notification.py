@@ -1,8 +1,10 @@
 from app import db
+from app.models.tenant import TenantMixin
+from sqlalchemy import select
 from datetime import datetime
 import uuid
 
-class Notification(db.Model):
+class Notification(TenantMixin, db.Model):
     __tablename__ = 'notifications'
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -14,14 +16,74 @@ class Notification(db.Model):
     related_id = db.Column(db.String(36), nullable=True)  # Related booking/discharge ID
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_notifications_recipient_id_created_at', 'recipient_id', 'created_at'),
+        db.Index('ix_notifications_type_created_at', 'type', 'created_at'),
+    )
+    
+    def tenant_source(self):
+        from app.models.user import User
+        return select(User.hospital_id).where(User.id == self.recipient_id).scalar_subquery()
+    
+    def to_dict(self):
+        from app.schemas.notification import NotificationSchema
+        return NotificationSchema.dump(self)
+
+class BroadcastNotification(db.Model):
+    __tablename__ = 'broadcast_notifications'
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    title = db.Column(db.String(200), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    type = db.Column(db.String(50), nullable=False, default='general')
+    audience_role = db.Column(db.String(20), nullable=True)  # None = every user
+    hospital_id = db.Column(db.String(36), db.ForeignKey('hospitals.id'), nullable=True, index=True)  # None = every hospital
+    created_by = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    # Relationships
+    receipts = db.relationship('BroadcastReceipt', backref='broadcast', lazy=True, cascade='all, delete-orphan')
+    
     def to_dict(self):
         return {
             'id': self.id,
-            'recipient_id': self.recipient_id,
+            'recipient_id': None,
             'title': self.title,
             'message': self.message,
             'type': self.type,
-            'is_read': self.is_read,
-            'related_id': self.related_id,
+            'is_read': False,
+            'related_id': None,
+            'is_broadcast': True,
+            'audience_role': self.audience_role,
+            'hospital_id': self.hospital_id,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+class BroadcastReceipt(db.Model):
+    __tablename__ = 'broadcast_receipts'  # No row means the user has not read the broadcast
+    
+    broadcast_id = db.Column(db.String(36), db.ForeignKey('broadcast_notifications.id'), primary_key=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), primary_key=True)
+    read_at = db.Column(db.DateTime, nullable=True)
+    dismissed_at = db.Column(db.DateTime, nullable=True)
+
+class NotificationCounter(db.Model):
+    __tablename__ = 'notification_counters'  # Cached unread total per user, kept in step by notification_service
+    
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), primary_key=True)
+    unread_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class NotificationArchive(db.Model):
+    __tablename__ = 'notifications_archive'  # Read notifications moved out by the retention job
+    
+    id = db.Column(db.String(36), primary_key=True)
+    recipient_id = db.Column(db.String(36), nullable=False, index=True)
+    title = db.Column(db.String(200), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    type = db.Column(db.String(50), nullable=False)
+    is_read = db.Column(db.Boolean, default=True)
+    related_id = db.Column(db.String(36), nullable=True)
+    hospital_id = db.Column(db.String(36), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -1,8 +1,9 @@
 from app import db
+from app.models.tenant import TenantMixin
 from datetime import datetime
 import uuid
 
-class Resource(db.Model):
+class Resource(TenantMixin, db.Model):
     __tablename__ = 'resources'
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -20,32 +21,11 @@ class Resource(db.Model):
     description = db.Column(db.Text, nullable=True)
     registered_date = db.Column(db.Date, default=datetime.utcnow)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     booking_resources = db.relationship('BookingResource', backref='resource', lazy=True, cascade='all, delete-orphan')
     
     def to_dict(self):
-        identifier = None
-        if self.type == 'bed':
-            identifier = f"Ward: {self.ward_id}, Bed: {self.bed_number}"
-        elif self.type == 'operation_theatre':
-            identifier = f"OT-{self.ot_number}"
-        elif self.type == 'machine':
-            identifier = f"SN: {self.serial_number}"
-            
-        return {
-            'id': self.id,
-            'type': self.type,
-            'name': self.name,
-            'status': self.status,
-            'ward_id': self.ward_id,
-            'bed_number': self.bed_number,
-            'ot_number': self.ot_number,
-            'serial_number': self.serial_number,
-            'identifier': identifier,
-            'location': self.location,
-            'description': self.description,
-            'registered_date': self.registered_date.isoformat() if self.registered_date else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        from app.schemas.resource import ResourceSchema
+        return ResourceSchema.dump(self)
@@ -0,0 +1,17 @@
+from app import db
+from sqlalchemy.orm import declared_attr
+
+class TenantMixin:
+    """
+    Rows owned by one hospital. Reads are scoped to the caller's hospital and
+    new rows get it filled in by app.middleware.tenancy; a NULL hospital_id
+    belongs to no hospital (e.g. ministry-level admins).
+    """
+    
+    @declared_attr
+    def hospital_id(cls):
+        return db.Column(db.String(36), db.ForeignKey('hospitals.id'), nullable=True, index=True)
+    
+    def tenant_source(self):
+        """SQL expression for the owning hospital when it follows from another row, else None"""
+        return None
@@ -1,8 +1,9 @@
 from app import db
+from app.models.tenant import TenantMixin
 from datetime import datetime
 import uuid
 
-class User(db.Model):
+class User(TenantMixin, db.Model):
     __tablename__ = 'users'
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -28,7 +29,7 @@ class User(db.Model):
     reset_token = db.Column(db.String(100), nullable=True)
     reset_token_expiry = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     last_login = db.Column(db.DateTime, nullable=True)
     
     # Relationships
@@ -37,20 +38,5 @@ class User(db.Model):
     notifications = db.relationship('Notification', backref='recipient', lazy=True)
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'username': self.username,
-            'role': self.role,
-            'name': self.name,
-            'birthday': self.birthday.isoformat() if self.birthday else None,
-            'id_card_number': self.id_card_number,
-            'address': self.address,
-            'phone_number': self.phone_number,
-            'email': self.email,
-            'speciality': self.speciality,
-            'medical_status': self.medical_status,
-            'operation_type': self.operation_type,
-            'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None
-        }
+        from app.schemas.user import UserSchema
+        return UserSchema.dump(self)
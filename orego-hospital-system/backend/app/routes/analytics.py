@@ -0,0 +1,43 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.models.discharge import Discharge
+from app.models.user import User
+from app.middleware.auth_middleware import role_required, get_current_user
+from app.services import discharge_analytics
+from app.utils.conditional import collection_validators, embedded_versions, is_not_modified, not_modified, with_validators
+from datetime import datetime
+
+analytics_bp = Blueprint('analytics', __name__)
+
+@analytics_bp.route('/discharges', methods=['GET'])
+@jwt_required()
+@role_required('admin', 'doctor')
+def discharge_analytics_report():
+    """Length of stay, disease/doctor/month breakdowns and readmissions (?from=&to=&doctor_id=)"""
+    try:
+        current_user = get_current_user()
+        
+        try:
+            date_from = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') else None
+            date_to = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') else None
+        except ValueError:
+            return jsonify({'error': 'from and to must be dates (YYYY-MM-DD)'}), 400
+        
+        # Doctors only see their own discharges
+        doctor_id = current_user.id if current_user.role == 'doctor' else request.args.get('doctor_id')
+        
+        criteria = discharge_analytics.report_criteria(date_from, date_to, doctor_id)
+        query = Discharge.query.filter(*criteria)
+        # The report names each doctor
+        validators = collection_validators(
+            query, Discharge.updated_at, *embedded_versions(User, query.with_entities(Discharge.doctor_id).statement)
+        )
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        report = discharge_analytics.discharge_report(criteria)
+        
+        return with_validators(jsonify(report), validators), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from app import db
 from app.models.user import User
+from app.middleware.tenancy import token_claims
 from app.utils.security import check_password, hash_password
 from datetime import datetime, timedelta
 import secrets
@@ -28,13 +29,16 @@ def login():
         if not user.is_active:
             return jsonify({'error': 'Account is deactivated. Please contact administrator.'}), 403
         
-        # Update last login
-        user.last_login = datetime.utcnow()
+        # Update last login. updated_at is set to itself so it keeps meaning "record edited": bumping it on
+        # every login would invalidate the ETag of every response that embeds this user's name
+        User.query.filter_by(id=user.id).update(
+            {User.last_login: datetime.utcnow(), User.updated_at: User.updated_at}, synchronize_session='fetch'
+        )
         db.session.commit()
         
         # Create tokens
-        access_token = create_access_token(identity=user.id)
-        refresh_token = create_refresh_token(identity=user.id)
+        access_token = create_access_token(identity=user.id, additional_claims=token_claims(user))
+        refresh_token = create_refresh_token(identity=user.id, additional_claims=token_claims(user))
         
         return jsonify({
             'message': 'Login successful',
@@ -51,8 +55,14 @@ def login():
 def refresh():
     """Refresh access token"""
     try:
-        user_id = get_jwt_identity()
-        access_token = create_access_token(identity=user_id)
+        # Claims come from the database, not the old token, so a moved or deactivated user does not keep
+        # them; unscoped, since the old token's hospital may no longer be the user's
+        user = User.query.execution_options(all_hospitals=True).get(get_jwt_identity())
+        
+        if not user or not user.is_active:
+            return jsonify({'error': 'Access denied'}), 403
+        
+        access_token = create_access_token(identity=user.id, additional_claims=token_claims(user))
         return jsonify({'access_token': access_token}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -4,12 +4,35 @@ from app import db
 from app.models.booking import Booking, BookingResource
 from app.models.resource import Resource
 from app.models.user import User
-from app.models.notification import Notification
+from app.schemas.booking import BookingSchema
 from app.middleware.auth_middleware import role_required, get_current_user
+from app.utils.conditional import collection_validators, embedded_versions, is_not_modified, not_modified, with_validators
+from app.utils.streaming import stream_mode, stream_response
+from app.utils.query_budget import query_budget
+from app.utils.validators import BOOKING_TYPES
+from app.services import outbox
+from app.services.booking_reminders import cancel_reminders
+from sqlalchemy import select, union
 from datetime import datetime
 
 bookings_bp = Blueprint('bookings', __name__)
 
+def _embedded_versions(query):
+    """Versions of what the booking schema embeds for the query's bookings: allocations and patient/doctor/resource/staff names"""
+    booking_ids = query.with_entities(Booking.id).order_by(None).statement
+    allocations = BookingResource.booking_id.in_(booking_ids)
+    people = union(
+        query.with_entities(Booking.patient_id).order_by(None).statement,
+        query.with_entities(Booking.doctor_id).order_by(None).statement,
+        select(BookingResource.staff_id).where(allocations)
+    )
+    return [
+        *embedded_versions(BookingResource, select(BookingResource.id).where(allocations),
+                           BookingResource.allocated_at, BookingResource.released_at),
+        *embedded_versions(User, people),
+        *embedded_versions(Resource, select(BookingResource.resource_id).where(allocations))
+    ]
+
 @bookings_bp.route('/create', methods=['POST'])
 @jwt_required()
 @role_required('admin', 'doctor')
@@ -27,6 +50,9 @@ def create_booking():
             if field not in data:
                 return jsonify({'error': f'{field} is required'}), 400
         
+        if data['booking_type'] not in BOOKING_TYPES:
+            return jsonify({'error': f'booking_type must be one of: {", ".join(BOOKING_TYPES)}'}), 400
+        
         # Parse dates
         scheduled_date = datetime.fromisoformat(data['scheduled_date'].replace('Z', '+00:00'))
         duration_hours = int(data['duration_hours'])
@@ -96,16 +122,6 @@ def create_booking():
                                 staff_id=staff_id
                             )
                             db.session.add(booking_resource)
-                            
-                            # Create notification for staff
-                            notification = Notification(
-                                recipient_id=staff_id,
-                                title=f'New {data["booking_type"].capitalize()} Assignment',
-                                message=f'You have been assigned to a {data["booking_type"]} on {scheduled_date.strftime("%Y-%m-%d %H:%M")} with Dr. {doctor.name}',
-                                type='booking',
-                                related_id=new_booking.id
-                            )
-                            db.session.add(notification)
                 
                 else:
                     # Allocate physical resource (bed, OT, machine)
@@ -135,25 +151,8 @@ def create_booking():
                             # Update resource status
                             resource.status = 'booked'
         
-        # Create notification for patient
-        patient_notification = Notification(
-            recipient_id=data['patient_id'],
-            title=f'{data["booking_type"].capitalize()} Scheduled',
-            message=f'Your {data["booking_type"]} has been scheduled on {scheduled_date.strftime("%Y-%m-%d %H:%M")} with Dr. {doctor.name}',
-            type='booking',
-            related_id=new_booking.id
-        )
-        db.session.add(patient_notification)
-        
-        # Create notification for doctor
-        doctor_notification = Notification(
-            recipient_id=data['doctor_id'],
-            title=f'New {data["booking_type"].capitalize()} Scheduled',
-            message=f'A {data["booking_type"]} has been scheduled for {scheduled_date.strftime("%Y-%m-%d %H:%M")} with patient {patient.name}',
-            type='booking',
-            related_id=new_booking.id
-        )
-        db.session.add(doctor_notification)
+        # Patient, doctor and staff notifications are sent by the outbox worker
+        outbox.record('booking.created', booking_id=new_booking.id)
         
         db.session.commit()
         
@@ -167,44 +166,71 @@ def create_booking():
         return jsonify({'error': str(e)}), 500
 
 @bookings_bp.route('/', methods=['GET'])
+@query_budget(4)
 @jwt_required()
 def get_all_bookings():
-    """Get all bookings with optional filtering"""
+    """Get all bookings with optional filtering (?fields=, ?include=, ?stream=json|ndjson)"""
     try:
+        try:
+            schema = BookingSchema.from_args(request.args)
+            stream = stream_mode()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         current_user = get_current_user()
         
         # Filter bookings based on role
         if current_user.role == 'patient':
-            bookings = Booking.query.filter_by(patient_id=current_user.id).order_by(Booking.scheduled_date.desc()).all()
+            query = Booking.query.filter_by(patient_id=current_user.id)
         elif current_user.role == 'doctor':
-            bookings = Booking.query.filter_by(doctor_id=current_user.id).order_by(Booking.scheduled_date.desc()).all()
+            query = Booking.query.filter_by(doctor_id=current_user.id)
         elif current_user.role in ['nurse', 'staff']:
             # Get bookings where user is allocated
-            booking_ids = db.session.query(BookingResource.booking_id).filter(BookingResource.staff_id == current_user.id).all()
-            booking_ids = [bid[0] for bid in booking_ids]
-            bookings = Booking.query.filter(Booking.id.in_(booking_ids)).order_by(Booking.scheduled_date.desc()).all()
+            booking_ids = db.session.query(BookingResource.booking_id).filter(BookingResource.staff_id == current_user.id)
+            query = Booking.query.filter(Booking.id.in_(booking_ids))
         else:  # admin
-            bookings = Booking.query.order_by(Booking.scheduled_date.desc()).all()
+            query = Booking.query
         
-        return jsonify({
-            'bookings': [booking.to_dict() for booking in bookings],
+        validators = collection_validators(query, Booking.updated_at, *_embedded_versions(query))
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        query = query.order_by(Booking.scheduled_date.desc())
+        if stream:
+            return with_validators(stream_response('bookings', schema.stream_list(query), stream), validators), 200
+        
+        bookings = schema.dump_list(query)
+        
+        return with_validators(jsonify({
+            'bookings': bookings,
             'count': len(bookings)
-        }), 200
+        }), validators), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @bookings_bp.route('/<booking_id>', methods=['GET'])
+@query_budget(4)
 @jwt_required()
 def get_booking(booking_id):
     """Get booking by ID"""
     try:
-        booking = Booking.query.get(booking_id)
+        try:
+            schema = BookingSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        if not booking:
+        query = Booking.query.filter_by(id=booking_id)
+        validators = collection_validators(query, Booking.updated_at, *_embedded_versions(query))
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        bookings = schema.dump_list(Booking.query.filter_by(id=booking_id))
+        
+        if not bookings:
             return jsonify({'error': 'Booking not found'}), 404
         
-        return jsonify(booking.to_dict()), 200
+        return with_validators(jsonify(bookings[0]), validators), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -221,6 +247,7 @@ def complete_booking(booking_id):
             return jsonify({'error': 'Booking not found'}), 404
         
         booking.status = 'completed'
+        cancel_reminders(booking.id)
         
         # Release all allocated resources
         for booking_resource in booking.allocated_resources:
@@ -253,6 +280,7 @@ def cancel_booking(booking_id):
             return jsonify({'error': 'Booking not found'}), 404
         
         booking.status = 'cancelled'
+        cancel_reminders(booking.id)
         
         # Release all allocated resources
         for booking_resource in booking.allocated_resources:
@@ -0,0 +1,43 @@
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.middleware.auth_middleware import role_required
+from app.middleware.tenancy import current_hospital_id
+from app.services import slow_query_log
+
+diagnostics_bp = Blueprint('diagnostics', __name__)
+
+@diagnostics_bp.route('/slow-queries', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_slow_queries():
+    """Recent slow SQL statements of this worker, newest first (?endpoint=bookings.create_booking&limit=50)"""
+    try:
+        try:
+            limit = int(request.args.get('limit', 50))
+        except ValueError:
+            return jsonify({'error': 'limit must be a number'}), 400
+        
+        # Statements and plans can carry another hospital's data; only platform admins see every hospital
+        entries = slow_query_log.log.entries(current_hospital_id())
+        
+        endpoint = request.args.get('endpoint')
+        if endpoint:
+            entries = [entry for entry in entries if entry['endpoint'] == endpoint]
+        
+        return jsonify({
+            'slow_queries': entries[:limit],
+            'count': len(entries),
+            'threshold_ms': current_app.config['SLOW_QUERY_MS'],
+            'explain_sample': current_app.config['SLOW_QUERY_EXPLAIN_SAMPLE']
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@diagnostics_bp.route('/slow-queries', methods=['DELETE'])
+@jwt_required()
+@role_required('admin')
+def clear_slow_queries():
+    """Empty this worker's slow-query log (a hospital admin's own entries), e.g. before a load test run"""
+    slow_query_log.log.clear(current_hospital_id())
+    return jsonify({'message': 'Slow-query log cleared'}), 200
@@ -1,11 +1,19 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, make_response, stream_with_context
 from flask_jwt_extended import jwt_required
 from app import db
 from app.models.discharge import Discharge
 from app.models.user import User
 from app.models.resource import Resource
-from app.models.notification import Notification
+from app.schemas.discharge import DischargeSchema
 from app.middleware.auth_middleware import role_required, get_current_user
+from app.services import outbox, discharge_search, discharge_export
+from app.services.allocations import release_patient_allocations
+from app.services.discharge_summary import FORMATS, content_type, render_summary
+from app.utils.conditional import collection_validators, embedded_versions, is_not_modified, not_modified, with_validators
+from app.utils.streaming import stream_mode, stream_response
+from app.utils.query_budget import query_budget
+from sqlalchemy import union
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 discharges_bp = Blueprint('discharges', __name__)
@@ -44,6 +52,15 @@ def create_discharge():
         if not doctor or doctor.role != 'doctor':
             return jsonify({'error': 'Invalid doctor'}), 400
         
+        # Only a bed of the caller's hospital may be released (the lookup is tenant scoped)
+        bed = None
+        if data.get('bed_id'):
+            bed = Resource.query.get(data['bed_id'])
+            if not bed:
+                return jsonify({'error': 'Bed not found'}), 404
+            if bed.type != 'bed':
+                return jsonify({'error': 'bed_id must refer to a bed'}), 400
+        
         # Create discharge record
         new_discharge = Discharge(
             patient_id=data['patient_id'],
@@ -54,60 +71,25 @@ def create_discharge():
             treatment_summary=data.get('treatment_summary'),
             prescribed_medicines=data.get('prescribed_medicines'),
             follow_up_instructions=data.get('follow_up_instructions'),
-            bed_id=data.get('bed_id') if data.get('bed_id') else None,
+            bed_id=bed.id if bed else None,
             doctor_approval=data.get('doctor_approval', False)
         )
         
-        # Generate discharge summary
-        duration = (discharge_date - admission_date).days
-        summary = f"""
-DISCHARGE SUMMARY
------------------
-Patient Name: {patient.name}
-Patient ID: {patient.id_card_number}
-Admission Date: {admission_date.strftime('%Y-%m-%d')}
-Discharge Date: {discharge_date.strftime('%Y-%m-%d')}
-Duration of Stay: {duration} days
-
-Diagnosed Disease: {data.get('diagnosed_disease', 'N/A')}
-
-Treatment Summary:
-{data.get('treatment_summary', 'N/A')}
-
-Prescribed Medicines:
-{data.get('prescribed_medicines', 'N/A')}
-
-Follow-up Instructions:
-{data.get('follow_up_instructions', 'N/A')}
-
-Discharged by: Dr. {doctor.name}
-Date: {datetime.utcnow().strftime('%Y-%m-%d %H:%M')}
-"""
-        new_discharge.discharge_summary = summary
-        
         db.session.add(new_discharge)
         
-        # If bed was allocated, release it
-        if data.get('bed_id'):
-            bed = Resource.query.get(data['bed_id'])
-            if bed:
-                bed.status = 'available'
-        
-        # Create notification for patient
-        patient_notification = Notification(
-            recipient_id=data['patient_id'],
-            title='Discharge Processed',
-            message=f'You have been discharged from the hospital. Please review your discharge summary and follow-up instructions.',
-            type='discharge',
-            related_id=new_discharge.id
-        )
-        db.session.add(patient_notification)
+        # Close the patient's open bookings and release their bed, resources and staff
+        released = release_patient_allocations(patient.id, bed_id=bed.id if bed else None)
+        
+        # Patient notification is sent by the outbox worker
+        db.session.flush()  # Get discharge ID
+        outbox.record('discharge.created', discharge_id=new_discharge.id)
         
         db.session.commit()
         
         return jsonify({
             'message': 'Discharge record created successfully',
-            'discharge': new_discharge.to_dict()
+            'discharge': new_discharge.to_dict(),
+            'released': released
         }), 201
         
     except Exception as e:
@@ -115,39 +97,163 @@ Date: {datetime.utcnow().strftime('%Y-%m-%d %H:%M')}
         return jsonify({'error': str(e)}), 500
 
 @discharges_bp.route('/', methods=['GET'])
+@query_budget(3)
 @jwt_required()
 def get_all_discharges():
-    """Get all discharge records with optional filtering"""
+    """Get all discharge records with optional filtering (?fields=, ?include=bed_info,discharge_summary, ?stream=json|ndjson)"""
     try:
+        try:
+            schema = DischargeSchema.from_args(request.args)
+            stream = stream_mode()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         current_user = get_current_user()
         
         # Filter based on role
         if current_user.role == 'patient':
-            discharges = Discharge.query.filter_by(patient_id=current_user.id).order_by(Discharge.discharge_date.desc()).all()
+            query = Discharge.query.filter_by(patient_id=current_user.id)
         elif current_user.role == 'doctor':
-            discharges = Discharge.query.filter_by(doctor_id=current_user.id).order_by(Discharge.discharge_date.desc()).all()
+            query = Discharge.query.filter_by(doctor_id=current_user.id)
         else:  # admin, nurse, staff
-            discharges = Discharge.query.order_by(Discharge.discharge_date.desc()).all()
+            query = Discharge.query
+        
+        query = query.order_by(Discharge.discharge_date.desc())
+        if stream:
+            return stream_response('discharges', schema.stream_list(query), stream), 200
+        
+        # Rendering summaries needs ORM objects; without ?include=discharge_summary rows are projected
+        discharges = schema.dump_list(query)
         
         return jsonify({
-            'discharges': [discharge.to_dict() for discharge in discharges],
+            'discharges': discharges,
             'count': len(discharges)
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@discharges_bp.route('/search', methods=['GET'])
+@jwt_required()
+def search_discharges():
+    """Full-text search over disease, treatment and medicines (?q=&from=&to=&limit=&offset=)"""
+    try:
+        current_user = get_current_user()
+        
+        q = request.args.get('q', '').strip()
+        if not q:
+            return jsonify({'error': 'q is required'}), 400
+        
+        date_from = request.args.get('from')
+        date_to = request.args.get('to')
+        if date_from:
+            date_from = datetime.strptime(date_from, '%Y-%m-%d').date()
+        if date_to:
+            date_to = datetime.strptime(date_to, '%Y-%m-%d').date()
+        
+        limit = min(request.args.get('limit', 20, type=int), 100)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        
+        rows, has_more = discharge_search.search(q, current_user, date_from=date_from, date_to=date_to,
+                                                 limit=limit, offset=offset)
+        
+        return jsonify({
+            'results': [discharge_search.row_to_dict(row) for row in rows],
+            'count': len(rows),
+            'has_more': has_more
+        }), 200
+        
+    except ValueError:
+        return jsonify({'error': 'from and to must be dates (YYYY-MM-DD)'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@discharges_bp.route('/export', methods=['GET'])
+@jwt_required()
+@role_required('admin', 'staff')
+def export_discharges():
+    """Stream discharge summaries as ZIP or NDJSON (?format=zip|ndjson&month=YYYY-MM or &from=&to=)"""
+    try:
+        fmt = request.args.get('format', 'zip')
+        if fmt not in discharge_export.FORMATS:
+            return jsonify({'error': f'format must be one of: {", ".join(discharge_export.FORMATS)}'}), 400
+        
+        try:
+            if request.args.get('month'):
+                date_from, date_to = discharge_export.month_range(request.args['month'])
+            else:
+                date_from = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') else None
+                date_to = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') else None
+        except ValueError:
+            return jsonify({'error': 'month must be YYYY-MM, from and to must be YYYY-MM-DD'}), 400
+        
+        label = request.args.get('month') or f"{date_from or 'all'}_{date_to or 'all'}"
+        
+        response = Response(
+            stream_with_context(discharge_export.export(fmt, date_from, date_to)),
+            mimetype=discharge_export.FORMATS[fmt]
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename="discharges_{label}.{fmt}"'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @discharges_bp.route('/<discharge_id>', methods=['GET'])
+@query_budget(3)
 @jwt_required()
 def get_discharge(discharge_id):
     """Get discharge record by ID"""
     try:
-        discharge = Discharge.query.get(discharge_id)
+        try:
+            schema = DischargeSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        discharges = schema.dump_list(Discharge.query.filter_by(id=discharge_id))
+        
+        if not discharges:
+            return jsonify({'error': 'Discharge record not found'}), 404
+        
+        return jsonify(discharges[0]), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@discharges_bp.route('/<discharge_id>/summary', methods=['GET'])
+@jwt_required()
+def get_discharge_summary(discharge_id):
+    """Rendered discharge summary (?format=text|html)"""
+    try:
+        fmt = request.args.get('format', 'text')
+        if fmt not in FORMATS:
+            return jsonify({'error': f'format must be one of: {", ".join(FORMATS)}'}), 400
+        
+        query = Discharge.query.filter_by(id=discharge_id)
+        people = union(
+            query.with_entities(Discharge.patient_id).statement,
+            query.with_entities(Discharge.doctor_id).statement
+        )
+        validators = collection_validators(
+            query, Discharge.updated_at,
+            *embedded_versions(User, people),
+            *embedded_versions(Resource, query.with_entities(Discharge.bed_id).statement)
+        )
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        # The render cache key reads the patient and doctor too
+        discharge = Discharge.query.options(
+            joinedload(Discharge.patient), joinedload(Discharge.doctor)
+        ).filter_by(id=discharge_id).first()
         
         if not discharge:
             return jsonify({'error': 'Discharge record not found'}), 404
         
-        return jsonify(discharge.to_dict()), 200
+        response = make_response(render_summary(discharge, fmt))
+        response.headers['Content-Type'] = content_type(fmt)
+        return with_validators(response, validators), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -177,37 +283,6 @@ def update_discharge(discharge_id):
         if 'doctor_approval' in data:
             discharge.doctor_approval = data['doctor_approval']
         
-        # Regenerate summary if content changed
-        if any(key in data for key in ['diagnosed_disease', 'treatment_summary', 'prescribed_medicines', 'follow_up_instructions']):
-            patient = discharge.patient
-            doctor = discharge.doctor
-            duration = (discharge.discharge_date - discharge.admission_date).days
-            
-            summary = f"""
-DISCHARGE SUMMARY
------------------
-Patient Name: {patient.name}
-Patient ID: {patient.id_card_number}
-Admission Date: {discharge.admission_date.strftime('%Y-%m-%d')}
-Discharge Date: {discharge.discharge_date.strftime('%Y-%m-%d')}
-Duration of Stay: {duration} days
-
-Diagnosed Disease: {discharge.diagnosed_disease or 'N/A'}
-
-Treatment Summary:
-{discharge.treatment_summary or 'N/A'}
-
-Prescribed Medicines:
-{discharge.prescribed_medicines or 'N/A'}
-
-Follow-up Instructions:
-{discharge.follow_up_instructions or 'N/A'}
-
-Discharged by: Dr. {doctor.name}
-Updated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M')}
-"""
-            discharge.discharge_summary = summary
-        
         discharge.updated_at = datetime.utcnow()
         db.session.commit()
         
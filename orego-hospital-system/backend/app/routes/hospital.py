@@ -1,8 +1,11 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, make_response, current_app
 from flask_jwt_extended import jwt_required
 from app import db
 from app.models.hospital import Hospital
-from app.middleware.auth_middleware import role_required
+from app.middleware.auth_middleware import role_required, get_current_user
+from app.services import hospital_profile
+from app.middleware.compression import send_precompressed
+from datetime import timezone
 
 hospital_bp = Blueprint('hospital', __name__)
 
@@ -10,7 +13,11 @@ hospital_bp = Blueprint('hospital', __name__)
 @jwt_required()
 @role_required('admin')
 def create_hospital():
-    """Create or update hospital details (Admin only)"""
+    """
+    Create or update hospital details (Admin only). Hospital admins update
+    their own hospital; ministry-level admins (no hospital) create hospitals,
+    matched by registration number.
+    """
     try:
         data = request.get_json()
         
@@ -24,7 +31,11 @@ def create_hospital():
                 return jsonify({'error': f'{field} is required'}), 400
         
         # Check if hospital already exists
-        existing_hospital = Hospital.query.first()
+        current_user = get_current_user()
+        if current_user.hospital_id:
+            existing_hospital = db.session.get(Hospital, current_user.hospital_id)
+        else:
+            existing_hospital = Hospital.query.filter_by(registration_number=data['registration_number']).first()
         
         if existing_hospital:
             # Update existing hospital
@@ -39,6 +50,7 @@ def create_hospital():
             existing_hospital.logo_url = data.get('logo_url')
             
             db.session.commit()
+            hospital_profile.invalidate()
             
             return jsonify({
                 'message': 'Hospital details updated successfully',
@@ -60,6 +72,7 @@ def create_hospital():
             
             db.session.add(new_hospital)
             db.session.commit()
+            hospital_profile.invalidate()
             
             return jsonify({
                 'message': 'Hospital details created successfully',
@@ -72,14 +85,25 @@ def create_hospital():
 
 @hospital_bp.route('/', methods=['GET'], strict_slashes=False)
 def get_hospital():
-    """Get hospital details (Public)"""
+    """Get hospital details (Public, served from the in-process profile cache)"""
     try:
-        hospital = Hospital.query.first()
+        profile = hospital_profile.get_profile(request.args.get('hospital_id'))
         
-        if not hospital:
+        if profile.body is None:
             return jsonify({'error': 'Hospital details not found'}), 404
         
-        return jsonify(hospital.to_dict()), 200
+        if request.if_none_match.contains_weak(profile.etag):
+            response = make_response('', 304)
+        else:
+            response = send_precompressed(make_response(profile.body), profile.encoded)
+            response.mimetype = 'application/json'
+        
+        response.set_etag(profile.etag, weak=True)
+        if profile.last_modified:
+            response.last_modified = profile.last_modified.replace(tzinfo=timezone.utc)
+        response.headers['Cache-Control'] = f"public, max-age={current_app.config['HOSPITAL_PROFILE_CACHE_SECONDS']}"
+        response.headers['X-Hospital-Version'] = profile.version
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -90,7 +114,9 @@ def get_hospital():
 def update_hospital():
     """Update hospital details (Admin only)"""
     try:
-        hospital = Hospital.query.first()
+        current_user = get_current_user()
+        hospital_id = current_user.hospital_id or request.args.get('hospital_id')
+        hospital = db.session.get(Hospital, hospital_id) if hospital_id else hospital_profile.default_hospital()
         
         if not hospital:
             return jsonify({'error': 'Hospital details not found. Please create first.'}), 404
@@ -118,6 +144,7 @@ def update_hospital():
             hospital.logo_url = data['logo_url']
         
         db.session.commit()
+        hospital_profile.invalidate()
         
         return jsonify({
             'message': 'Hospital details updated successfully',
@@ -0,0 +1,14 @@
+import hmac
+from flask import Blueprint, Response, current_app, request, jsonify
+from app.middleware import instrumentation
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Request latency, SQL and payload metrics in the Prometheus text format"""
+    token = current_app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'error': 'Invalid metrics token'}), 401
+    
+    return Response(instrumentation.render(), mimetype='text/plain; version=0.0.4')
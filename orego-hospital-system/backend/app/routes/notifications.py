@@ -1,12 +1,20 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
+from flask import Blueprint, Response, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.notification import Notification
+from app.models.user import User
 from app.middleware.auth_middleware import get_current_user, role_required
+from app.services import notification_events, notification_service
+from app.utils.conditional import is_not_modified, not_modified, with_validators
+from app.utils.query_budget import query_budget
+import json
+import queue
+import time
 
 notifications_bp = Blueprint('notifications', __name__)
 
 @notifications_bp.route('/', methods=['GET'], strict_slashes=False)
+@query_budget(7)
 @jwt_required()
 def get_notifications():
     """Get notifications for current user"""
@@ -17,25 +25,116 @@ def get_notifications():
         is_read = request.args.get('is_read')
         notification_type = request.args.get('type')
         
-        query = Notification.query.filter_by(recipient_id=current_user.id)
+        # Every read/dismiss/new item moves the user's counter, so it plus the
+        # personal row count validates the merged list in one small query
+        validators = notification_service.notification_validators(current_user)
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        # Personal notifications merged with broadcasts addressed to this user
+        notifications = notification_service.list_notifications(
+            current_user,
+            is_read=is_read.lower() == 'true' if is_read is not None else None,
+            notification_type=notification_type
+        )
         
-        if is_read is not None:
-            query = query.filter_by(is_read=is_read.lower() == 'true')
+        return with_validators(jsonify({
+            'notifications': notifications,
+            'count': len(notifications),
+            'unread_count': notification_service.unread_count(current_user)
+        }), validators), 200
         
-        if notification_type:
-            query = query.filter_by(type=notification_type)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@notifications_bp.route('/unread-count', methods=['GET'], strict_slashes=False)
+@jwt_required()
+def get_unread_count():
+    """Unread badge count for current user (single counter lookup)"""
+    try:
+        current_user = get_current_user()
         
-        notifications = query.order_by(Notification.created_at.desc()).all()
+        return jsonify({'unread_count': notification_service.unread_count(current_user)}), 200
         
-        return jsonify({
-            'notifications': [notification.to_dict() for notification in notifications],
-            'count': len (notifications),
-            'unread_count': Notification.query.filter_by(recipient_id=current_user.id, is_read=False).count()
-        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@notifications_bp.route('/stream', methods=['GET'], strict_slashes=False)
+@jwt_required(locations=['headers', 'query_string'])
+def stream_notifications():
+    """Server-Sent Events stream of new notifications and unread-count changes"""
+    try:
+        # EventSource cannot send an Authorization header, so the token may
+        # arrive as ?jwt=...; get_current_user() only looks at headers.
+        current_user = User.query.get(get_jwt_identity())
+        
+        if not current_user or not current_user.is_active:
+            return jsonify({'error': 'Access denied'}), 403
+        
+        config = current_app.config
+        heartbeat = config['NOTIFICATION_STREAM_HEARTBEAT']
+        max_seconds = config['NOTIFICATION_STREAM_MAX_SECONDS']
+        
+        # Replay anything missed since the last event the client saw
+        initial_events = []
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        after = notification_events.parse_event_id(last_event_id) if last_event_id else None
+        if after:
+            missed = notification_service.list_notifications(
+                current_user,
+                after=after,
+                limit=config['NOTIFICATION_STREAM_REPLAY_LIMIT'],
+                oldest_first=True
+            )
+            initial_events = [
+                (notification_events.format_event_id(n['created_at'], n['id']), 'notification', n)
+                for n in missed
+            ]
+        
+        initial_events.append((None, 'unread_count', {
+            'unread_count': notification_service.unread_count(current_user)
+        }))
+        
+        notification_events.ensure_listener()
+        broker = notification_events.get_broker()
+        subscription = broker.subscribe(current_user.id, current_user.role, current_user.hospital_id)
+        
+        # Hand the connection back to the pool; the stream itself never touches the database
+        db.session.close()
+        
+        def generate():
+            try:
+                yield 'retry: 5000\n\n'
+                for event in initial_events:
+                    yield _format_sse(*event)
+                
+                deadline = time.monotonic() + max_seconds
+                while time.monotonic() < deadline:
+                    try:
+                        event = subscription.get(timeout=heartbeat)
+                    except queue.Empty:
+                        yield ': heartbeat\n\n'
+                        continue
+                    yield _format_sse(*event)
+            finally:
+                broker.unsubscribe(subscription)
+        
+        return Response(generate(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _format_sse(event_id, event_type, data):
+    lines = []
+    if event_id:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event_type}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
 @notifications_bp.route('/<notification_id>/read', methods=['POST'], strict_slashes=False)
 @jwt_required()
 def mark_as_read(notification_id):
@@ -46,13 +145,25 @@ def mark_as_read(notification_id):
         notification = Notification.query.get(notification_id)
         
         if not notification:
-            return jsonify({'error': 'Notification not found'}), 404
+            broadcast = notification_service.get_visible_broadcast(current_user, notification_id)
+            if not broadcast:
+                return jsonify({'error': 'Notification not found'}), 404
+            
+            receipt = notification_service.mark_broadcast_read(current_user, broadcast)
+            db.session.commit()
+            
+            return jsonify({
+                'message': 'Notification marked as read',
+                'notification': notification_service.broadcast_to_dict(current_user, broadcast, receipt)
+            }), 200
         
         # Ensure user owns this notification
         if notification.recipient_id != current_user.id:
             return jsonify({'error': 'Access denied'}), 403
         
-        notification.is_read = True
+        if not notification.is_read:
+            notification.is_read = True
+            notification_service.adjust_unread(current_user.id, -1)
         db.session.commit()
         
         return jsonify({
@@ -71,9 +182,7 @@ def mark_all_as_read():
     try:
         current_user = get_current_user()
         
-        Notification.query.filter_by(recipient_id=current_user.id, is_read=False).update({
-            'is_read': True
-        })
+        notification_service.mark_all_read(current_user)
         db.session.commit()
         
         return jsonify({'message': 'All notifications marked as read'}), 200
@@ -92,12 +201,22 @@ def delete_notification(notification_id):
         notification = Notification.query.get(notification_id)
         
         if not notification:
-            return jsonify({'error': 'Notification not found'}), 404
+            # Broadcasts are shared, so deleting one only dismisses it for this user
+            broadcast = notification_service.get_visible_broadcast(current_user, notification_id)
+            if not broadcast:
+                return jsonify({'error': 'Notification not found'}), 404
+            
+            notification_service.dismiss_broadcast(current_user, broadcast)
+            db.session.commit()
+            
+            return jsonify({'message': 'Notification deleted'}), 200
         
         # Ensure user owns this notification
         if notification.recipient_id != current_user.id:
             return jsonify({'error': 'Access denied'}), 403
         
+        if not notification.is_read:
+            notification_service.adjust_unread(current_user.id, -1)
         db.session.delete(notification)
         db.session.commit()
         
@@ -154,31 +273,26 @@ def broadcast_notification():
         if not data or not data.get('title') or not data.get('message'):
             return jsonify({'error': 'Title and message are required'}), 400
         
-        from app.models.user import User
-        
+        current_user = get_current_user()
         role_filter = data.get('role')
         
-        if role_filter:
-            users = User.query.filter_by(role=role_filter, is_active=True).all()
-        else:
-            users = User.query.filter_by(is_active=True).all()
-        
-        notifications_created = 0
-        for user in users:
-            notification = Notification(
-                recipient_id=user.id,
-                title=data['title'],
-                message=data['message'],
-                type=data.get('type', 'general')
-            )
-            db.session.add(notification)
-            notifications_created += 1
-        
+        # One row regardless of audience size; recipients merge it in on read
+        broadcast = notification_service.broadcast(
+            data['title'],
+            data['message'],
+            data.get('type', 'general'),
+            role_filter,
+            created_by=current_user.id,
+            hospital_id=current_user.hospital_id
+        )
         db.session.commit()
         
+        recipients = notification_service.audience_size(role_filter, current_user.hospital_id)
+        
         return jsonify({
-            'message': f'Broadcast sent to {notifications_created} users',
-            'count': notifications_created
+            'message': f'Broadcast sent to {recipients} users',
+            'count': recipients,
+            'broadcast': broadcast.to_dict()
         }), 201
         
     except Exception as e:
@@ -0,0 +1,34 @@
+from flask import Blueprint, request, make_response, redirect, url_for
+from app.services.reference_data import get_bundle
+from app.middleware.compression import send_precompressed
+
+reference_bp = Blueprint('reference', __name__)
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+def _bundle_response(bundle, cache_control):
+    if request.if_none_match.contains_weak(bundle.version):
+        response = make_response('', 304)
+    else:
+        response = send_precompressed(make_response(bundle.body), bundle.encoded)
+        response.mimetype = 'application/json'
+    response.set_etag(bundle.version, weak=True)
+    response.headers['Cache-Control'] = cache_control
+    response.headers['X-Reference-Version'] = bundle.version
+    return response
+
+@reference_bp.route('/', methods=['GET'], strict_slashes=False)
+def get_reference():
+    """Current reference bundle (Public). Revalidate cheaply with If-None-Match."""
+    return _bundle_response(get_bundle(), 'public, max-age=300, must-revalidate')
+
+@reference_bp.route('/<version>', methods=['GET'])
+def get_reference_version(version):
+    """Reference bundle for a specific version (Public, immutable)"""
+    bundle = get_bundle()
+    
+    # Old versions are not kept; send stale clients to the current one
+    if version != bundle.version:
+        return redirect(url_for('reference.get_reference_version', version=bundle.version))
+    
+    return _bundle_response(bundle, IMMUTABLE)
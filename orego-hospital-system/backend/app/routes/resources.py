@@ -2,8 +2,12 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
 from app.models.resource import Resource
+from app.schemas.resource import ResourceSchema
 from app.middleware.auth_middleware import role_required
-from app.utils.validators import validate_resource_data
+from app.utils.validators import validate_resource_data, RESOURCE_STATUSES
+from app.utils.conditional import collection_validators, is_not_modified, not_modified, with_validators
+from app.utils.streaming import stream_mode, stream_response
+from app.utils.query_budget import query_budget
 from datetime import datetime
 
 resources_bp = Blueprint('resources', __name__)
@@ -50,10 +54,17 @@ def register_resource():
         return jsonify({'error': str(e)}), 500
 
 @resources_bp.route('/', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_all_resources():
-    """Get all resources with optional filtering"""
+    """Get all resources with optional filtering (?fields=, ?include=, ?stream=json|ndjson)"""
     try:
+        try:
+            schema = ResourceSchema.from_args(request.args)
+            stream = stream_mode()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         type_filter = request.args.get('type')
         status_filter = request.args.get('status')
         
@@ -65,27 +76,45 @@ def get_all_resources():
         if status_filter:
             query = query.filter_by(status=status_filter)
         
-        resources = query.order_by(Resource.created_at.desc()).all()
+        validators = collection_validators(query, Resource.updated_at)
+        if is_not_modified(validators):
+            return not_modified(validators)
         
-        return jsonify({
-            'resources': [resource.to_dict() for resource in resources],
+        query = query.order_by(Resource.created_at.desc())
+        if stream:
+            return with_validators(stream_response('resources', schema.stream_list(query), stream), validators), 200
+        
+        resources = schema.dump_list(query)
+        
+        return with_validators(jsonify({
+            'resources': resources,
             'count': len(resources)
-        }), 200
+        }), validators), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @resources_bp.route('/<resource_id>', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_resource(resource_id):
     """Get resource by ID"""
     try:
-        resource = Resource.query.get(resource_id)
+        try:
+            schema = ResourceSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        if not resource:
+        validators = collection_validators(Resource.query.filter_by(id=resource_id), Resource.updated_at)
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        resources = schema.dump_list(Resource.query.filter_by(id=resource_id))
+        
+        if not resources:
             return jsonify({'error': 'Resource not found'}), 404
         
-        return jsonify(resource.to_dict()), 200
+        return with_validators(jsonify(resources[0]), validators), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -107,6 +136,8 @@ def update_resource(resource_id):
         if 'name' in data:
             resource.name = data['name']
         if 'status' in data:
+            if data['status'] not in RESOURCE_STATUSES:
+                return jsonify({'error': f'Status must be one of: {", ".join(RESOURCE_STATUSES)}'}), 400
             resource.status = data['status']
         if 'location' in data:
             resource.location = data['location']
@@ -158,6 +189,11 @@ def delete_resource(resource_id):
 def get_available_resources():
     """Get all available resources"""
     try:
+        try:
+            schema = ResourceSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         type_filter = request.args.get('type')
         
         query = Resource.query.filter_by(status='available')
@@ -165,69 +201,103 @@ def get_available_resources():
         if type_filter:
             query = query.filter_by(type=type_filter)
         
-        resources = query.all()
+        validators = collection_validators(query, Resource.updated_at)
+        if is_not_modified(validators):
+            return not_modified(validators)
         
-        return jsonify({
-            'resources': [resource.to_dict() for resource in resources],
+        resources = schema.dump_list(query)
+        
+        return with_validators(jsonify({
+            'resources': resources,
             'count': len(resources)
-        }), 200
+        }), validators), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @resources_bp.route('/beds', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_beds():
     """Get all beds"""
     try:
+        try:
+            schema = ResourceSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         status_filter = request.args.get('status')
         query = Resource.query.filter_by(type='bed')
         
         if status_filter:
             query = query.filter_by(status=status_filter)
         
-        beds = query.all()
-        return jsonify({
-            'beds': [bed.to_dict() for bed in beds],
+        validators = collection_validators(query, Resource.updated_at)
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        beds = schema.dump_list(query)
+        return with_validators(jsonify({
+            'beds': beds,
             'count': len(beds)
-        }), 200
+        }), validators), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @resources_bp.route('/operation-theatres', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_operation_theatres():
     """Get all operation theatres"""
     try:
+        try:
+            schema = ResourceSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         status_filter = request.args.get('status')
         query = Resource.query.filter_by(type='operation_theatre')
         
         if status_filter:
             query = query.filter_by(status=status_filter)
         
-        ots = query.all()
-        return jsonify({
-            'operation_theatres': [ot.to_dict() for ot in ots],
+        validators = collection_validators(query, Resource.updated_at)
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        ots = schema.dump_list(query)
+        return with_validators(jsonify({
+            'operation_theatres': ots,
             'count': len(ots)
-        }), 200
+        }), validators), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @resources_bp.route('/machines', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_machines():
     """Get all machines"""
     try:
+        try:
+            schema = ResourceSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         status_filter = request.args.get('status')
         query = Resource.query.filter_by(type='machine')
         
         if status_filter:
             query = query.filter_by(status=status_filter)
         
-        machines = query.all()
-        return jsonify({
-            'machines': [machine.to_dict() for machine in machines],
+        validators = collection_validators(query, Resource.updated_at)
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        machines = schema.dump_list(query)
+        return with_validators(jsonify({
+            'machines': machines,
             'count': len(machines)
-        }), 200
+        }), validators), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
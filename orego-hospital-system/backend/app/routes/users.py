@@ -2,9 +2,15 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
 from app.models.user import User
+from app.models.hospital import Hospital
+from app.schemas.user import UserSchema
 from app.middleware.auth_middleware import role_required, get_current_user
-from app.utils.validators import validate_user_data, SPECIALITIES
+from app.utils.validators import validate_user_data, SPECIALITIES, ROLES
 from app.utils.security import hash_password
+from app.utils.conditional import collection_validators, is_not_modified, not_modified, with_validators
+from app.utils.streaming import stream_mode, stream_response
+from app.utils.query_budget import query_budget
+from sqlalchemy import func
 from datetime import datetime
 
 users_bp = Blueprint('users', __name__)
@@ -21,7 +27,7 @@ def register_user():
             return jsonify({'error': 'No data provided'}), 400
         
         role = data.get('role')
-        if not role or role not in ['admin', 'doctor', 'nurse', 'patient', 'staff']:
+        if not role or role not in ROLES:
             return jsonify({'error': 'Invalid role'}), 400
         
         # Validate data
@@ -30,15 +36,15 @@ def register_user():
             return jsonify({'error': error_msg}), 400
         
         # Check if username already exists
-        if User.query.filter_by(username=data['username']).first():
+        if User.query.execution_options(all_hospitals=True).filter_by(username=data['username']).first():
             return jsonify({'error': 'Username already exists'}), 400
         
         # Check if email already exists
-        if User.query.filter_by(email=data['email']).first():
+        if User.query.execution_options(all_hospitals=True).filter_by(email=data['email']).first():
             return jsonify({'error': 'Email already exists'}), 400
         
         # Check if ID card already exists
-        if User.query.filter_by(id_card_number=data['id_card_number']).first():
+        if User.query.execution_options(all_hospitals=True).filter_by(id_card_number=data['id_card_number']).first():
             return jsonify({'error': 'ID card number already exists'}), 400
         
         # Create new user
@@ -57,6 +63,13 @@ def register_user():
             operation_type=data.get('operation_type')
         )
         
+        # Hospital admins register into their own hospital (filled in on flush);
+        # ministry-level admins choose one
+        if get_current_user().hospital_id is None and data.get('hospital_id'):
+            if not db.session.get(Hospital, data['hospital_id']):
+                return jsonify({'error': 'Hospital not found'}), 404
+            new_user.hospital_id = data['hospital_id']
+        
         db.session.add(new_user)
         db.session.commit()
         
@@ -70,11 +83,18 @@ def register_user():
         return jsonify({'error': str(e)}), 500
 
 @users_bp.route('/', methods=['GET'])
+@query_budget(3)
 @jwt_required()
 @role_required('admin', 'doctor', 'nurse', 'staff')
 def get_all_users():
-    """Get all users with optional filtering"""
+    """Get all users with optional filtering (?fields=, ?include=, ?stream=json|ndjson)"""
     try:
+        try:
+            schema = UserSchema.from_args(request.args)
+            stream = stream_mode()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         role_filter = request.args.get('role')
         speciality_filter = request.args.get('speciality')
         status_filter = request.args.get('status', 'active')
@@ -92,33 +112,50 @@ def get_all_users():
         elif status_filter == 'inactive':
             query = query.filter_by(is_active=False)
         
-        users = query.all()
+        validators = collection_validators(query, User.updated_at, func.max(User.last_login))
+        if is_not_modified(validators):
+            return not_modified(validators)
         
-        return jsonify({
-            'users': [user.to_dict() for user in users],
+        if stream:
+            return with_validators(stream_response('users', schema.stream_list(query), stream), validators), 200
+        
+        users = schema.dump_list(query)
+        
+        return with_validators(jsonify({
+            'users': users,
             'count': len(users)
-        }), 200
+        }), validators), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @users_bp.route('/<user_id>', methods=['GET'])
+@query_budget(4)
 @jwt_required()
 def get_user(user_id):
     """Get user by ID"""
     try:
+        try:
+            schema = UserSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         current_user = get_current_user()
         
         # Users can only view their own profile unless they're admin
         if current_user.role != 'admin' and current_user.id != user_id:
             return jsonify({'error': 'Access denied'}), 403
         
-        user = User.query.get(user_id)
+        validators = collection_validators(User.query.filter_by(id=user_id), User.updated_at, func.max(User.last_login))
+        if is_not_modified(validators):
+            return not_modified(validators)
         
-        if not user:
+        users = schema.dump_list(User.query.filter_by(id=user_id))
+        
+        if not users:
             return jsonify({'error': 'User not found'}), 404
         
-        return jsonify(user.to_dict()), 200
+        return with_validators(jsonify(users[0]), validators), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -225,53 +262,101 @@ def get_specialities():
     return jsonify({'specialities': SPECIALITIES}), 200
 
 @users_bp.route('/doctors', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_doctors():
     """Get all doctors"""
     try:
-        doctors = User.query.filter_by(role='doctor', is_active=True).all()
-        return jsonify({
-            'doctors': [doctor.to_dict() for doctor in doctors],
+        try:
+            schema = UserSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        query = User.query.filter_by(role='doctor', is_active=True)
+        
+        validators = collection_validators(query, User.updated_at, func.max(User.last_login))
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        doctors = schema.dump_list(query)
+        return with_validators(jsonify({
+            'doctors': doctors,
             'count': len(doctors)
-        }), 200
+        }), validators), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @users_bp.route('/nurses', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_nurses():
     """Get all nurses"""
     try:
-        nurses = User.query.filter_by(role='nurse', is_active=True).all()
-        return jsonify({
-            'nurses': [nurse.to_dict() for nurse in nurses],
+        try:
+            schema = UserSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        query = User.query.filter_by(role='nurse', is_active=True)
+        
+        validators = collection_validators(query, User.updated_at, func.max(User.last_login))
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        nurses = schema.dump_list(query)
+        return with_validators(jsonify({
+            'nurses': nurses,
             'count': len(nurses)
-        }), 200
+        }), validators), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @users_bp.route('/staff', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_staff():
     """Get all staff"""
     try:
-        staff = User.query.filter_by(role='staff', is_active=True).all()
-        return jsonify({
-            'staff': [s.to_dict() for s in staff],
+        try:
+            schema = UserSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        query = User.query.filter_by(role='staff', is_active=True)
+        
+        validators = collection_validators(query, User.updated_at, func.max(User.last_login))
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        staff = schema.dump_list(query)
+        return with_validators(jsonify({
+            'staff': staff,
             'count': len(staff)
-        }), 200
+        }), validators), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @users_bp.route('/patients', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_patients():
     """Get all patients"""
     try:
-        patients = User.query.filter_by(role='patient', is_active=True).all()
-        return jsonify({
-            'patients': [patient.to_dict() for patient in patients],
+        try:
+            schema = UserSchema.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        query = User.query.filter_by(role='patient', is_active=True)
+        
+        validators = collection_validators(query, User.updated_at, func.max(User.last_login))
+        if is_not_modified(validators):
+            return not_modified(validators)
+        
+        patients = schema.dump_list(query)
+        return with_validators(jsonify({
+            'patients': patients,
             'count': len(patients)
-        }), 200
+        }), validators), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
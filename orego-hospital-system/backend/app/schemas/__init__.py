@@ -0,0 +1 @@
+# Serialization schemas package
@@ -0,0 +1,375 @@
+"""
+Declarative serialization schemas.
+
+A schema lists the output fields of a model once; on first use it is compiled
+into two paths:
+
+- dump(obj): ORM instance -> dict through precompiled attribute getters, with
+  dates as ISO strings (what to_dict() returns, safe for json.dumps).
+- dump_query(query): the read model. One SELECT of exactly the needed
+  columns (many-to-one names outer-joined in) executed on the Connection, so
+  rows come back as plain named tuples without ORM row processing, identity
+  map or change tracking; one IN query per nested collection, however many
+  rows there are; and a generated function that builds each dict straight
+  from the tuple. Dates
+  stay as date objects for the app's JSON provider.
+- stream_list(query): the same in batches read through a server-side cursor,
+  so a response can be written out while later rows are still being read.
+
+Fields are column names or one of Related, Nested, Computed. Nested fields
+and Computed fields that need the ORM object are "includes": costly extras
+that ?include= switches on. Schema.from_args() derives a schema with only the
+requested fields (?fields=), compiled separately, so unrequested columns are
+not selected and unrequested relationships are neither joined nor loaded.
+"""
+from collections import namedtuple
+from functools import lru_cache
+from operator import attrgetter
+
+from sqlalchemy import Date, DateTime, Select, inspect, select
+from sqlalchemy.orm import aliased, joinedload, selectinload, subqueryload
+
+from app import db
+from app.middleware import tenancy
+
+IN_CHUNK_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+# An attribute of a many-to-one relationship, e.g. Related('doctor_name', 'doctor', 'name')
+Related = namedtuple('Related', ['key', 'relationship', 'attribute'])
+
+# A relationship serialized with another schema (a list for one-to-many, a dict or None otherwise)
+Nested = namedtuple('Nested', ['key', 'relationship', 'schema'])
+
+# A value derived from other columns of the same row; fn gets the ORM object or the row.
+# With needs_object=True fn needs the ORM object, so dump_list() loads objects when it is
+# selected; relationships named in requires are then eager-loaded.
+Computed = namedtuple('Computed', ['key', 'fn', 'requires', 'needs_object'], defaults=(False,))
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def _chunks(values, size=IN_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class _Compiled:
+    """The field plan of one schema, built once from the mapper"""
+
+    def __init__(self, schema):
+        mapper = inspect(schema.model)
+        self.schema = schema
+        self.keys = []            # output keys, in declaration order
+        self.getters = []         # (key, getter) for dump()
+        self.columns = []         # projected column expressions for dump_query()
+        self.joins = []           # relationship.of_type(alias) outer joins for Related fields
+        self.computed = []        # (key, fn)
+        self.nested = []          # (key, schema, local column name, remote column name, many)
+        self.needs_objects = False
+        hidden = []
+
+        for field in schema.fields:
+            if isinstance(field, str):
+                column = mapper.columns[field]
+                getter = attrgetter(field)
+                if isinstance(column.type, (Date, DateTime)):
+                    getter = (lambda get: lambda obj: _isoformat(get(obj)))(getter)
+                self.getters.append((field, getter))
+                self.columns.append(getattr(schema.model, field).label(field))
+                self.keys.append(field)
+
+            elif isinstance(field, Related):
+                relationship = mapper.relationships[field.relationship]
+                alias = aliased(relationship.mapper.class_)
+                self.joins.append(getattr(schema.model, field.relationship).of_type(alias))
+                self.columns.append(getattr(alias, field.attribute).label(field.key))
+                self.getters.append((field.key, (lambda rel, attr: lambda obj: (
+                    getattr(getattr(obj, rel), attr) if getattr(obj, rel) is not None else None
+                ))(field.relationship, field.attribute)))
+                self.keys.append(field.key)
+
+            elif isinstance(field, Nested):
+                relationship = mapper.relationships[field.relationship]
+                (local, remote), = relationship.local_remote_pairs
+                self.nested.append((field.key, field.schema, local.key, remote.key, relationship.uselist))
+                hidden.append(local.key)
+                self.getters.append((field.key, (lambda rel, nested, many: lambda obj: (
+                    [nested.dump(child) for child in getattr(obj, rel)] if many
+                    else nested.dump(getattr(obj, rel)) if getattr(obj, rel) is not None else None
+                ))(field.relationship, field.schema, relationship.uselist)))
+                self.keys.append(field.key)
+
+            elif isinstance(field, Computed):
+                if field.needs_object:
+                    self.needs_objects = True
+                else:
+                    self.computed.append((field.key, field.fn))
+                hidden.extend(name for name in field.requires if name in mapper.columns)
+                self.getters.append((field.key, field.fn))
+                self.keys.append(field.key)
+
+            else:
+                raise TypeError(f'Unsupported schema field: {field!r}')
+
+        # Columns needed by nested/computed fields but not part of the output
+        projected = {column.key for column in self.columns}
+        self.hidden = []
+        for name in dict.fromkeys(hidden):
+            if name not in projected:
+                self.columns.append(getattr(schema.model, name).label(name))
+                self.hidden.append(name)
+                projected.add(name)
+
+        self.projected_keys = [column.key for column in self.columns]
+        self.index = {key: position for position, key in enumerate(self.projected_keys)}
+        self.build = self._row_builder()
+
+    def _row_builder(self):
+        """
+        Generated function turning a list of rows into dicts in declaration
+        order with one dict literal per row; nested keys are placeholders
+        filled in by Schema.dump_rows()
+        """
+        namespace = {}
+        computed = dict(self.computed)
+        items = []
+        for key in self.keys:
+            if key in self.index:
+                items.append(f'{key!r}: row[{self.index[key]}]')
+            elif key in computed:
+                name = f'computed_{len(namespace)}'
+                namespace[name] = computed[key]
+                items.append(f'{key!r}: {name}(row)')
+            else:
+                items.append(f'{key!r}: None')
+        source = f"def build(rows):\n    return [{{{', '.join(items)}}} for row in rows]\n"
+        exec(compile(source, f'<schema {self.schema.__name__}>', 'exec'), namespace)
+        return namespace['build']
+
+
+class Schema:
+    """Subclasses set model and fields; all methods are classmethods"""
+
+    model = None
+    fields = ()
+
+    _compiled = None
+
+    @classmethod
+    def compiled(cls):
+        if cls.__dict__.get('_compiled') is None:
+            cls._compiled = _Compiled(cls)
+        return cls._compiled
+
+    @classmethod
+    def keys(cls):
+        return list(cls.compiled().keys)
+
+    @classmethod
+    def includes(cls):
+        """Keys of the costly fields that are only serialized on request"""
+        return [
+            field.key for field in cls.fields
+            if isinstance(field, Nested) or (isinstance(field, Computed) and field.needs_object)
+        ]
+
+    @classmethod
+    def subset(cls, fields=None, include=None):
+        """
+        A schema with only some fields. fields names the keys to keep (all
+        plain fields when None); include names the includes to add (all of
+        them when both are None, none when only fields is given). Raises
+        ValueError for unknown names or when no field would be left.
+        """
+        if fields is None and include is None:
+            return cls
+        if fields is not None and not fields and not include:
+            raise ValueError('No fields requested')
+
+        includes = cls.includes()
+        plain = [key for key in cls.keys() if key not in includes]
+        wanted = set(plain if fields is None else fields) | set(include or ())
+
+        unknown = wanted - set(cls.keys())
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+
+        return _subset(cls, tuple(key for key in cls.keys() if key in wanted))
+
+    @classmethod
+    def from_args(cls, args):
+        """
+        subset() for the ?fields=a,b&include=c query parameters of a request;
+        an empty ?fields= counts as not given
+        """
+        def names(param):
+            value = args.get(param)
+            return None if value is None else [name.strip() for name in value.split(',') if name.strip()]
+
+        fields = names('fields')
+        return cls.subset(fields or None, names('include'))
+
+    @classmethod
+    def dump(cls, obj):
+        return {key: getter(obj) for key, getter in cls.compiled().getters}
+
+    @classmethod
+    def loader_options(cls, path=None, streaming=False):
+        """
+        Eager-loading options so dump() of a queried object never lazy loads.
+        streaming selects collection loaders that work with yield_per.
+        """
+        options = []
+        for field in cls.fields:
+            if isinstance(field, Related):
+                attribute = getattr(cls.model, field.relationship)
+                options.append(path.joinedload(attribute) if path is not None else joinedload(attribute))
+            elif isinstance(field, Nested):
+                # One statement however many rows: many-to-one joined in, collections by
+                # re-running the parent query as a subquery (selectinload batches by 500,
+                # but it is the collection loader yield_per allows, once per streamed batch)
+                attribute = getattr(cls.model, field.relationship)
+                many = inspect(cls.model).relationships[field.relationship].uselist
+                if many and streaming:
+                    load = path.selectinload(attribute) if path is not None else selectinload(attribute)
+                elif many:
+                    load = path.subqueryload(attribute) if path is not None else subqueryload(attribute)
+                else:
+                    load = path.joinedload(attribute) if path is not None else joinedload(attribute)
+                options.append(load)
+                options.extend(field.schema.loader_options(load, streaming))
+            elif isinstance(field, Computed) and field.needs_object:
+                mapper = inspect(cls.model)
+                for name in field.requires:
+                    if name in mapper.relationships:
+                        attribute = getattr(cls.model, name)
+                        options.append(path.joinedload(attribute) if path is not None else joinedload(attribute))
+        return options
+
+    @classmethod
+    def _project(cls, statement):
+        compiled = cls.compiled()
+        for relationship in compiled.joins:
+            statement = statement.outerjoin(relationship)
+        return statement
+
+    @classmethod
+    def select(cls, *criteria):
+        """SELECT of this schema's columns; add filters, ordering and limits as with any select()"""
+        return cls._project(select(*cls.compiled().columns).select_from(cls.model).where(*criteria))
+
+    @classmethod
+    def dump_list(cls, query):
+        """dump_query(), or ORM objects through dump() when a selected field needs them"""
+        if cls.compiled().needs_objects:
+            return [cls.dump(obj) for obj in query.options(*cls.loader_options()).all()]
+        return cls.dump_query(query)
+
+    @classmethod
+    def stream_list(cls, query, batch_size=STREAM_BATCH_SIZE):
+        """
+        dump_list() as a generator of lists of at most batch_size dicts. Rows
+        are fetched with yield_per and only the current batch (plus its
+        nested rows, one IN query per batch) is held, so memory stays flat
+        however many rows the query returns.
+        """
+        if cls.compiled().needs_objects:
+            statement = query.options(*cls.loader_options(streaming=True))
+            if hasattr(statement, 'statement'):
+                statement = statement.statement
+            # Unmodified objects are held weakly by the identity map and go with their batch
+            result = db.session.execute(statement.execution_options(yield_per=batch_size))
+            for batch in result.scalars().partitions():
+                yield [cls.dump(obj) for obj in batch]
+            return
+
+        result = _execute(cls._statement(query).execution_options(yield_per=batch_size), fetch=False)
+        for rows in result.partitions():
+            yield cls.dump_rows(rows)
+
+    @classmethod
+    def _statement(cls, query):
+        columns = cls.compiled().columns
+        if hasattr(query, 'with_entities'):
+            return cls._project(query.with_entities(*columns)).statement
+        return cls._project(query.with_only_columns(*columns))
+
+    @classmethod
+    def rows(cls, query):
+        """
+        Named tuples of this schema's columns for the rows of a Query (or
+        select() of the model), keeping its filters, ordering and limits
+        """
+        return _execute(cls._statement(query))
+
+    @classmethod
+    def dump_query(cls, query):
+        statement = cls._statement(query)
+        return cls.dump_rows(_execute(statement), source=statement)
+
+    @classmethod
+    def dump_rows(cls, rows, source=None):
+        """
+        Dicts for rows laid out as compiled().columns (extra trailing columns
+        are ignored). source is the statement the rows came from: when there
+        are more keys than fit one IN list, nested rows are matched against
+        it as a subquery, so each nested collection is still one query.
+        """
+        compiled = cls.compiled()
+        records = compiled.build(rows)
+
+        for key, schema, local, remote, many in compiled.nested:
+            position = compiled.index[local]
+            values = [row[position] for row in rows]
+            keys = {value for value in values if value is not None}
+            if source is not None and len(keys) > IN_CHUNK_SIZE:
+                keys = select(_unordered(source).subquery().c[local])
+            children = schema.children(remote, keys)
+            for record, value in zip(records, values):
+                found = children.get(value)
+                record[key] = (found or []) if many else (found[0] if found else None)
+
+        return records
+
+    @classmethod
+    def children(cls, column, keys):
+        """
+        Dumped rows whose column is in keys, grouped by that column. keys is a
+        collection of values (IN lists of at most IN_CHUNK_SIZE) or a select()
+        of them (one query).
+        """
+        link = getattr(cls.model, column)
+        grouped = {}
+        for chunk in [keys] if isinstance(keys, Select) else _chunks(keys):
+            statement = cls.select(link.in_(chunk)).add_columns(link.label('_link'))
+            rows = _execute(statement)
+            # The trailing _link column is past the schema's keys, so dump_rows ignores it
+            for row, record in zip(rows, cls.dump_rows(rows, source=statement)):
+                grouped.setdefault(row[-1], []).append(record)
+        return grouped
+
+
+def _execute(statement, fetch=True):
+    # Core execution in the session's transaction: the rows are never handed
+    # to the ORM loading layer, and tenant scoping is added explicitly
+    if db.session.autoflush:
+        db.session.flush()
+    result = db.session.connection().execute(tenancy.scoped(statement))
+    return result.all() if fetch else result
+
+
+def _unordered(statement):
+    # Ordering only matters to an IN subquery when it decides which rows a LIMIT keeps
+    if statement._limit_clause is None and statement._offset_clause is None:
+        return statement.order_by(None)
+    return statement
+
+
+@lru_cache(maxsize=256)
+def _subset(schema, keys):
+    fields = tuple(field for field in schema.fields if (field if isinstance(field, str) else field.key) in keys)
+    return type(f'{schema.__name__}Subset', (schema,), {'fields': fields, '_compiled': None})
@@ -0,0 +1,24 @@
+from app.models.booking import Booking, BookingResource
+from app.schemas.base import Schema, Related, Nested
+
+class BookingResourceSchema(Schema):
+    model = BookingResource
+    fields = (
+        'id', 'booking_id', 'resource_id', 'resource_type',
+        Related('resource_name', 'resource', 'name'),
+        'staff_id',
+        Related('staff_name', 'staff', 'name'),
+        'allocated_at', 'released_at'
+    )
+
+class BookingSchema(Schema):
+    model = Booking
+    fields = (
+        'id', 'patient_id',
+        Related('patient_name', 'patient', 'name'),
+        'doctor_id',
+        Related('doctor_name', 'doctor', 'name'),
+        'booking_type', 'scheduled_date', 'scheduled_end_date', 'duration_hours', 'status', 'notes',
+        Nested('allocated_resources', 'allocated_resources', BookingResourceSchema),
+        'created_at'
+    )
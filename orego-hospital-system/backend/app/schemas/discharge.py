@@ -0,0 +1,25 @@
+from app.models.discharge import Discharge
+from app.schemas.base import Schema, Related, Nested, Computed
+from app.schemas.resource import ResourceSchema
+from app.services.discharge_summary import render_summary
+
+def duration_days(discharge):
+    if discharge.discharge_date and discharge.admission_date:
+        return (discharge.discharge_date - discharge.admission_date).days
+    return 0
+
+class DischargeSchema(Schema):
+    model = Discharge
+    fields = (
+        'id', 'patient_id',
+        Related('patient_name', 'patient', 'name'),
+        'doctor_id',
+        Related('doctor_name', 'doctor', 'name'),
+        'admission_date', 'discharge_date',
+        Computed('duration_days', duration_days, ('admission_date', 'discharge_date')),
+        'diagnosed_disease', 'treatment_summary', 'prescribed_medicines', 'follow_up_instructions', 'bed_id',
+        Nested('bed_info', 'bed', ResourceSchema),
+        'doctor_approval',
+        Computed('discharge_summary', render_summary, ('patient', 'doctor'), needs_object=True),
+        'created_at'
+    )
@@ -0,0 +1,10 @@
+from app.models.notification import Notification
+from app.schemas.base import Schema, Computed
+
+class NotificationSchema(Schema):
+    model = Notification
+    fields = (
+        'id', 'recipient_id', 'title', 'message', 'type', 'is_read', 'related_id',
+        Computed('is_broadcast', lambda notification: False, ()),
+        'created_at'
+    )
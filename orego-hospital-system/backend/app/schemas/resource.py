@@ -0,0 +1,19 @@
+from app.models.resource import Resource
+from app.schemas.base import Schema, Computed
+
+def resource_identifier(resource):
+    if resource.type == 'bed':
+        return f"Ward: {resource.ward_id}, Bed: {resource.bed_number}"
+    if resource.type == 'operation_theatre':
+        return f"OT-{resource.ot_number}"
+    if resource.type == 'machine':
+        return f"SN: {resource.serial_number}"
+    return None
+
+class ResourceSchema(Schema):
+    model = Resource
+    fields = (
+        'id', 'type', 'name', 'status', 'ward_id', 'bed_number', 'ot_number', 'serial_number',
+        Computed('identifier', resource_identifier, ()),
+        'location', 'description', 'registered_date', 'created_at'
+    )
@@ -0,0 +1,9 @@
+from app.models.user import User
+from app.schemas.base import Schema
+
+class UserSchema(Schema):
+    model = User
+    fields = (
+        'id', 'username', 'role', 'name', 'birthday', 'id_card_number', 'address', 'phone_number', 'email',
+        'speciality', 'medical_status', 'operation_type', 'is_active', 'hospital_id', 'created_at', 'last_login'
+    )
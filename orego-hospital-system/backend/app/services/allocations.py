@@ -0,0 +1,77 @@
+from datetime import datetime
+
+from sqlalchemy import case, delete, or_, select, update
+
+from app import db
+from app.middleware import tenancy
+from app.models.booking import Booking, BookingResource, BookingReminder
+from app.models.resource import Resource
+
+bookings = Booking.__table__
+booking_resources = BookingResource.__table__
+reminders = BookingReminder.__table__
+
+
+def release_patient_allocations(patient_id, bed_id=None, now=None):
+    """
+    Close every scheduled booking of a patient and free what it holds, as a
+    handful of set-based statements in the caller's transaction:
+
+    - beds, theatres and machines allocated to those bookings (plus bed_id)
+      go back to 'available', unless they are under maintenance
+    - their open nurse/staff/resource allocations get released_at
+    - bookings that have started become 'completed', later ones 'cancelled'
+    - pending reminders for those bookings are dropped
+
+    Returns the number of rows touched per kind. These are Core statements,
+    which the session's tenant scoping does not rewrite, so bookings and
+    resources are limited to the caller's hospital here.
+    """
+    now = now or datetime.utcnow()
+    hospital_id = tenancy.current_hospital_id()
+
+    booking_criteria = [bookings.c.patient_id == patient_id, bookings.c.status == 'scheduled']
+    if hospital_id is not None:
+        booking_criteria.append(bookings.c.hospital_id == hospital_id)
+    open_bookings = select(bookings.c.id).where(*booking_criteria).scalar_subquery()
+
+    held_resources = select(booking_resources.c.resource_id).where(
+        booking_resources.c.booking_id.in_(open_bookings),
+        booking_resources.c.resource_id.isnot(None),
+        booking_resources.c.released_at.is_(None)
+    )
+    resource_criteria = Resource.id.in_(held_resources)
+    if bed_id:
+        resource_criteria = or_(resource_criteria, Resource.id == bed_id)
+    resource_criteria = [resource_criteria, Resource.status != 'maintenance']
+    if hospital_id is not None:
+        resource_criteria.append(Resource.hospital_id == hospital_id)
+
+    resources_released = db.session.execute(
+        update(Resource.__table__)
+        .where(*resource_criteria)
+        .values(status='available')
+    ).rowcount
+
+    allocations_released = db.session.execute(
+        update(booking_resources)
+        .where(booking_resources.c.booking_id.in_(open_bookings), booking_resources.c.released_at.is_(None))
+        .values(released_at=now)
+    ).rowcount
+
+    db.session.execute(
+        delete(reminders).where(reminders.c.booking_id.in_(open_bookings), reminders.c.sent_at.is_(None))
+    )
+
+    # Last, since it changes the set open_bookings selects
+    bookings_closed = db.session.execute(
+        update(bookings)
+        .where(bookings.c.id.in_(open_bookings))
+        .values(status=case((bookings.c.scheduled_date <= now, 'completed'), else_='cancelled'))
+    ).rowcount
+
+    return {
+        'bookings': bookings_closed,
+        'allocations': allocations_released,
+        'resources': resources_released
+    }
@@ -0,0 +1,163 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, select, update
+
+from app import db
+from app.models.booking import Booking, BookingResource, BookingReminder
+from app.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+reminders = BookingReminder.__table__
+
+
+def participants(booking):
+    """(recipient_id, role) for the patient, the doctor and every allocated nurse/staff member"""
+    people = [(booking.patient_id, 'patient'), (booking.doctor_id, 'doctor')]
+    staff_ids = db.session.query(BookingResource.staff_id).filter(
+        BookingResource.booking_id == booking.id,
+        BookingResource.staff_id.isnot(None)
+    ).all()
+    people.extend((staff_id, 'staff') for (staff_id,) in staff_ids)
+    return people
+
+
+def schedule_reminders(booking, now=None):
+    """
+    Create the reminder rows for a booking, one per participant and
+    configured lead time. Reminders that would already be due are skipped,
+    and existing rows are left alone, so calling this again is harmless.
+    """
+    now = now or datetime.utcnow()
+    existing = set(db.session.query(BookingReminder.recipient_id, BookingReminder.hours_before).filter(
+        BookingReminder.booking_id == booking.id
+    ).all())
+
+    rows = []
+    for recipient_id, _ in participants(booking):
+        for hours in current_app.config['BOOKING_REMINDER_HOURS']:
+            due_at = booking.scheduled_date - timedelta(hours=hours)
+            if due_at > now and (recipient_id, hours) not in existing:
+                existing.add((recipient_id, hours))
+                rows.append(BookingReminder(
+                    booking_id=booking.id,
+                    recipient_id=recipient_id,
+                    hours_before=hours,
+                    due_at=due_at
+                ))
+
+    db.session.add_all(rows)
+    return len(rows)
+
+
+def cancel_reminders(booking_id):
+    """Drop the unsent reminders of a booking that was cancelled or completed"""
+    db.session.execute(
+        delete(reminders).where(reminders.c.booking_id == booking_id, reminders.c.sent_at.is_(None))
+    )
+
+
+def _reminder_notification(reminder, booking):
+    booking_type = booking.booking_type
+    when = booking.scheduled_date.strftime('%Y-%m-%d %H:%M')
+
+    if reminder.recipient_id == booking.patient_id:
+        message = f'Reminder: your {booking_type} with Dr. {booking.doctor.name} is scheduled for {when}'
+    elif reminder.recipient_id == booking.doctor_id:
+        message = f'Reminder: {booking_type} with patient {booking.patient.name} is scheduled for {when}'
+    else:
+        message = f'Reminder: you are assigned to a {booking_type} on {when} with Dr. {booking.doctor.name}'
+
+    return Notification(
+        recipient_id=reminder.recipient_id,
+        title=f'{booking_type.capitalize()} Reminder',
+        message=message,
+        type='booking',
+        related_id=booking.id
+    )
+
+
+def dispatch_due(now=None, batch_size=None):
+    """
+    Send every reminder that is due. Each batch is one range scan on the
+    partial due_at index followed by a conditional UPDATE ... RETURNING that
+    claims the rows (sent_at IS NULL), so a reminder is sent once even with
+    several workers or after a restart. Reminders for bookings that are no
+    longer scheduled are claimed without sending anything.
+    Returns the number of notifications created.
+    """
+    now = now or datetime.utcnow()
+    batch_size = batch_size or current_app.config['BOOKING_REMINDER_BATCH_SIZE']
+    sent = 0
+
+    while True:
+        due_ids = db.session.execute(
+            select(reminders.c.id)
+            .where(reminders.c.sent_at.is_(None), reminders.c.due_at <= now)
+            .order_by(reminders.c.due_at)
+            .limit(batch_size)
+        ).scalars().all()
+        if not due_ids:
+            break
+
+        claimed = db.session.execute(
+            update(reminders)
+            .where(reminders.c.id.in_(due_ids), reminders.c.sent_at.is_(None))
+            .values(sent_at=now)
+            .returning(reminders.c.id, reminders.c.booking_id, reminders.c.recipient_id)
+        ).all()
+
+        bookings = {
+            booking.id: booking
+            for booking in Booking.query.filter(Booking.id.in_({row.booking_id for row in claimed}))
+        }
+        notifications = [
+            _reminder_notification(row, bookings[row.booking_id])
+            for row in claimed
+            if row.booking_id in bookings and bookings[row.booking_id].status == 'scheduled'
+        ]
+        db.session.add_all(notifications)
+        db.session.commit()
+
+        sent += len(notifications)
+        if len(due_ids) < batch_size:
+            break
+
+    return sent
+
+
+def next_due_at():
+    return db.session.query(func.min(BookingReminder.due_at)).filter(BookingReminder.sent_at.is_(None)).scalar()
+
+
+def run_scheduler(app, stop=None):
+    """
+    Dispatch reminders as they fall due. Sleeps until the earliest pending
+    reminder, capped at BOOKING_REMINDER_TICK_SECONDS so reminders created
+    by other processes are picked up.
+    """
+    stop = stop or threading.Event()
+    tick = app.config['BOOKING_REMINDER_TICK_SECONDS']
+
+    while not stop.is_set():
+        wait = tick
+        try:
+            with app.app_context():
+                dispatch_due()
+                upcoming = next_due_at()
+                db.session.remove()
+            if upcoming:
+                wait = min(tick, max((upcoming - datetime.utcnow()).total_seconds(), 0))
+        except Exception:
+            logger.exception('Booking reminder tick failed')
+
+        stop.wait(wait)
+
+
+def start_scheduler_thread(app):
+    scheduler = threading.Thread(target=run_scheduler, args=(app,), name='booking-reminders', daemon=True)
+    scheduler.start()
+    return scheduler
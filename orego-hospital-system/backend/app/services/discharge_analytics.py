@@ -0,0 +1,171 @@
+"""
+Discharge statistics computed in the database.
+
+Every figure is a grouped aggregate or a window function over the
+(discharge_date, doctor_id) index; no discharge rows are loaded into Python.
+Percentiles use cume_dist() (nearest rank) so the same SQL runs on Postgres
+and SQLite. Grouped results are returned column-wise:
+{'month': [...], 'discharges': [...], ...}.
+"""
+from sqlalchemy import case, cast, func, select
+
+from app import db
+from app.models.discharge import Discharge
+from app.models.user import User
+
+PERCENTILES = (50, 90, 95)
+READMISSION_WINDOW_DAYS = 30
+TOP_DISEASES = 20
+
+
+def _days_between(start, end):
+    if db.engine.dialect.name == 'sqlite':
+        return cast(func.julianday(end) - func.julianday(start), db.Integer)
+    return end - start  # date - date is an integer number of days on Postgres
+
+
+def _month(column):
+    if db.engine.dialect.name == 'sqlite':
+        return func.strftime('%Y-%m', column)
+    return func.to_char(column, 'YYYY-MM')
+
+
+def report_criteria(date_from=None, date_to=None, doctor_id=None):
+    criteria = []
+    if date_from:
+        criteria.append(Discharge.discharge_date >= date_from)
+    if date_to:
+        criteria.append(Discharge.discharge_date <= date_to)
+    if doctor_id:
+        criteria.append(Discharge.doctor_id == doctor_id)
+    return criteria
+
+
+def _round(value):
+    return round(float(value), 2) if value is not None else None
+
+
+def _columnar(result, rounded=()):
+    columns = {key: [] for key in result.keys()}
+    for row in result:
+        for key, value in row._mapping.items():
+            columns[key].append(_round(value) if key in rounded else value)
+    return columns
+
+
+def _ranked(values, *criteria):
+    """values with their cume_dist(), for nearest-rank percentiles"""
+    return select(
+        values.label('value'),
+        func.cume_dist().over(order_by=values).label('cd')
+    ).where(*criteria).subquery()
+
+
+def _percentiles(ranked, suffix):
+    return [
+        func.min(case((ranked.c.cd >= p / 100.0, ranked.c.value))).label(f'p{p}_{suffix}')
+        for p in PERCENTILES
+    ]
+
+
+def length_of_stay(criteria):
+    stay = _days_between(Discharge.admission_date, Discharge.discharge_date)
+    ranked = _ranked(stay, *criteria)
+
+    row = db.session.execute(select(
+        func.count(ranked.c.value).label('discharges'),
+        func.avg(ranked.c.value).label('avg_days'),
+        func.min(ranked.c.value).label('min_days'),
+        func.max(ranked.c.value).label('max_days'),
+        *_percentiles(ranked, 'days')
+    )).one()._mapping
+
+    return {key: _round(value) if key == 'avg_days' else value for key, value in row.items()}
+
+
+def by_disease(criteria):
+    stay = _days_between(Discharge.admission_date, Discharge.discharge_date)
+    disease = func.lower(func.trim(Discharge.diagnosed_disease))
+    result = db.session.execute(
+        select(
+            disease.label('disease'),
+            func.count().label('discharges'),
+            func.avg(stay).label('avg_stay_days')
+        )
+        .where(*criteria, Discharge.diagnosed_disease.isnot(None), func.trim(Discharge.diagnosed_disease) != '')
+        .group_by(disease)
+        .order_by(func.count().desc(), disease)
+        .limit(TOP_DISEASES)
+    )
+    return _columnar(result, rounded=('avg_stay_days',))
+
+
+def by_doctor(criteria):
+    stay = _days_between(Discharge.admission_date, Discharge.discharge_date)
+    grouped = (
+        select(
+            Discharge.doctor_id.label('doctor_id'),
+            func.count().label('discharges'),
+            func.avg(stay).label('avg_stay_days')
+        )
+        .where(*criteria)
+        .group_by(Discharge.doctor_id)
+        .subquery()
+    )
+    result = db.session.execute(
+        select(grouped.c.doctor_id, User.name.label('doctor_name'), grouped.c.discharges, grouped.c.avg_stay_days)
+        .join(User, User.id == grouped.c.doctor_id)
+        .order_by(grouped.c.discharges.desc(), User.name)
+    )
+    return _columnar(result, rounded=('avg_stay_days',))
+
+
+def by_month(criteria):
+    stay = _days_between(Discharge.admission_date, Discharge.discharge_date)
+    month = _month(Discharge.discharge_date)
+    result = db.session.execute(
+        select(
+            month.label('month'),
+            func.count().label('discharges'),
+            func.avg(stay).label('avg_stay_days')
+        )
+        .where(*criteria)
+        .group_by(month)
+        .order_by(month)
+    )
+    return _columnar(result, rounded=('avg_stay_days',))
+
+
+def readmissions(criteria):
+    """Days between a patient's discharge and their next admission, via lag() per patient"""
+    previous_discharge = func.lag(Discharge.discharge_date).over(
+        partition_by=Discharge.patient_id,
+        order_by=Discharge.admission_date
+    )
+    stays = select(
+        Discharge.admission_date.label('admission_date'),
+        previous_discharge.label('previous_discharge')
+    ).where(*criteria).subquery()
+
+    interval = _days_between(stays.c.previous_discharge, stays.c.admission_date)
+    ranked = _ranked(interval, stays.c.previous_discharge.isnot(None))
+
+    row = db.session.execute(select(
+        func.count(ranked.c.value).label('readmissions'),
+        func.coalesce(func.sum(case((ranked.c.value <= READMISSION_WINDOW_DAYS, 1), else_=0)), 0)
+        .label(f'within_{READMISSION_WINDOW_DAYS}_days'),
+        func.avg(ranked.c.value).label('avg_interval_days'),
+        *_percentiles(ranked, 'interval_days')
+    )).one()._mapping
+
+    return {key: _round(value) if key == 'avg_interval_days' else value for key, value in row.items()}
+
+
+def discharge_report(criteria):
+    return {
+        'length_of_stay': length_of_stay(criteria),
+        'by_disease': by_disease(criteria),
+        'by_doctor': by_doctor(criteria),
+        'by_month': by_month(criteria),
+        'readmissions': readmissions(criteria)
+    }
@@ -0,0 +1,118 @@
+"""
+Streaming export of discharge summaries as a ZIP (one text file per
+discharge) or NDJSON.
+
+Discharges are read through a server-side cursor in yield_per batches and
+only the current batch is referenced, so memory stays flat however many
+records a month holds (ZIP additionally keeps one small central-directory
+entry per file until the end, as the format requires). Output is produced
+chunk by chunk as the rows arrive; nothing is buffered beyond the current file.
+"""
+import io
+import json
+import re
+import zipfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models.discharge import Discharge
+from app.services.discharge_summary import render_summary
+
+BATCH_SIZE = 500
+
+FORMATS = {
+    'zip': 'application/zip',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable file object that collects what zipfile writes until drained"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def month_range(month):
+    """(first day, last day) of a YYYY-MM month"""
+    first = datetime.strptime(month, '%Y-%m').date()
+    last = (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return first, last
+
+
+def iter_discharges(date_from=None, date_to=None):
+    query = select(Discharge).options(
+        joinedload(Discharge.patient),
+        joinedload(Discharge.doctor)
+    ).order_by(Discharge.discharge_date, Discharge.id)
+
+    if date_from:
+        query = query.where(Discharge.discharge_date >= date_from)
+    if date_to:
+        query = query.where(Discharge.discharge_date <= date_to)
+
+    # The session's identity map holds unmodified objects weakly, so each
+    # written batch is garbage collected once the next one is fetched
+    result = db.session.execute(query.execution_options(stream_results=True, yield_per=BATCH_SIZE))
+    for batch in result.scalars().partitions():
+        yield from batch
+
+
+def _filename(discharge):
+    patient = re.sub(r'[^A-Za-z0-9]+', '_', discharge.patient.name if discharge.patient else 'unknown').strip('_')
+    return f"{discharge.discharge_date.isoformat()}_{patient}_{discharge.id[:8]}.txt"
+
+
+def _record(discharge):
+    return {
+        'id': discharge.id,
+        'patient_id': discharge.patient_id,
+        'patient_name': discharge.patient.name if discharge.patient else None,
+        'doctor_id': discharge.doctor_id,
+        'doctor_name': discharge.doctor.name if discharge.doctor else None,
+        'admission_date': discharge.admission_date.isoformat(),
+        'discharge_date': discharge.discharge_date.isoformat(),
+        'diagnosed_disease': discharge.diagnosed_disease,
+        'doctor_approval': discharge.doctor_approval,
+        'summary': render_summary(discharge, cache=False)
+    }
+
+
+def stream_ndjson(discharges):
+    for discharge in discharges:
+        yield (json.dumps(_record(discharge)) + '\n').encode('utf-8')
+
+
+def stream_zip(discharges):
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for discharge in discharges:
+            archive.writestr(_filename(discharge), render_summary(discharge, cache=False))
+            yield sink.drain()
+    # Central directory
+    yield sink.drain()
+
+
+def export(fmt, date_from=None, date_to=None):
+    """Byte chunks of the export in the requested format"""
+    discharges = iter_discharges(date_from, date_to)
+    if fmt == 'zip':
+        return stream_zip(discharges)
+    if fmt == 'ndjson':
+        return stream_ndjson(discharges)
+    raise ValueError(f'Unsupported export format: {fmt}')
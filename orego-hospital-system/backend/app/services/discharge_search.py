@@ -0,0 +1,184 @@
+"""
+Full-text search over discharge clinical text.
+
+Postgres matches against a weighted tsvector expression (diagnosed disease >
+prescribed medicines > treatment summary) backed by a GIN expression index,
+so the query below must use SEARCH_VECTOR verbatim for the index to apply.
+SQLite (local development) uses an FTS5 table kept in sync by triggers.
+"""
+import html
+
+from sqlalchemy import DDL, event, text
+
+from app import db
+from app.middleware import tenancy
+from app.models.discharge import Discharge
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(diagnosed_disease, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(prescribed_medicines, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(treatment_summary, '')), 'C')"
+)
+
+POSTGRES_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_discharges_search ON discharges USING gin (({SEARCH_VECTOR}))",
+]
+
+# The discharge id is stored UNINDEXED because discharges has a text primary
+# key, so its implicit rowid is not stable enough for an external-content table
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS discharges_fts USING fts5("
+    "discharge_id UNINDEXED, diagnosed_disease, treatment_summary, prescribed_medicines, "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS discharges_fts_insert AFTER INSERT ON discharges BEGIN "
+    "INSERT INTO discharges_fts (discharge_id, diagnosed_disease, treatment_summary, prescribed_medicines) "
+    "VALUES (new.id, new.diagnosed_disease, new.treatment_summary, new.prescribed_medicines); END",
+    "CREATE TRIGGER IF NOT EXISTS discharges_fts_update AFTER UPDATE OF "
+    "diagnosed_disease, treatment_summary, prescribed_medicines ON discharges BEGIN "
+    "DELETE FROM discharges_fts WHERE discharge_id = old.id; "
+    "INSERT INTO discharges_fts (discharge_id, diagnosed_disease, treatment_summary, prescribed_medicines) "
+    "VALUES (new.id, new.diagnosed_disease, new.treatment_summary, new.prescribed_medicines); END",
+    "CREATE TRIGGER IF NOT EXISTS discharges_fts_delete AFTER DELETE ON discharges BEGIN "
+    "DELETE FROM discharges_fts WHERE discharge_id = old.id; END",
+]
+
+_ddl_installed = False
+
+# The database marks matches with control characters; row_to_dict() escapes the
+# clinical text for HTML and only then turns them into <mark> tags
+SNIPPET_START = '\x02'
+SNIPPET_STOP = '\x03'
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+POSTGRES_QUERY = """
+WITH q AS (SELECT websearch_to_tsquery('english', :q) AS query),
+hits AS (
+    SELECT d.id, ts_rank_cd({vector}, q.query) AS rank
+    FROM discharges d, q
+    WHERE {vector} @@ q.query {filters}
+    ORDER BY rank DESC, d.discharge_date DESC
+    LIMIT :limit OFFSET :offset
+)
+SELECT d.id, d.patient_id, p.name AS patient_name, doc.name AS doctor_name,
+       d.discharge_date, d.diagnosed_disease, hits.rank,
+       ts_headline('english',
+                   concat_ws(' ... ', d.diagnosed_disease, d.prescribed_medicines, d.treatment_summary),
+                   q.query,
+                   :headline_options) AS snippet
+FROM hits
+JOIN discharges d ON d.id = hits.id
+JOIN users p ON p.id = d.patient_id
+JOIN users doc ON doc.id = d.doctor_id
+CROSS JOIN q
+ORDER BY hits.rank DESC, d.discharge_date DESC
+"""
+
+SQLITE_QUERY = """
+SELECT d.id, d.patient_id, p.name AS patient_name, doc.name AS doctor_name,
+       d.discharge_date, d.diagnosed_disease,
+       -bm25(discharges_fts, 0.0, 10.0, 2.0, 5.0) AS rank,
+       snippet(discharges_fts, -1, :snippet_start, :snippet_stop, ' ... ', 16) AS snippet
+FROM discharges_fts
+JOIN discharges d ON d.id = discharges_fts.discharge_id
+JOIN users p ON p.id = d.patient_id
+JOIN users doc ON doc.id = d.doctor_id
+WHERE discharges_fts MATCH :q {filters}
+ORDER BY rank DESC, d.discharge_date DESC
+LIMIT :limit OFFSET :offset
+"""
+
+
+def _fts5_query(q):
+    """Quote each term so user input can never be parsed as FTS5 syntax (terms are ANDed)"""
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in q.split())
+
+
+def search(q, user, date_from=None, date_to=None, limit=20, offset=0):
+    """
+    Ranked discharges matching q, newest first among equal ranks. Patients
+    and doctors only see their own records, as in the discharge list. The
+    query is raw SQL, which the session's tenant scoping does not rewrite,
+    so the caller's hospital is filtered on here.
+    Fetches one row beyond limit to report has_more without a COUNT.
+    Returns (rows, has_more).
+    """
+    filters = []
+    params = {'limit': limit + 1, 'offset': offset}
+
+    hospital_id = tenancy.current_hospital_id()
+    if hospital_id is not None:
+        filters.append('d.hospital_id = :hospital_id')
+        params['hospital_id'] = hospital_id
+
+    if user.role == 'patient':
+        filters.append('d.patient_id = :user_id')
+        params['user_id'] = user.id
+    elif user.role == 'doctor':
+        filters.append('d.doctor_id = :user_id')
+        params['user_id'] = user.id
+    if date_from:
+        filters.append('d.discharge_date >= :date_from')
+        params['date_from'] = date_from.isoformat()
+    if date_to:
+        filters.append('d.discharge_date <= :date_to')
+        params['date_to'] = date_to.isoformat()
+
+    clause = ''.join(f' AND {f}' for f in filters)
+    dialect = db.engine.dialect.name
+
+    if dialect == 'postgresql':
+        sql = POSTGRES_QUERY.format(vector=SEARCH_VECTOR, filters=clause)
+        params['q'] = q
+        params['headline_options'] = (
+            f'StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, MaxFragments=2, MaxWords=20, MinWords=5'
+        )
+    elif dialect == 'sqlite':
+        sql = SQLITE_QUERY.format(filters=clause)
+        params['q'] = _fts5_query(q)
+        params['snippet_start'] = SNIPPET_START
+        params['snippet_stop'] = SNIPPET_STOP
+    else:
+        raise NotImplementedError(f'Discharge search is not available on {dialect}')
+
+    rows = db.session.execute(text(sql), params).mappings().all()
+    return rows[:limit], len(rows) > limit
+
+
+def highlight(snippet):
+    """The snippet as HTML: clinical text escaped, matches wrapped in <mark>"""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(SNIPPET_START, HIGHLIGHT_START).replace(SNIPPET_STOP, HIGHLIGHT_STOP)
+
+
+def row_to_dict(row):
+    discharge_date = row['discharge_date']
+    return {
+        'id': row['id'],
+        'patient_id': row['patient_id'],
+        'patient_name': row['patient_name'],
+        'doctor_name': row['doctor_name'],
+        'discharge_date': discharge_date.isoformat() if hasattr(discharge_date, 'isoformat') else discharge_date,
+        'diagnosed_disease': row['diagnosed_disease'],
+        'rank': round(float(row['rank']), 6),
+        'snippet': highlight(row['snippet'])
+    }
+
+
+def _install(statements, dialect):
+    for statement in statements:
+        event.listen(Discharge.__table__, 'after_create', DDL(statement).execute_if(dialect=dialect))
+
+
+def init_app(app):
+    # db.create_all() (development, benchmarks) gets the same search objects as the migration
+    global _ddl_installed
+    if _ddl_installed:
+        return
+    _ddl_installed = True
+
+    _install(POSTGRES_DDL, 'postgresql')
+    _install(SQLITE_DDL, 'sqlite')
+    event.listen(Discharge.__table__, 'before_drop',
+                 DDL('DROP TABLE IF EXISTS discharges_fts').execute_if(dialect='sqlite'))
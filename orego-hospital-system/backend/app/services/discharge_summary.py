@@ -0,0 +1,90 @@
+import os
+import threading
+from collections import OrderedDict
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+FORMATS = {
+    'text': ('discharge_summary.txt', 'text/plain; charset=utf-8'),
+    'html': ('discharge_summary.html', 'text/html; charset=utf-8'),
+}
+
+CACHE_SIZE = 512
+
+# Templates are parsed and compiled once per process, on first use
+_env = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')),
+    autoescape=select_autoescape(['html']),
+    undefined=StrictUndefined,
+    auto_reload=False,
+    keep_trailing_newline=True
+)
+
+
+class _RenderCache:
+    """Thread-safe LRU of rendered summaries keyed by summary_key()"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = _RenderCache(CACHE_SIZE)
+
+
+def content_type(fmt):
+    return FORMATS[fmt][1]
+
+
+def summary_key(discharge, fmt):
+    """
+    Everything the rendered text depends on: the discharge and the patient
+    and doctor it prints (name, ID card number). Each bumps its updated_at
+    on change, so stale summaries are never served.
+    """
+    return (discharge.id, discharge.updated_at, discharge.patient.updated_at, discharge.doctor.updated_at, fmt)
+
+
+def render_summary(discharge, fmt='text', cache=True):
+    """
+    Render a discharge summary as plain text or HTML, cached per
+    summary_key(). Load patient and doctor with the discharge; the key reads
+    them even on a hit. Bulk callers pass cache=False so a one-off pass does
+    not evict the hot entries.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unsupported summary format: {fmt}')
+
+    key = summary_key(discharge, fmt) if cache else None
+    rendered = _cache.get(key) if cache else None
+    if rendered is None:
+        template = _env.get_template(FORMATS[fmt][0])
+        rendered = template.render(
+            discharge=discharge,
+            patient=discharge.patient,
+            doctor=discharge.doctor,
+            duration=(discharge.discharge_date - discharge.admission_date).days,
+            issued_at=discharge.updated_at or discharge.created_at
+        )
+        if cache:
+            _cache.put(key, rendered)
+    return rendered
@@ -0,0 +1,106 @@
+"""
+In-process cache of the public hospital profiles, one entry per hospital.
+
+GET /api/hospital is requested by every page load, including the login
+screen, so the profile is serialized once and served from memory. The
+cache is dropped by create/update in this process; other worker processes
+pick up changes when their copy expires (HOSPITAL_PROFILE_CACHE_SECONDS).
+When no hospital exists yet that is cached too, and unknown hospital ids
+are answered from the set of known ids (also reloaded once per expiry), so
+unauthenticated traffic never reaches the database more than once per
+expiry whatever ids it asks for. Compressed variants of the body are built
+along with it (see compression.precompress).
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from app import db
+from app.middleware.compression import precompress
+from app.models.hospital import Hospital
+
+Profile = namedtuple('Profile', ['body', 'encoded', 'etag', 'last_modified', 'version', 'expires_at'])
+
+_profiles = {}
+_known_ids = None  # (frozenset of every hospital id, expires_at)
+_lock = threading.Lock()
+
+MISSING = Profile(None, None, None, None, None, float('inf'))
+
+
+def default_hospital():
+    """The first registered hospital, served when a request names none"""
+    return Hospital.query.order_by(Hospital.created_at).first()
+
+
+def _load(hospital_id):
+    hospital = db.session.get(Hospital, hospital_id) if hospital_id else default_hospital()
+    ttl = current_app.config['HOSPITAL_PROFILE_CACHE_SECONDS']
+
+    if not hospital:
+        return Profile(None, None, None, None, None, time.monotonic() + ttl)
+
+    body = json.dumps(hospital.to_dict(), separators=(',', ':')).encode('utf-8')
+    updated_at = hospital.updated_at or hospital.created_at
+    return Profile(
+        body=body,
+        encoded=precompress(body),
+        etag=hashlib.sha1(body).hexdigest(),
+        last_modified=updated_at,
+        version=updated_at.strftime('%Y%m%d%H%M%S%f') if updated_at else '0',
+        expires_at=time.monotonic() + ttl
+    )
+
+
+def _is_unknown(hospital_id):
+    known = _known_ids
+    return known is not None and known[1] > time.monotonic() and hospital_id not in known[0]
+
+
+def _load_known_ids():
+    global _known_ids
+    ids = frozenset(db.session.execute(select(Hospital.id)).scalars())
+    _known_ids = (ids, time.monotonic() + current_app.config['HOSPITAL_PROFILE_CACHE_SECONDS'])
+
+
+def get_profile(hospital_id=None):
+    """
+    The cached Profile of a hospital (the default one when hospital_id is
+    None), reloading it (once, under a lock) when missing or expired;
+    MISSING for ids of no hospital
+    """
+    profile = _profiles.get(hospital_id)
+    if profile and profile.expires_at > time.monotonic():
+        return profile
+    if hospital_id is not None and _is_unknown(hospital_id):
+        return MISSING
+
+    with _lock:
+        profile = _profiles.get(hospital_id)
+        if profile is not None and profile.expires_at > time.monotonic():
+            return profile
+
+        if hospital_id is not None:
+            # Only real hospitals get an entry, so arbitrary query strings cannot grow the cache
+            known = _known_ids
+            if known is None or known[1] <= time.monotonic():
+                _load_known_ids()
+            if _is_unknown(hospital_id):
+                return MISSING
+
+        profile = _load(hospital_id)
+        if profile.body is not None or hospital_id is None:
+            _profiles[hospital_id] = profile
+        return profile
+
+
+def invalidate():
+    # Any hospital may also be the default one, so drop every entry
+    global _known_ids
+    _profiles.clear()
+    _known_ids = None
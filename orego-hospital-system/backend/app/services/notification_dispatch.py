@@ -0,0 +1,76 @@
+"""
+Outbox handlers that expand domain events into per-recipient notifications.
+
+They run in the outbox worker, outside the request that recorded the event,
+so they reload whatever they need by id and must be safe to re-run: an event
+whose handler fails is retried from scratch.
+"""
+from app import db
+from app.models.booking import Booking, BookingResource
+from app.models.discharge import Discharge
+from app.models.notification import Notification
+from app.services.booking_reminders import schedule_reminders
+from app.services import outbox
+
+
+def notify_booking_created(payload):
+    booking = Booking.query.get(payload['booking_id'])
+    if not booking:
+        return
+
+    booking_type = booking.booking_type
+    when = booking.scheduled_date.strftime('%Y-%m-%d %H:%M')
+    doctor_name = booking.doctor.name
+
+    notifications = [
+        Notification(
+            recipient_id=booking.patient_id,
+            title=f'{booking_type.capitalize()} Scheduled',
+            message=f'Your {booking_type} has been scheduled on {when} with Dr. {doctor_name}',
+            type='booking',
+            related_id=booking.id
+        ),
+        Notification(
+            recipient_id=booking.doctor_id,
+            title=f'New {booking_type.capitalize()} Scheduled',
+            message=f'A {booking_type} has been scheduled for {when} with patient {booking.patient.name}',
+            type='booking',
+            related_id=booking.id
+        )
+    ]
+
+    staff_ids = db.session.query(BookingResource.staff_id).filter(
+        BookingResource.booking_id == booking.id,
+        BookingResource.staff_id.isnot(None)
+    ).all()
+    for (staff_id,) in staff_ids:
+        notifications.append(Notification(
+            recipient_id=staff_id,
+            title=f'New {booking_type.capitalize()} Assignment',
+            message=f'You have been assigned to a {booking_type} on {when} with Dr. {doctor_name}',
+            type='booking',
+            related_id=booking.id
+        ))
+
+    db.session.add_all(notifications)
+    schedule_reminders(booking)
+
+
+def notify_discharge_created(payload):
+    discharge = Discharge.query.get(payload['discharge_id'])
+    if not discharge:
+        return
+
+    db.session.add(Notification(
+        recipient_id=discharge.patient_id,
+        title='Discharge Processed',
+        message='You have been discharged from the hospital. Please review your discharge summary and follow-up instructions.',
+        type='discharge',
+        related_id=discharge.id
+    ))
+
+
+def register():
+    """Register these handlers with the outbox (called from outbox.init_app)"""
+    outbox.register_handler('booking.created', notify_booking_created)
+    outbox.register_handler('discharge.created', notify_discharge_created)
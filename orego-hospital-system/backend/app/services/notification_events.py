@@ -0,0 +1,241 @@
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import event, text
+from sqlalchemy.orm import object_session
+
+from app import db
+from app.models.notification import Notification
+
+CHANNEL = 'orego_notifications'
+PENDING_KEY = 'pending_notification_events'
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+# Between the timestamp and the notification id in stream event ids
+EVENT_ID_SEPARATOR = '|'
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """A single connected stream waiting for events"""
+
+    def __init__(self, user_id, role, hospital_id=None, maxsize=100):
+        self.user_id = user_id
+        self.role = role
+        self.hospital_id = hospital_id
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def get(self, timeout):
+        return self.queue.get(timeout=timeout)
+
+    def put(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            # Slow client; it resynchronises from Last-Event-ID on reconnect
+            pass
+
+
+class NotificationBroker:
+    """In-process fan-out of notification events to connected streams"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, user_id, role=None, hospital_id=None):
+        subscription = Subscription(user_id, role, hospital_id)
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id, event_type, data, event_id=None, role=None, hospital_id=None):
+        """
+        Deliver to one user's streams, or with user_id=None to every stream
+        of a role (or all) in a hospital (or all)
+        """
+        with self._lock:
+            if user_id is not None:
+                subscribers = list(self._subscribers.get(user_id, ()))
+            else:
+                subscribers = [
+                    subscription
+                    for user_subscriptions in self._subscribers.values()
+                    for subscription in user_subscriptions
+                    if (role is None or subscription.role == role)
+                    and (hospital_id is None or subscription.hospital_id == hospital_id)
+                ]
+        for subscription in subscribers:
+            subscription.put((event_id, event_type, data))
+
+
+class PostgresListener(threading.Thread):
+    """Relays Postgres NOTIFY payloads from other workers into the local broker"""
+
+    def __init__(self, dsn, broker):
+        super().__init__(name='notification-listener', daemon=True)
+        self.dsn = dsn
+        self.broker = broker
+
+    def run(self):
+        import psycopg2
+        import psycopg2.extensions
+
+        while True:
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                conn.cursor().execute(f'LISTEN {CHANNEL}')
+
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+            except psycopg2.Error:
+                logger.exception('Notification listener lost its connection, retrying')
+                time.sleep(5)
+
+    def _dispatch(self, payload):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        self.broker.publish(message['user_id'], message['event'], message['data'],
+                            message.get('id'), message.get('role'), message.get('hospital_id'))
+
+
+def _backend():
+    backend = current_app.config.get('NOTIFICATION_STREAM_BACKEND', 'auto')
+    if backend == 'auto':
+        return 'postgres' if db.engine.dialect.name == 'postgresql' else 'local'
+    return backend
+
+
+def get_broker():
+    return current_app.extensions['notification_broker']
+
+
+def ensure_listener():
+    """Start the per-process NOTIFY listener the first time a stream connects"""
+    app = current_app._get_current_object()
+    if _backend() != 'postgres' or app.extensions.get('notification_listener'):
+        return
+
+    with app.extensions['notification_listener_lock']:
+        if app.extensions.get('notification_listener'):
+            return
+        url = db.engine.url.set(drivername='postgresql')
+        listener = PostgresListener(url.render_as_string(hide_password=False), get_broker())
+        listener.start()
+        app.extensions['notification_listener'] = listener
+
+
+def event_id_for(notification):
+    """Stream event id used by clients to resume via Last-Event-ID"""
+    return format_event_id(notification.created_at.isoformat(), notification.id) if notification.created_at else None
+
+
+def format_event_id(created_at, notification_id):
+    """
+    "<created_at ISO>|<id>": unique even when notifications share a
+    timestamp, and ordered the way replay walks them, (created_at, id)
+    """
+    return f'{created_at}{EVENT_ID_SEPARATOR}{notification_id}'
+
+
+def parse_event_id(event_id):
+    """
+    (created_at, id) cursor from a Last-Event-ID, or None when malformed.
+    A bare timestamp (ids issued before the id part existed) resumes at the
+    start of that timestamp, so at worst the last seen event repeats.
+    """
+    created_at, _, notification_id = event_id.partition(EVENT_ID_SEPARATOR)
+    try:
+        return datetime.fromisoformat(created_at), notification_id
+    except ValueError:
+        return None
+
+
+def emit(user_id, event_type, data, event_id=None, session=None, connection=None, role=None, hospital_id=None):
+    """
+    Queue an event for delivery once the current transaction commits.
+    With the Postgres backend this is a transactional NOTIFY, so every worker
+    process sees it; otherwise it is published in-process after commit.
+    """
+    message = {'user_id': user_id, 'event': event_type, 'data': data, 'id': event_id, 'role': role,
+               'hospital_id': hospital_id}
+
+    if _backend() == 'postgres':
+        payload = json.dumps(message)
+        if len(payload.encode('utf-8')) > MAX_PAYLOAD_BYTES and event_type == 'notification':
+            # Too large for NOTIFY; the client refetches the list on a bare reference
+            message['data'] = {'id': data.get('id'), 'truncated': True}
+            payload = json.dumps(message)
+        (connection or session or db.session).execute(
+            text('SELECT pg_notify(:channel, :payload)'),
+            {'channel': CHANNEL, 'payload': payload}
+        )
+    else:
+        session = session or db.session
+        session.info.setdefault(PENDING_KEY, []).append(message)
+
+
+def emit_broadcast(role, event_type, data, event_id=None, hospital_id=None):
+    """
+    Queue an event for every connected user of a role, or everyone when role
+    is None, limited to one hospital unless hospital_id is None
+    """
+    emit(None, event_type, data, event_id=event_id, role=role, hospital_id=hospital_id)
+
+
+def _queue_new_notification(mapper, connection, target):
+    emit(
+        target.recipient_id,
+        'notification',
+        target.to_dict(),
+        event_id=event_id_for(target),
+        session=object_session(target),
+        connection=connection
+    )
+
+
+def _publish_pending(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    broker = get_broker()
+    for message in pending:
+        broker.publish(message['user_id'], message['event'], message['data'],
+                       message['id'], message['role'], message['hospital_id'])
+
+
+def _discard_pending(session, *args):
+    session.info.pop(PENDING_KEY, None)
+
+
+def init_app(app):
+    app.extensions['notification_broker'] = NotificationBroker()
+    app.extensions['notification_listener_lock'] = threading.Lock()
+
+    if not event.contains(Notification, 'after_insert', _queue_new_notification):
+        event.listen(Notification, 'after_insert', _queue_new_notification)
+        event.listen(db.session, 'after_commit', _publish_pending)
+        event.listen(db.session, 'after_rollback', _discard_pending)
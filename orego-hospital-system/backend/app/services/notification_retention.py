@@ -0,0 +1,136 @@
+from app import db
+from app.models.notification import Notification, NotificationArchive, BroadcastNotification, BroadcastReceipt
+from app.services import notification_service
+from flask import current_app
+from sqlalchemy import delete, func, insert, literal, select
+from datetime import datetime, timedelta
+
+ARCHIVED_COLUMNS = ['id', 'recipient_id', 'title', 'message', 'type', 'is_read', 'related_id', 'hospital_id', 'created_at']
+
+
+def retention_policies():
+    """
+    (type, days) pairs from config. The None entry covers every type that
+    has no explicit policy, using NOTIFICATION_RETENTION_DEFAULT_DAYS.
+    """
+    config = current_app.config
+    policies = [(notification_type, int(days)) for notification_type, days in config['NOTIFICATION_RETENTION_DAYS'].items()]
+    policies.append((None, config['NOTIFICATION_RETENTION_DEFAULT_DAYS']))
+    return policies
+
+
+def _expired(model, notification_type, cutoff):
+    criteria = [model.created_at < cutoff]
+    if notification_type is None:
+        configured = list(current_app.config['NOTIFICATION_RETENTION_DAYS'])
+        if configured:
+            criteria.append(model.type.notin_(configured))
+    else:
+        criteria.append(model.type == notification_type)
+    return criteria
+
+
+def archive_expired_notifications(batch_size=None, dry_run=False, now=None):
+    """
+    Move expired read notifications into notifications_archive.
+
+    Each batch is a short transaction: pick up to batch_size ids (oldest
+    first, via the (type, created_at) index), copy them with INSERT ... SELECT,
+    delete them, commit. Locks are held per batch rather than for the whole
+    run. Unread notifications are never archived, so unread counters stay
+    valid. Returns {type: rows_archived}.
+    """
+    batch_size = batch_size or current_app.config['NOTIFICATION_ARCHIVE_BATCH_SIZE']
+    now = now or datetime.utcnow()
+    reclaimed = {}
+
+    for notification_type, days in retention_policies():
+        cutoff = now - timedelta(days=days)
+        criteria = [Notification.is_read.is_(True), *_expired(Notification, notification_type, cutoff)]
+        label = notification_type or '*'
+
+        if dry_run:
+            reclaimed[label] = db.session.query(Notification.id).filter(*criteria).count()
+            continue
+
+        total = 0
+        while True:
+            ids = db.session.execute(
+                select(Notification.id).where(*criteria).order_by(Notification.created_at).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+
+            db.session.execute(insert(NotificationArchive).from_select(
+                ARCHIVED_COLUMNS + ['archived_at'],
+                select(*[getattr(Notification, column) for column in ARCHIVED_COLUMNS], literal(now, db.DateTime))
+                .where(Notification.id.in_(ids))
+            ))
+            db.session.execute(
+                delete(Notification).where(Notification.id.in_(ids)).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+
+            total += len(ids)
+            if len(ids) < batch_size:
+                break
+
+        reclaimed[label] = total
+
+    return reclaimed
+
+
+def purge_expired_broadcasts(batch_size=None, dry_run=False, now=None):
+    """
+    Delete broadcasts past their type's retention period, with their
+    receipts. A broadcast is a single row however many users read it, so
+    expiry does not wait for reads: users who still had it unread get it
+    taken out of their unread counter in the same transaction. Each batch
+    of broadcasts (counters, receipts, then the broadcasts) is one short
+    transaction. Returns {type: {'broadcasts': n, 'receipts': n}}.
+    """
+    batch_size = batch_size or current_app.config['NOTIFICATION_ARCHIVE_BATCH_SIZE']
+    now = now or datetime.utcnow()
+    purged = {}
+
+    for notification_type, days in retention_policies():
+        criteria = _expired(BroadcastNotification, notification_type, now - timedelta(days=days))
+        label = notification_type or '*'
+
+        if dry_run:
+            expired = select(BroadcastNotification.id).where(*criteria)
+            purged[label] = {
+                'broadcasts': db.session.execute(select(func.count()).select_from(expired.subquery())).scalar(),
+                'receipts': db.session.execute(
+                    select(func.count()).select_from(BroadcastReceipt).where(BroadcastReceipt.broadcast_id.in_(expired))
+                ).scalar()
+            }
+            continue
+
+        broadcasts = receipts = 0
+        while True:
+            ids = db.session.execute(
+                select(BroadcastNotification.id).where(*criteria)
+                .order_by(BroadcastNotification.created_at).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+
+            notification_service.discount_broadcasts(ids, now=now)
+            receipts += db.session.execute(
+                delete(BroadcastReceipt).where(BroadcastReceipt.broadcast_id.in_(ids))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.execute(
+                delete(BroadcastNotification).where(BroadcastNotification.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+
+            broadcasts += len(ids)
+            if len(ids) < batch_size:
+                break
+
+        purged[label] = {'broadcasts': broadcasts, 'receipts': receipts}
+
+    return purged
@@ -0,0 +1,372 @@
+from app import db
+from app.models.notification import Notification, BroadcastNotification, BroadcastReceipt, NotificationCounter
+from app.models.user import User
+from app.services import notification_events
+from sqlalchemy import and_, case, delete, event, func, insert, literal, null, or_, select, true, tuple_, union_all, update
+from app.utils.conditional import collection_validators
+from datetime import datetime
+
+counters = NotificationCounter.__table__
+
+
+def _broadcast_audience(user):
+    """
+    Broadcasts addressed to this user's role (or everyone) in their hospital
+    (or every hospital) since the account existed.
+    Passing the User class instead of an instance gives a correlated filter.
+    """
+    criteria = [
+        or_(BroadcastNotification.audience_role.is_(None), BroadcastNotification.audience_role == user.role),
+        or_(BroadcastNotification.hospital_id.is_(None), BroadcastNotification.hospital_id == user.hospital_id)
+    ]
+    if user.created_at is not None:
+        criteria.append(BroadcastNotification.created_at >= user.created_at)
+    return and_(*criteria)
+
+
+def _receipt_join(user):
+    return and_(
+        BroadcastReceipt.broadcast_id == BroadcastNotification.id,
+        BroadcastReceipt.user_id == user.id
+    )
+
+
+def notifications_union(user, is_read=None, notification_type=None, after=None):
+    """
+    Personal notifications and visible broadcasts as one UNION ALL subquery.
+    Both halves are index scans: notifications by (recipient_id, created_at),
+    broadcasts by created_at with a primary-key probe into receipts.
+    `after` is a (created_at, id) cursor; only later rows are returned.
+    """
+    personal = select(
+        Notification.id,
+        Notification.recipient_id,
+        Notification.title,
+        Notification.message,
+        Notification.type,
+        Notification.is_read,
+        Notification.related_id,
+        literal(False).label('is_broadcast'),
+        Notification.created_at
+    ).where(Notification.recipient_id == user.id)
+
+    broadcasts = select(
+        BroadcastNotification.id,
+        literal(user.id).label('recipient_id'),
+        BroadcastNotification.title,
+        BroadcastNotification.message,
+        BroadcastNotification.type,
+        BroadcastReceipt.read_at.isnot(None).label('is_read'),
+        null().label('related_id'),
+        literal(True).label('is_broadcast'),
+        BroadcastNotification.created_at
+    ).outerjoin(BroadcastReceipt, _receipt_join(user)).where(
+        _broadcast_audience(user),
+        BroadcastReceipt.dismissed_at.is_(None)
+    )
+
+    if is_read is not None:
+        personal = personal.where(Notification.is_read.is_(is_read))
+        broadcasts = broadcasts.where(
+            BroadcastReceipt.read_at.isnot(None) if is_read else BroadcastReceipt.read_at.is_(None)
+        )
+
+    if notification_type:
+        personal = personal.where(Notification.type == notification_type)
+        broadcasts = broadcasts.where(BroadcastNotification.type == notification_type)
+
+    if after:
+        personal = personal.where(tuple_(Notification.created_at, Notification.id) > after)
+        broadcasts = broadcasts.where(tuple_(BroadcastNotification.created_at, BroadcastNotification.id) > after)
+
+    return union_all(personal, broadcasts).subquery('user_notifications')
+
+
+def row_to_dict(row):
+    data = dict(row._mapping)
+    data['created_at'] = data['created_at'].isoformat() if data['created_at'] else None
+    return data
+
+
+def list_notifications(user, is_read=None, notification_type=None, after=None, limit=None, oldest_first=False):
+    merged = notifications_union(user, is_read, notification_type, after)
+    # id breaks created_at ties, matching the (created_at, id) replay cursor
+    if oldest_first:
+        order = (merged.c.created_at.asc(), merged.c.id.asc())
+    else:
+        order = (merged.c.created_at.desc(), merged.c.id.desc())
+    statement = select(merged).order_by(*order)
+    if limit:
+        statement = statement.limit(limit)
+    return [row_to_dict(row) for row in db.session.execute(statement)]
+
+
+def _unread_count_expression(user):
+    """Unread personal notifications plus unread broadcasts as one scalar expression"""
+    personal = select(func.count()).select_from(Notification).where(
+        Notification.recipient_id == user.id,
+        Notification.is_read.is_(False)
+    )
+    broadcasts = select(func.count()).select_from(BroadcastNotification).outerjoin(
+        BroadcastReceipt, _receipt_join(user)
+    ).where(
+        _broadcast_audience(user),
+        BroadcastReceipt.read_at.is_(None),
+        BroadcastReceipt.dismissed_at.is_(None)
+    )
+    return personal.scalar_subquery() + broadcasts.scalar_subquery()
+
+
+def compute_unread_count(user):
+    """Count unread notifications from the source tables (bypasses the counter)"""
+    return db.session.execute(select(_unread_count_expression(user))).scalar()
+
+
+def unread_count(user):
+    """
+    Cached unread total for the user: one primary-key read. Counter rows are
+    created with the user (and backfilled by migration); users bulk-loaded
+    without one are counted from the source tables until
+    `flask notifications repair-counters` creates it. Never writes.
+    """
+    counter = db.session.get(NotificationCounter, user.id)
+    if counter is None:
+        return compute_unread_count(user)
+    return counter.unread_count
+
+
+def touch_counter(user_id):
+    """Bump the counter's updated_at for list changes that leave the unread total alone"""
+    db.session.execute(
+        update(counters).where(counters.c.user_id == user_id).values(updated_at=datetime.utcnow())
+    )
+
+
+def notification_validators(user):
+    """Conditional-GET validators for the user's merged notification list"""
+    counter = select(counters.c.unread_count, counters.c.updated_at).where(counters.c.user_id == user.id)
+    return collection_validators(
+        Notification.query.filter_by(recipient_id=user.id),
+        Notification.created_at,
+        counter.with_only_columns(counters.c.unread_count).scalar_subquery(),
+        counter.with_only_columns(counters.c.updated_at).scalar_subquery()
+    )
+
+
+def adjust_unread(user_id, delta, connection=None):
+    """Shift a user's unread counter inside the current transaction and tell open streams"""
+    adjusted = counters.c.unread_count + delta
+    (connection or db.session).execute(
+        update(counters)
+        .where(counters.c.user_id == user_id)
+        .values(unread_count=case((adjusted < 0, 0), else_=adjusted), updated_at=datetime.utcnow())
+    )
+    notification_events.emit(user_id, 'unread_count', {'delta': delta}, connection=connection)
+
+
+def reset_unread(user_id):
+    db.session.execute(
+        update(counters)
+        .where(counters.c.user_id == user_id)
+        .values(unread_count=0, updated_at=datetime.utcnow())
+    )
+    notification_events.emit(user_id, 'unread_count', {'unread_count': 0})
+
+
+def discount_broadcasts(broadcast_ids, now=None):
+    """
+    Take broadcasts that are about to be deleted out of the unread counters
+    of the users who still have them unread (same audience and read rules
+    as _unread_count_expression), in the caller's transaction. Returns the
+    number of counters changed.
+    """
+    removed = select(func.count()).select_from(BroadcastNotification).join(
+        User, User.id == counters.c.user_id
+    ).outerjoin(BroadcastReceipt, _receipt_join(User)).where(
+        BroadcastNotification.id.in_(broadcast_ids),
+        _broadcast_audience(User),
+        BroadcastReceipt.read_at.is_(None),
+        BroadcastReceipt.dismissed_at.is_(None)
+    ).scalar_subquery()
+    adjusted = counters.c.unread_count - removed
+    return db.session.execute(
+        update(counters)
+        .where(removed > 0)
+        .values(unread_count=case((adjusted < 0, 0), else_=adjusted), updated_at=now or datetime.utcnow())
+    ).rowcount
+
+
+def repair_unread_counters(user_id=None, batch_size=1000):
+    """
+    Rebuild counters from the notification tables in keyset-paged batches,
+    committing after each so no long transaction holds the counter rows.
+    Returns the number of users recomputed.
+    """
+    now = datetime.utcnow()
+    repaired = 0
+    last_id = ''
+
+    while True:
+        if user_id:
+            user_ids = [user_id]
+        else:
+            user_ids = db.session.execute(
+                select(User.id).where(User.id > last_id).order_by(User.id).limit(batch_size)
+            ).scalars().all()
+        if not user_ids:
+            break
+
+        db.session.execute(delete(counters).where(counters.c.user_id.in_(user_ids)))
+        db.session.execute(insert(counters).from_select(
+            ['user_id', 'unread_count', 'updated_at'],
+            select(User.id, _unread_count_expression(User), literal(now, db.DateTime)).where(User.id.in_(user_ids))
+        ))
+        db.session.commit()
+
+        repaired += len(user_ids)
+        if user_id or len(user_ids) < batch_size:
+            break
+        last_id = user_ids[-1]
+
+    return repaired
+
+
+def get_visible_broadcast(user, broadcast_id):
+    return BroadcastNotification.query.filter(
+        BroadcastNotification.id == broadcast_id,
+        _broadcast_audience(user)
+    ).first()
+
+
+def _receipt_for(user, broadcast):
+    receipt = db.session.get(BroadcastReceipt, (broadcast.id, user.id))
+    if not receipt:
+        receipt = BroadcastReceipt(broadcast_id=broadcast.id, user_id=user.id)
+        db.session.add(receipt)
+    return receipt
+
+
+def broadcast_to_dict(user, broadcast, receipt=None):
+    data = broadcast.to_dict()
+    data['recipient_id'] = user.id
+    data['is_read'] = bool(receipt and receipt.read_at)
+    return data
+
+
+def mark_broadcast_read(user, broadcast):
+    """Record that the user has read a broadcast. The caller commits."""
+    receipt = _receipt_for(user, broadcast)
+    if not receipt.read_at:
+        receipt.read_at = datetime.utcnow()
+        if not receipt.dismissed_at:
+            adjust_unread(user.id, -1)
+    return receipt
+
+
+def dismiss_broadcast(user, broadcast):
+    """Hide a broadcast from the user's list; the shared row is untouched. The caller commits."""
+    receipt = _receipt_for(user, broadcast)
+    if not receipt.dismissed_at:
+        if not receipt.read_at:
+            adjust_unread(user.id, -1)
+        else:
+            touch_counter(user.id)
+        now = datetime.utcnow()
+        receipt.dismissed_at = now
+        receipt.read_at = receipt.read_at or now
+    return receipt
+
+
+def mark_all_read(user):
+    """Mark personal notifications and every visible broadcast as read. The caller commits."""
+    now = datetime.utcnow()
+
+    Notification.query.filter_by(recipient_id=user.id, is_read=False).update({'is_read': True})
+
+    db.session.execute(
+        update(BroadcastReceipt)
+        .where(BroadcastReceipt.user_id == user.id, BroadcastReceipt.read_at.is_(None))
+        .values(read_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+    unreceipted = select(
+        BroadcastNotification.id,
+        literal(user.id),
+        literal(now, db.DateTime)
+    ).outerjoin(BroadcastReceipt, _receipt_join(user)).where(
+        _broadcast_audience(user),
+        BroadcastReceipt.broadcast_id.is_(None)
+    )
+    db.session.execute(
+        insert(BroadcastReceipt).from_select(['broadcast_id', 'user_id', 'read_at'], unreceipted)
+    )
+
+    reset_unread(user.id)
+
+
+def _audience_users(role=None, hospital_id=None):
+    criteria = []
+    if role:
+        criteria.append(User.role == role)
+    if hospital_id:
+        criteria.append(User.hospital_id == hospital_id)
+    return criteria
+
+
+def audience_size(role=None, hospital_id=None):
+    return db.session.query(func.count(User.id)).filter(
+        User.is_active.is_(True), *_audience_users(role, hospital_id)
+    ).scalar()
+
+
+def broadcast(title, message, notification_type='general', role=None, created_by=None, hospital_id=None):
+    """
+    Store a broadcast once; recipients see it through notifications_union()
+    rather than getting a copied row each. hospital_id=None reaches every
+    hospital. The caller commits.
+    """
+    announcement = BroadcastNotification(
+        title=title,
+        message=message,
+        type=notification_type,
+        audience_role=role,
+        hospital_id=hospital_id,
+        created_by=created_by
+    )
+    db.session.add(announcement)
+    db.session.flush()
+
+    # Every existing user in the audience gains one unread item
+    criteria = _audience_users(role, hospital_id)
+    audience = counters.c.user_id.in_(select(User.id).where(*criteria)) if criteria else true()
+    db.session.execute(
+        update(counters)
+        .where(audience)
+        .values(unread_count=counters.c.unread_count + 1, updated_at=datetime.utcnow())
+    )
+
+    notification_events.emit_broadcast(
+        role, 'notification', announcement.to_dict(),
+        event_id=notification_events.event_id_for(announcement), hospital_id=hospital_id
+    )
+    notification_events.emit_broadcast(role, 'unread_count', {'delta': 1}, hospital_id=hospital_id)
+
+    return announcement
+
+
+def _create_counter(mapper, connection, target):
+    # In the user's own INSERT transaction, so no adjust_unread() can run before the row exists
+    connection.execute(insert(counters).values(user_id=target.id, unread_count=0, updated_at=datetime.utcnow()))
+
+
+def _count_new_notification(mapper, connection, target):
+    if not target.is_read:
+        adjust_unread(target.recipient_id, 1, connection=connection)
+
+
+def init_app(app):
+    if not event.contains(Notification, 'after_insert', _count_new_notification):
+        event.listen(Notification, 'after_insert', _count_new_notification)
+    if not event.contains(User, 'after_insert', _create_counter):
+        event.listen(User, 'after_insert', _create_counter)
@@ -0,0 +1,125 @@
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import event
+
+from app import db
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+WAKE_KEY = 'outbox_recorded'
+
+_handlers = {}
+
+
+def register_handler(event_type, fn):
+    """Register the function that expands an outbox event of this type"""
+    _handlers[event_type] = fn
+
+
+def record(event_type, **payload):
+    """
+    Add an event to the outbox inside the caller's transaction. It becomes
+    visible to the worker only if that transaction commits.
+    """
+    outbox_event = OutboxEvent(event_type=event_type, payload=json.dumps(payload))
+    db.session.add(outbox_event)
+    db.session.info[WAKE_KEY] = True
+    return outbox_event
+
+
+def _claim(batch_size, now):
+    query = OutboxEvent.query.filter(
+        OutboxEvent.processed_at.is_(None),
+        OutboxEvent.available_at <= now,
+        OutboxEvent.attempts < current_app.config['OUTBOX_MAX_ATTEMPTS']
+    ).order_by(OutboxEvent.created_at).limit(batch_size)
+
+    # Concurrent workers on Postgres each take a disjoint batch
+    return query.with_for_update(skip_locked=True).all()
+
+
+def process_batch(batch_size=None):
+    """
+    Claim and expand one batch of pending events in a single transaction.
+    A failing handler is rolled back to its savepoint and retried later with
+    exponential backoff; the rest of the batch still commits.
+    Returns the number of events processed successfully.
+    """
+    batch_size = batch_size or current_app.config['OUTBOX_BATCH_SIZE']
+    now = datetime.utcnow()
+    processed = 0
+
+    for outbox_event in _claim(batch_size, now):
+        fn = _handlers.get(outbox_event.event_type)
+        try:
+            with db.session.begin_nested():
+                if fn is None:
+                    raise LookupError(f'No outbox handler for {outbox_event.event_type}')
+                fn(outbox_event.data)
+            outbox_event.processed_at = datetime.utcnow()
+            outbox_event.last_error = None
+            processed += 1
+        except Exception as e:
+            logger.exception('Outbox event %s (%s) failed', outbox_event.id, outbox_event.event_type)
+            outbox_event.attempts += 1
+            outbox_event.last_error = str(e)
+            outbox_event.available_at = now + timedelta(seconds=min(2 ** outbox_event.attempts, 300))
+
+    db.session.commit()
+    return processed
+
+
+def purge_processed(older_than_days):
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    deleted = OutboxEvent.query.filter(
+        OutboxEvent.processed_at.isnot(None),
+        OutboxEvent.processed_at < cutoff
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+def run_worker(app, stop=None):
+    """Drain the outbox until stopped, sleeping between empty polls"""
+    stop = stop or threading.Event()
+    wake = app.extensions['outbox_wake']
+    interval = app.config['OUTBOX_POLL_INTERVAL']
+
+    while not stop.is_set():
+        try:
+            with app.app_context():
+                processed = process_batch()
+                db.session.remove()
+        except Exception:
+            logger.exception('Outbox worker iteration failed')
+            processed = 0
+
+        if not processed:
+            wake.wait(interval)
+            wake.clear()
+
+
+def start_worker_thread(app):
+    worker = threading.Thread(target=run_worker, args=(app,), name='outbox-worker', daemon=True)
+    worker.start()
+    return worker
+
+
+def _wake_worker(session):
+    if session.info.pop(WAKE_KEY, False):
+        current_app.extensions['outbox_wake'].set()
+
+
+def init_app(app):
+    app.extensions['outbox_wake'] = threading.Event()
+
+    from app.services import notification_dispatch
+    notification_dispatch.register()
+
+    if not event.contains(db.session, 'after_commit', _wake_worker):
+        event.listen(db.session, 'after_commit', _wake_worker)
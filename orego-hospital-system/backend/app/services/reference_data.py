@@ -0,0 +1,42 @@
+"""
+Versioned bundle of the static reference lists the frontend needs at boot.
+
+The bundle only changes on deploy, so it is serialized once per process and
+its version is a hash of the serialized content: the same data always has
+the same version, and any change produces a new one. Its compressed
+variants are built once along with it.
+"""
+import hashlib
+import json
+from collections import namedtuple
+from functools import lru_cache
+
+from app.middleware.compression import precompress
+from app.utils.validators import (
+    SPECIALITIES, OPERATION_TYPES, ROLES, RESOURCE_TYPES, RESOURCE_STATUSES,
+    STAFF_ALLOCATION_TYPES, BOOKING_TYPES, BOOKING_STATUSES, NOTIFICATION_TYPES
+)
+
+Bundle = namedtuple('Bundle', ['version', 'body', 'encoded'])
+
+
+def reference_data():
+    return {
+        'specialities': SPECIALITIES,
+        'operation_types': OPERATION_TYPES,
+        'roles': ROLES,
+        'resource_types': RESOURCE_TYPES,
+        'resource_statuses': RESOURCE_STATUSES,
+        'allocation_types': STAFF_ALLOCATION_TYPES + RESOURCE_TYPES,
+        'booking_types': BOOKING_TYPES,
+        'booking_statuses': BOOKING_STATUSES,
+        'notification_types': NOTIFICATION_TYPES
+    }
+
+
+@lru_cache(maxsize=None)
+def get_bundle():
+    data = reference_data()
+    version = hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    body = json.dumps({'version': version, **data}, separators=(',', ':')).encode('utf-8')
+    return Bundle(version, body, precompress(body))
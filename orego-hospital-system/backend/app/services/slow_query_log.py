@@ -0,0 +1,166 @@
+"""
+Slow-query log: statements slower than SLOW_QUERY_MS are kept in a bounded
+in-process ring buffer (the newest SLOW_QUERY_LOG_SIZE entries) with the
+route and hospital that ran them, and shown to admins at
+/api/diagnostics/slow-queries: a hospital's admins see only the statements
+of their hospital's requests, platform admins (no hospital) see them all.
+
+Only the shapes of the bind parameters (their types) are stored, never the
+values, which are patient data more often than not. A sample of entries
+(SLOW_QUERY_EXPLAIN_SAMPLE) also gets the query plan. The EXPLAIN runs when
+the request is torn down, after the view and its transaction are done, on a
+separate connection that is rolled back; only sampled requests pay for it:
+
+- PostgreSQL: EXPLAIN (ANALYZE, BUFFERS) for SELECTs, which runs the query
+  again; a plain EXPLAIN (no execution) for everything else
+- SQLite: EXPLAIN QUERY PLAN
+
+The plan is computed with the real bind values, so it can contain literal
+values from the query. Statements run outside a request (CLI jobs) are logged
+without a plan. Like the metrics, the log is per worker process.
+"""
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.middleware import tenancy
+
+# Connections running an EXPLAIN carry this execution option and are not logged themselves
+EXPLAIN_OPTION = 'slow_query_explain'
+
+
+class SlowQueryLog:
+    def __init__(self, size=200):
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def resize(self, size):
+        with self._lock:
+            if self._entries.maxlen != size:
+                self._entries = deque(self._entries, maxlen=size)
+
+    def add(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self, hospital_id=None):
+        """Newest first; only those recorded for hospital_id when one is given"""
+        with self._lock:
+            entries = list(reversed(self._entries))
+        if hospital_id is None:
+            return entries
+        return [entry for entry in entries if entry['hospital_id'] == hospital_id]
+
+    def clear(self, hospital_id=None):
+        """Drop every entry, or only those recorded for hospital_id when one is given"""
+        with self._lock:
+            if hospital_id is None:
+                self._entries.clear()
+            else:
+                self._entries = deque(
+                    (entry for entry in self._entries if entry['hospital_id'] != hospital_id),
+                    maxlen=self._entries.maxlen
+                )
+
+
+log = SlowQueryLog()
+
+
+def parameter_shape(parameters):
+    """The types of the bind values, in the DBAPI layout (dict, sequence or a list of either)"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _origin():
+    if not has_request_context():
+        return None, None
+    rule = request.url_rule
+    return request.endpoint, f"{request.method} {rule.rule if rule is not None else request.path}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_slow_query_started', None)
+    if started is None or not has_app_context():
+        return
+
+    config = current_app.config
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not config['SLOW_QUERY_LOG_ENABLED'] or elapsed_ms < config['SLOW_QUERY_MS']:
+        return
+    if conn.get_execution_options().get(EXPLAIN_OPTION):
+        return
+
+    endpoint, route = _origin()
+    if executemany:
+        shape = {'rows': len(parameters), 'row': parameter_shape(parameters[0]) if parameters else None}
+    else:
+        shape = parameter_shape(parameters)
+
+    entry = {
+        'recorded_at': datetime.utcnow().isoformat(),
+        'duration_ms': round(elapsed_ms, 2),
+        'endpoint': endpoint,
+        'route': route,
+        'hospital_id': tenancy.current_hospital_id(),
+        'statement': statement,
+        'parameter_shape': shape,
+        'executemany': executemany,
+        'plan': None,
+    }
+    log.resize(config['SLOW_QUERY_LOG_SIZE'])
+    log.add(entry)
+
+    # The plan is filled in at teardown, using the values this statement actually ran with
+    if endpoint is not None and not executemany and random.random() < config['SLOW_QUERY_EXPLAIN_SAMPLE']:
+        pending = g.setdefault('_slow_queries_to_explain', [])
+        pending.append((entry, conn.engine, statement, parameters))
+
+
+def explain(engine, statement, parameters):
+    """The query plan of a statement as text, or None for databases without a supported EXPLAIN"""
+    dialect = engine.dialect.name
+    if dialect == 'postgresql':
+        # A WITH may wrap a data-modifying statement, so only a plain SELECT is run again
+        if statement.lstrip()[:6].upper() == 'SELECT':
+            prefix = 'EXPLAIN (ANALYZE, BUFFERS) '
+        else:
+            prefix = 'EXPLAIN '
+    elif dialect == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        return None
+
+    # Rolled back on exit, so even an ANALYZE never leaves anything behind
+    with engine.connect().execution_options(**{EXPLAIN_OPTION: True}) as connection:
+        rows = connection.exec_driver_sql(prefix + statement, parameters or ()).all()
+    return '\n'.join(str(row[-1]) for row in rows)
+
+
+def _explain_pending(exc=None):
+    for entry, engine, statement, parameters in g.pop('_slow_queries_to_explain', ()):
+        try:
+            entry['plan'] = explain(engine, statement, parameters)
+        except Exception as e:
+            entry['plan'] = f'EXPLAIN failed: {e}'
+
+
+def init_app(app):
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    app.teardown_request(_explain_pending)
@@ -0,0 +1,57 @@
+import hashlib
+from collections import namedtuple
+from flask import request, make_response
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import func, select
+
+Validators = namedtuple('Validators', ['etag'])
+
+def collection_validators(query, updated_column, *extra):
+    """
+    ETag for the rows a query would return, computed as one aggregate
+    (row count + max(updated_column)) without loading or serializing any
+    rows. Extra scalar expressions are folded into the ETag. The ETag is
+    scoped to the caller and the full request path, so role filtering and
+    query-string filters never share a validator.
+
+    There is deliberately no Last-Modified: a deleted row or a change that
+    leaves updated_column alone does not move max(updated_column), so an
+    If-Modified-Since check would answer 304 for a changed list.
+    """
+    row = query.with_entities(func.count(), func.max(updated_column), *extra).order_by(None).one()
+
+    fingerprint = '|'.join(str(part) for part in (request.full_path, get_jwt_identity(), *row))
+    etag = hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+
+    return Validators(etag)
+
+def embedded_versions(model, ids, *columns):
+    """
+    Row count and max() of columns (default updated_at) over the model's
+    rows whose id is in `ids`, as scalar subqueries for the extra argument
+    of collection_validators() when a response embeds those rows (patient
+    and doctor names, allocations). `ids` selects only the rows actually
+    embedded, so edits elsewhere leave the ETag alone and the cost follows
+    the response, not the table.
+    """
+    criteria = model.id.in_(ids)
+    columns = columns or (model.updated_at,)
+    return [select(func.count()).select_from(model).where(criteria).scalar_subquery()] + [
+        select(func.max(column)).where(criteria).scalar_subquery() for column in columns
+    ]
+
+def is_not_modified(validators):
+    """True when the client's cached copy (If-None-Match) is current"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(validators.etag)
+    return False
+
+def with_validators(response, validators):
+    """Attach the ETag and revalidation headers to a response"""
+    response.set_etag(validators.etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Authorization')
+    return response
+
+def not_modified(validators):
+    return with_validators(make_response('', 304), validators)
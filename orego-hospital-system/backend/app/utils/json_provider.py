@@ -0,0 +1,55 @@
+"""
+JSON provider for jsonify() and request.get_json().
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Either way dates and datetimes are written as ISO 8601 (Flask's
+default would write HTTP dates), matching the strings to_dict() returns, so
+schema rows can keep raw date values and leave the formatting to the encoder.
+Keys keep their insertion (schema) order.
+"""
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class JSONProvider(DefaultJSONProvider):
+    sort_keys = False
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):  # datetime included
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def encode(self, obj):
+        """Compact single-line UTF-8 bytes, for bodies written out piece by piece"""
+        return self.dumps(obj).encode('utf-8')
+
+class OrjsonProvider(JSONProvider):
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode('utf-8')
+
+    def encode(self, obj):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def create_json_provider(app):
+    return OrjsonProvider(app) if orjson is not None else JSONProvider(app)
@@ -0,0 +1,90 @@
+"""
+Query budgets: a fixed upper bound on the SQL statements a block of code (a
+view, or a test request) may execute, so an N+1 regression, e.g. a to_dict()
+that starts touching a relationship per row, fails loudly instead of
+creeping in.
+
+query_budget(n) is both a decorator and a context manager:
+
+    @bookings_bp.route('/', methods=['GET'])
+    @query_budget(4)
+    @jwt_required()
+    def get_all_bookings(): ...
+
+    with query_budget(4):
+        client.get('/api/bookings/', headers=headers)
+
+Statements are counted per thread (per greenlet under gevent), so
+concurrent requests never add to each other's counts. As a context manager
+outside an application context, or anywhere with QUERY_BUDGET_ENFORCE or
+TESTING on, exceeding the budget raises QueryBudgetExceeded listing the
+statements; in production it is only logged as a warning. Rows a streamed
+response reads after its view has returned are not counted by the decorator.
+"""
+import threading
+from functools import wraps
+
+from flask import current_app, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.services.slow_query_log import EXPLAIN_OPTION
+
+_active = threading.local()
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, budget, statements, where=None):
+        self.budget = budget
+        self.statements = statements
+        listing = '\n'.join(f'  {number}. {statement}' for number, statement in enumerate(statements, 1))
+        super().__init__(
+            f"{len(statements)} SQL statements{f' in {where}' if where else ''}, budget is {budget}:\n{listing}"
+        )
+
+class query_budget:
+    def __init__(self, max_queries):
+        self.max_queries = max_queries
+        self.statements = []
+
+    def __call__(self, fn):
+        # Each call of the view gets its own budget, so concurrent requests never share a count
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with query_budget(self.max_queries):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        _listen()
+        _stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _stack().remove(self)
+        if exc_type is None and len(self.statements) > self.max_queries:
+            where = f'{request.method} {request.path}' if has_request_context() else None
+            error = QueryBudgetExceeded(self.max_queries, self.statements, where)
+            if has_app_context() and not (current_app.config['QUERY_BUDGET_ENFORCE'] or current_app.testing):
+                current_app.logger.warning(str(error))
+            else:
+                raise error
+        return False
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+def _stack():
+    if not hasattr(_active, 'budgets'):
+        _active.budgets = []
+    return _active.budgets
+
+def _count(conn, cursor, statement, parameters, context, executemany):
+    budgets = getattr(_active, 'budgets', None)
+    if budgets and not conn.get_execution_options().get(EXPLAIN_OPTION):
+        for budget in budgets:
+            budget.statements.append(statement)
+
+def _listen():
+    if not event.contains(Engine, 'after_cursor_execute', _count):
+        event.listen(Engine, 'after_cursor_execute', _count)
@@ -0,0 +1,49 @@
+"""
+Streamed list responses for large result sets.
+
+?stream=json returns the same {"<key>": [...], "count": n} body as the
+buffered endpoint, written out batch by batch as rows come off the cursor;
+count, only known at the end, is already the last key. ?stream=ndjson returns
+one record per line instead. The mode is part of the URL, so the ETag (which
+covers the full path) never matches across representations.
+
+The opening bytes go out before the query runs, so time to first byte does
+not depend on the size of the result. Once the body has started an error can
+no longer become a 500: the connection is closed with a truncated body, which
+clients detect as invalid JSON (or a missing final newline for NDJSON).
+"""
+from flask import Response, current_app, request, stream_with_context
+
+MODES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+}
+
+def stream_mode():
+    """'json', 'ndjson' or None (buffered) from ?stream=; ValueError for an unknown mode"""
+    mode = request.args.get('stream')
+    if mode is not None and mode not in MODES:
+        raise ValueError(f'stream must be one of: {", ".join(MODES)}')
+    return mode
+
+def _json_array(key, batches, encode):
+    yield b'{' + encode(key) + b':['
+    count = 0
+    for batch in batches:
+        if batch:
+            yield (b',' if count else b'') + b','.join(encode(record) for record in batch)
+            count += len(batch)
+    yield b'],"count":' + encode(count) + b'}\n'
+
+def _ndjson(batches, encode):
+    for batch in batches:
+        if batch:
+            yield b''.join(encode(record) + b'\n' for record in batch)
+
+def stream_response(key, batches, mode):
+    """A streamed response for batches of records (e.g. Schema.stream_list()), one chunk per batch"""
+    encode = current_app.json.encode
+    chunks = _ndjson(batches, encode) if mode == 'ndjson' else _json_array(key, batches, encode)
+    response = Response(stream_with_context(chunks), mimetype=MODES[mode])
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -43,6 +43,21 @@ SPECIALITIES = [
 
 OPERATION_TYPES = ['surgical', 'medical', 'operation']
 
+ROLES = ['admin', 'doctor', 'nurse', 'patient', 'staff']
+
+RESOURCE_TYPES = ['bed', 'operation_theatre', 'machine']
+
+RESOURCE_STATUSES = ['available', 'booked', 'maintenance']
+
+# Staff roles that can be allocated to a booking alongside RESOURCE_TYPES
+STAFF_ALLOCATION_TYPES = ['nurse', 'staff']
+
+BOOKING_TYPES = ['appointment', 'surgery', 'test']
+
+BOOKING_STATUSES = ['scheduled', 'completed', 'cancelled']
+
+NOTIFICATION_TYPES = ['booking', 'discharge', 'alert', 'general']
+
 def validate_email(email):
     """Validate email format"""
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -127,9 +142,8 @@ def validate_resource_data(data):
             errors.append(f'{field} is required')
     
     if 'type' in data:
-        valid_types = ['bed', 'operation_theatre', 'machine']
-        if data['type'] not in valid_types:
-            errors.append(f'Type must be one of: {", ".join(valid_types)}')
+        if data['type'] not in RESOURCE_TYPES:
+            errors.append(f'Type must be one of: {", ".join(RESOURCE_TYPES)}')
         
         # Type-specific validation
         if data['type'] == 'bed':
@@ -144,6 +158,9 @@ def validate_resource_data(data):
             if not data.get('serial_number'):
                 errors.append('Serial number is required for machines')
     
+    if 'status' in data and data['status'] not in RESOURCE_STATUSES:
+        errors.append(f'Status must be one of: {", ".join(RESOURCE_STATUSES)}')
+    
     if errors:
         return False, ', '.join(errors)
     
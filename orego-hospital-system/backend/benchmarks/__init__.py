@@ -0,0 +1 @@
+"""Benchmark scripts, run from the backend directory as python benchmarks/<name>.py"""
@@ -0,0 +1,139 @@
+"""
+Broadcast fan-out benchmark
+
+Compares the old broadcast (load every User, add one Notification ORM object
+per user, single flush) with the fan-out-on-read broadcast in
+app.services.notification_service, which stores one row per announcement.
+Reports wall time, peak Python memory and rows written for each audience
+size, plus the read-side cost of one user's merged list and unread count.
+
+Usage (from the backend directory):
+    python benchmarks/broadcast_benchmark.py --sizes 1000 10000 100000
+    DATABASE_URL=postgresql://... python benchmarks/broadcast_benchmark.py --yes-drop
+
+Without DATABASE_URL a throwaway SQLite file is used. The benchmark drops and
+recreates all tables, so any other database is refused unless --yes-drop is
+given; never point it at a real one.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if not os.getenv('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'orego_broadcast.db')}"
+
+from app import create_app, db
+from app.models.notification import Notification, BroadcastNotification
+from app.models.user import User
+from app.services import notification_service
+from benchmarks.scratch_database import add_drop_argument, confirm_drop
+
+
+def load_users(count, chunk_size=5000):
+    """Insert synthetic active users through Core executemany"""
+    for start in range(0, count, chunk_size):
+        rows = []
+        for i in range(start, min(start + chunk_size, count)):
+            rows.append({
+                'id': str(uuid.uuid4()),
+                'username': f'bench{i}',
+                'password_hash': 'x',
+                'role': 'patient',
+                'name': f'Benchmark Patient {i}',
+                'birthday': date(1990, 1, 1),
+                'id_card_number': f'{i:09d}V',
+                'address': 'Benchmark Address',
+                'phone_number': '0771234567',
+                'email': f'bench{i}@example.com',
+                'is_active': True
+            })
+        db.session.execute(User.__table__.insert(), rows)
+    db.session.commit()
+
+
+def legacy_broadcast(title, message):
+    """The original per-user ORM implementation, kept here for comparison"""
+    users = User.query.filter_by(is_active=True).all()
+    for user in users:
+        db.session.add(Notification(recipient_id=user.id, title=title, message=message, type='general'))
+    db.session.commit()
+    return len(users)
+
+
+def fan_out_on_read_broadcast(title, message):
+    notification_service.broadcast(title, message)
+    db.session.commit()
+    return notification_service.audience_size()
+
+
+def rows_written():
+    return Notification.query.count() + BroadcastNotification.query.count()
+
+
+def read_cost(user):
+    """Time one user's merged notification list plus unread count"""
+    started = time.perf_counter()
+    notification_service.list_notifications(user)
+    notification_service.unread_count(user)
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(fn):
+    db.session.expunge_all()
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = fn('Benchmark', 'Hospital-wide announcement')
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    written = rows_written()
+    read_ms = read_cost(User.query.first())
+    Notification.query.delete()
+    BroadcastNotification.query.delete()
+    db.session.commit()
+    return count, elapsed, peak / 1024 / 1024, written, read_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--skip-legacy-above', type=int, default=50000,
+                        help='Skip the slow ORM implementation for larger audiences')
+    add_drop_argument(parser)
+    args = parser.parse_args()
+    confirm_drop(parser, args)
+
+    app = create_app()
+    with app.app_context():
+        print(f"Database: {db.engine.url.render_as_string(hide_password=True)}\n")
+        print(f"{'users':>8} | {'implementation':<15} | {'seconds':>8} | {'peak MiB':>8} | "
+              f"{'rows':>8} | {'read ms':>7}")
+        print('-' * 72)
+
+        for size in args.sizes:
+            db.drop_all()
+            db.create_all()
+            load_users(size)
+
+            implementations = [('fan-out-on-read', fan_out_on_read_broadcast)]
+            if size <= args.skip_legacy_above:
+                implementations.insert(0, ('orm-legacy', legacy_broadcast))
+
+            for name, fn in implementations:
+                count, elapsed, peak, written, read_ms = measure(fn)
+                print(f"{count:>8} | {name:<15} | {elapsed:>8.3f} | {peak:>8.2f} | "
+                      f"{written:>8} | {read_ms:>7.2f}")
+
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
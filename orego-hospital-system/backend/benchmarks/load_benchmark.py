@@ -0,0 +1,388 @@
+"""
+API load benchmark
+
+Drives the API with concurrent clients against the data written by
+benchmarks/generate_data.py and reports p50/p95/p99 latency, throughput and
+errors per scenario. Each scenario is one API call made as a realistic caller
+(a patient listing their bookings, a doctor pulling discharges, ...), picked
+at random by weight. Tokens are minted directly for users sampled from the
+database, so apart from the login scenario no bcrypt work is measured.
+
+By default the clients run in-process through Flask's test client, one per
+thread, which measures the application and the database without a web
+server (and shares one GIL, so treat it as a lower bound of what a
+multi-worker deployment serves). With --url the same scenarios are sent over
+HTTP to a running server instead; it must use the same database and
+JWT_SECRET_KEY.
+
+Results are written to JSON (--output) with the database, row counts and git
+commit; --compare prints the change against an earlier run.
+
+Usage (from the backend directory):
+    python benchmarks/generate_data.py --scale 0.01
+    python benchmarks/load_benchmark.py --clients 8 --duration 30
+    python benchmarks/load_benchmark.py --url http://127.0.0.1:5000 --clients 32 --writes
+    python benchmarks/load_benchmark.py --compare load-sqlite-20260101-120000.json
+
+Without DATABASE_URL the SQLite file generate_data.py fills by default is
+used. Scenarios only read unless --writes is given (doctors then create
+bookings), so never point it at a real database with --writes.
+"""
+import argparse
+import http.client
+import json
+import logging
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if not os.getenv('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'orego_load.db')}"
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import func, select
+
+from app import create_app, db
+from app.middleware.tenancy import token_claims
+from app.models.user import User
+
+ROLES = ['admin', 'doctor', 'nurse', 'patient']
+TABLES = ['users', 'resources', 'bookings', 'booking_resources', 'notifications', 'discharges']
+
+# path and body may be callables taking (caller, run, rng); role None means no token
+Scenario = namedtuple('Scenario', 'name role weight method path body write')
+
+SCENARIOS = [
+    Scenario('patient bookings', 'patient', 10, 'GET', '/api/bookings/', None, False),
+    Scenario('patient notifications', 'patient', 10, 'GET', '/api/notifications/', None, False),
+    Scenario('patient unread count', 'patient', 15, 'GET', '/api/notifications/unread-count', None, False),
+    Scenario('patient discharges', 'patient', 3, 'GET', '/api/discharges/', None, False),
+    Scenario('me', 'patient', 5, 'GET', '/api/auth/me', None, False),
+    Scenario('doctor bookings', 'doctor', 8, 'GET', '/api/bookings/', None, False),
+    Scenario('doctor discharges', 'doctor', 3, 'GET', '/api/discharges/?fields=id,patient_name,discharge_date', None, False),
+    Scenario('doctor analytics', 'doctor', 1, 'GET', '/api/analytics/discharges', None, False),
+    Scenario('doctors list', 'doctor', 2, 'GET', '/api/users/doctors?fields=id,name,speciality', None, False),
+    Scenario('nurse bookings', 'nurse', 5, 'GET', '/api/bookings/', None, False),
+    Scenario('available beds', 'admin', 2, 'GET', '/api/resources/available?type=bed&fields=id,name,ward_id', None, False),
+    Scenario('admin analytics', 'admin', 1, 'GET', '/api/analytics/discharges', None, False),
+    Scenario('hospital profile', None, 5, 'GET', '/api/hospital/', None, False),
+    Scenario('reference data', None, 3, 'GET', '/api/reference/', None, False),
+    Scenario('login', None, 1, 'POST', '/api/auth/login',
+             lambda caller, run, rng: {'username': rng.choice(run.callers['patient'])['username'],
+                                  'password': run.password}, False),
+    Scenario('create booking', 'doctor', 2, 'POST', '/api/bookings/create',
+             lambda caller, run, rng: {
+                 'patient_id': run.patient_for(caller, rng)['id'],
+                 'doctor_id': caller['id'],
+                 'booking_type': 'appointment',
+                 # Far enough out that the generated schedule rarely conflicts
+                 'scheduled_date': (datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+                                    + timedelta(days=rng.randint(120, 3650), hours=rng.randint(0, 23))).isoformat(),
+                 'duration_hours': 1
+             }, True),
+]
+
+# Expected non-2xx answers that are not errors
+EXPECTED = {'create booking': {409}}
+
+
+class InProcessClient:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, headers, body):
+        response = self.client.open(path, method=method, headers=headers, json=body)
+        size = len(response.get_data())
+        # Runs call_on_close hooks (request metrics) as a real server would
+        response.close()
+        return response.status_code, size
+
+
+class HTTPClient:
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.prefix = parts.path.rstrip('/')
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.netloc = parts.netloc
+        self.connection = None
+
+    def request(self, method, path, headers, body):
+        payload = json.dumps(body) if body is not None else None
+        if payload is not None:
+            headers = {**headers, 'Content-Type': 'application/json'}
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = self.connection_class(self.netloc, timeout=60)
+            try:
+                self.connection.request(method, self.prefix + path, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                return response.status, len(response.read())
+            except (http.client.HTTPException, ConnectionError):
+                # Keep-alive connection dropped by the server; retry once on a fresh one
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+
+class Run:
+    """Shared state of one benchmark run: callers, scenarios and per-scenario samples"""
+
+    def __init__(self, callers, scenarios, password, accept_encoding):
+        self.callers = callers
+        self.scenarios = scenarios
+        self.weights = [scenario.weight for scenario in scenarios]
+        self.password = password
+        self.accept_encoding = accept_encoding
+        self.latencies = {scenario.name: [] for scenario in scenarios}
+        self.statuses = {scenario.name: Counter() for scenario in scenarios}
+        self.errors = Counter()
+        self._lock = threading.Lock()
+
+    def patient_for(self, caller, rng):
+        same_hospital = [p for p in self.callers['patient'] if p['hospital_id'] == caller['hospital_id']]
+        return rng.choice(same_hospital or self.callers['patient'])
+
+    def worker(self, client, seed, measure_from, stop_at):
+        rng = random.Random(seed)
+        latencies = {name: [] for name in self.latencies}
+        statuses = {name: Counter() for name in self.statuses}
+        errors = Counter()
+
+        while time.perf_counter() < stop_at:
+            scenario = rng.choices(self.scenarios, self.weights)[0]
+            caller = rng.choice(self.callers[scenario.role]) if scenario.role else None
+            headers = {'Accept-Encoding': self.accept_encoding} if self.accept_encoding else {}
+            if caller:
+                headers['Authorization'] = f"Bearer {caller['token']}"
+            path = scenario.path(caller, self, rng) if callable(scenario.path) else scenario.path
+            body = scenario.body(caller, self, rng) if scenario.body else None
+
+            started = time.perf_counter()
+            try:
+                status, _ = client.request(scenario.method, path, headers, body)
+            except Exception:
+                status = 0
+            elapsed = time.perf_counter() - started
+
+            if started < measure_from:
+                continue
+            latencies[scenario.name].append(elapsed)
+            statuses[scenario.name][status] += 1
+            if not (200 <= status < 400 or status in EXPECTED.get(scenario.name, ())):
+                errors[scenario.name] += 1
+
+        with self._lock:
+            for name in self.latencies:
+                self.latencies[name].extend(latencies[name])
+                self.statuses[name].update(statuses[name])
+            self.errors.update(errors)
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def summarize(latencies, statuses, errors, duration):
+    values = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 2) if seconds is not None else None
+    return {
+        'requests': len(values),
+        'errors': errors,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'rps': round(len(values) / duration, 1),
+        'mean_ms': ms(sum(values) / len(values)) if values else None,
+        'p50_ms': ms(percentile(values, 50)),
+        'p95_ms': ms(percentile(values, 95)),
+        'p99_ms': ms(percentile(values, 99)),
+        'max_ms': ms(values[-1]) if values else None,
+    }
+
+
+def load_callers(per_role, seed):
+    """A random sample of active users per role, each with a ready access token"""
+    rng = random.Random(seed)
+    callers = {}
+    for role in ROLES:
+        # Sampled from a window of ids (random UUIDs) rather than ORDER BY random() over every row
+        ids = db.session.execute(
+            select(User.id).filter_by(role=role, is_active=True).order_by(User.id).limit(per_role * 20)
+        ).scalars().all()
+        users = User.query.filter(User.id.in_(rng.sample(ids, min(per_role, len(ids))))).all() if ids else []
+        if not users:
+            raise SystemExit(f'No active {role} users: run benchmarks/generate_data.py first')
+        callers[role] = [
+            {
+                'id': user.id,
+                'username': user.username,
+                'hospital_id': user.hospital_id,
+                'token': create_access_token(identity=user.id, additional_claims=token_claims(user))
+            }
+            for user in users
+        ]
+    return callers
+
+
+def row_counts():
+    return {
+        table: db.session.execute(select(func.count()).select_from(db.metadata.tables[table])).scalar()
+        for table in TABLES
+    }
+
+
+def git_commit():
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True, cwd=here).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True, cwd=here).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f'{commit}-dirty' if dirty else commit
+
+
+def print_results(scenarios, total):
+    print(f"{'scenario':<24} | {'requests':>8} | {'rps':>7} | {'errors':>6} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'max ms':>8}")
+    print('-' * 100)
+    fmt = lambda value: f'{value:>8.1f}' if value is not None else f"{'-':>8}"
+    for name, result in [*scenarios.items(), ('total', total)]:
+        print(f"{name:<24} | {result['requests']:>8} | {result['rps']:>7.1f} | {result['errors']:>6} | "
+              f"{fmt(result['p50_ms'])} | {fmt(result['p95_ms'])} | {fmt(result['p99_ms'])} | {fmt(result['max_ms'])}")
+
+
+def print_comparison(previous, current):
+    print(f"\nCompared with {previous['started_at']} ({previous.get('git_commit')}):")
+    print(f"{'scenario':<24} | {'p50 ms':>20} | {'p95 ms':>20} | {'p99 ms':>20}")
+    print('-' * 94)
+    rows = [(name, previous['scenarios'].get(name), result) for name, result in current['scenarios'].items()]
+    rows.append(('total', previous['total'], current['total']))
+    for name, before, after in rows:
+        if not before:
+            continue
+        cells = []
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            old, new = before[key], after[key]
+            if old is None or new is None:
+                cells.append(f"{'-':>20}")
+            else:
+                change = f'{(new - old) / old * 100:+.0f}%' if old else ''
+                cells.append(f'{old:>7.1f} -> {new:>7.1f} {change:>5}')
+        print(f"{name:<24} | " + ' | '.join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent clients (threads)')
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='Seconds run before measuring')
+    parser.add_argument('--url', help='Benchmark a running server instead of the in-process app')
+    parser.add_argument('--writes', action='store_true', help='Include the scenarios that write')
+    parser.add_argument('--only', nargs='+', metavar='SCENARIO', help='Run only these scenarios (by name)')
+    parser.add_argument('--users-per-role', type=int, default=50)
+    parser.add_argument('--password', default='Benchmark@123', help='Password generate_data.py gave every user')
+    parser.add_argument('--accept-encoding', default='gzip', help="Sent with every request ('' for none)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Result file (default load-<dialect>-<timestamp>.json)')
+    parser.add_argument('--compare', metavar='RESULT', help='Earlier result file to compare with')
+    parser.add_argument('--verbose', action='store_true', help="Show the app's warnings (query budgets, ...)")
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS if (args.writes or not s.write) and (not args.only or s.name in args.only)]
+    if not scenarios:
+        parser.error(f"no scenarios selected; available: {', '.join(s.name for s in SCENARIOS)}")
+
+    app = create_app()
+    if not args.verbose:
+        # Query-budget warnings for large lists would bury the results table
+        app.logger.setLevel(logging.ERROR)
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        callers = load_callers(args.users_per_role, args.seed)
+        rows = row_counts()
+        database = db.engine.url.render_as_string(hide_password=True)
+        db.session.remove()
+
+    print(f"Database: {database}")
+    print('Rows: ' + ', '.join(f'{table} {count:,}' for table, count in rows.items()))
+    print(f"Target: {args.url or 'in-process test client'}, {args.clients} clients, "
+          f"{args.warmup:g}s warm-up + {args.duration:g}s\n")
+
+    if args.url:
+        # Fail fast instead of timing a few thousand refused connections
+        try:
+            HTTPClient(args.url).request('GET', '/api/hospital/', {}, None)
+        except (OSError, http.client.HTTPException) as e:
+            raise SystemExit(f'Cannot reach {args.url}: {e}')
+
+    run = Run(callers, scenarios, args.password, args.accept_encoding)
+    started_at = datetime.now()
+    measure_from = time.perf_counter() + args.warmup
+    stop_at = measure_from + args.duration
+    threads = [
+        threading.Thread(
+            target=run.worker,
+            args=(HTTPClient(args.url) if args.url else InProcessClient(app), args.seed + i, measure_from, stop_at)
+        )
+        for i in range(args.clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results = {
+        name: summarize(run.latencies[name], run.statuses[name], run.errors[name], args.duration)
+        for name in run.latencies
+    }
+    total = summarize(
+        [latency for values in run.latencies.values() for latency in values],
+        sum(run.statuses.values(), Counter()),
+        sum(run.errors.values()),
+        args.duration
+    )
+    print_results(results, total)
+
+    report = {
+        'started_at': started_at.isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'database': {'url': database, 'dialect': dialect, 'rows': rows},
+        'config': {
+            'target': args.url or 'in-process',
+            'clients': args.clients,
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'writes': args.writes,
+            'accept_encoding': args.accept_encoding,
+            'users_per_role': args.users_per_role,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+        },
+        'scenarios': results,
+        'total': total,
+    }
+    output = args.output or f"load-{dialect}-{started_at.strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'\nResults written to {output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""
+Read model benchmark
+
+Compares the two ways the list endpoints can serialize rows of User,
+Resource, Booking, Notification and Discharge:
+
+- orm:   query.options(*Schema.loader_options()).all() + to_dict(), i.e. full
+         ORM hydration (identity map, instance state, change tracking)
+- rows:  Schema.dump_query(query), the read model: one Core SELECT of the
+         needed columns executed on the Connection, named tuples in, dicts out
+
+Reports CPU time (process time, so waiting on the database is not counted),
+the tracemalloc peak while building the list, and both figures per 10k rows.
+
+Usage (from the backend directory):
+    python benchmarks/read_model_benchmark.py --rows 10000
+    DATABASE_URL=postgresql://... python benchmarks/read_model_benchmark.py --rows 10000 50000 --yes-drop
+
+Without DATABASE_URL a throwaway SQLite file is used. The benchmark drops and
+recreates all tables, so any other database is refused unless --yes-drop is
+given; never point it at a real one.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if not os.getenv('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'orego_read_model.db')}"
+
+from app import create_app, db
+from app.models.booking import Booking, BookingResource
+from app.models.discharge import Discharge
+from app.models.notification import Notification
+from app.models.resource import Resource
+from app.models.user import User
+from app.schemas.booking import BookingSchema
+from app.schemas.discharge import DischargeSchema
+from app.schemas.notification import NotificationSchema
+from app.schemas.resource import ResourceSchema
+from app.schemas.user import UserSchema
+from benchmarks.scratch_database import add_drop_argument, confirm_drop
+
+
+def load_data(count, chunk_size=5000):
+    """count rows of every benchmarked model, plus 20 doctors; each booking allocates a bed and its doctor"""
+    now = datetime.utcnow()
+
+    def user(i, role):
+        return {
+            'id': str(uuid.uuid4()),
+            'username': f'bench-{role}{i}',
+            'password_hash': 'x',
+            'role': role,
+            'name': f'Benchmark {role.title()} {i}',
+            'birthday': date(1990, 1, 1),
+            'id_card_number': f'{role[0]}{i:08d}V',
+            'address': 'Benchmark Address',
+            'phone_number': '0771234567',
+            'email': f'bench-{role}{i}@example.com',
+            'is_active': True,
+            'created_at': now,
+            'updated_at': now
+        }
+
+    doctors = [user(i, 'doctor') for i in range(20)]
+    db.session.execute(User.__table__.insert(), doctors)
+
+    start_date = datetime(2030, 1, 1, 8)
+    for start in range(0, count, chunk_size):
+        patients, resources, bookings, allocations, notifications, discharges = [], [], [], [], [], []
+        for i in range(start, min(start + chunk_size, count)):
+            patient = user(i, 'patient')
+            patients.append(patient)
+            doctor = doctors[i % len(doctors)]
+            bed = {
+                'id': str(uuid.uuid4()),
+                'type': 'bed',
+                'name': f'Bed {i}',
+                'status': 'available',
+                'ward_id': f'W{i % 40}',
+                'bed_number': str(i),
+                'location': 'Benchmark Wing',
+                'registered_date': date(2024, 1, 1),
+                'created_at': now,
+                'updated_at': now
+            }
+            resources.append(bed)
+            scheduled = start_date + timedelta(hours=i)
+            booking_id = str(uuid.uuid4())
+            bookings.append({
+                'id': booking_id,
+                'patient_id': patient['id'],
+                'doctor_id': doctor['id'],
+                'booking_type': 'surgery',
+                'scheduled_date': scheduled,
+                'scheduled_end_date': scheduled + timedelta(hours=2),
+                'duration_hours': 2,
+                'status': 'scheduled',
+                'notes': 'Benchmark booking',
+                'created_at': now,
+                'updated_at': now
+            })
+            allocations.append({
+                'id': str(uuid.uuid4()),
+                'booking_id': booking_id,
+                'resource_id': bed['id'],
+                'resource_type': 'bed',
+                'staff_id': None,
+                'allocated_at': now
+            })
+            allocations.append({
+                'id': str(uuid.uuid4()),
+                'booking_id': booking_id,
+                'resource_id': None,
+                'resource_type': 'doctor',
+                'staff_id': doctor['id'],
+                'allocated_at': now
+            })
+            notifications.append({
+                'id': str(uuid.uuid4()),
+                'recipient_id': patient['id'],
+                'title': 'Booking Scheduled',
+                'message': f'Your surgery is scheduled for {scheduled:%Y-%m-%d %H:%M}',
+                'type': 'booking',
+                'is_read': False,
+                'related_id': booking_id,
+                'created_at': now
+            })
+            discharges.append({
+                'id': str(uuid.uuid4()),
+                'patient_id': patient['id'],
+                'doctor_id': doctor['id'],
+                'admission_date': date(2024, 1, 1),
+                'discharge_date': date(2024, 1, 1 + i % 28),
+                'diagnosed_disease': 'Benchmark diagnosis',
+                'treatment_summary': 'Benchmark treatment',
+                'prescribed_medicines': 'Paracetamol',
+                'follow_up_instructions': 'Rest',
+                'bed_id': bed['id'],
+                'doctor_approval': True,
+                'created_at': now,
+                'updated_at': now
+            })
+        db.session.execute(User.__table__.insert(), patients)
+        db.session.execute(Resource.__table__.insert(), resources)
+        db.session.execute(Booking.__table__.insert(), bookings)
+        db.session.execute(BookingResource.__table__.insert(), allocations)
+        db.session.execute(Notification.__table__.insert(), notifications)
+        db.session.execute(Discharge.__table__.insert(), discharges)
+    db.session.commit()
+
+
+def implementations():
+    """(model, schema, query) for each list endpoint, with the schema the route uses by default"""
+    discharge_schema = DischargeSchema.subset(include=['bed_info'])
+    return [
+        ('User', UserSchema, lambda: User.query.filter_by(role='patient', is_active=True)),
+        ('Resource', ResourceSchema, lambda: Resource.query.filter_by(type='bed')),
+        ('Booking', BookingSchema, lambda: Booking.query.order_by(Booking.scheduled_date.desc())),
+        ('Notification', NotificationSchema, lambda: Notification.query.order_by(Notification.created_at.desc())),
+        ('Discharge', discharge_schema, lambda: Discharge.query.order_by(Discharge.discharge_date.desc())),
+    ]
+
+
+def orm_path(schema, query):
+    return [schema.dump(obj) for obj in query().options(*schema.loader_options()).all()]
+
+
+def rows_path(schema, query):
+    return schema.dump_query(query())
+
+
+def cpu_time(fn):
+    db.session.expunge_all()
+    started = time.process_time()
+    records = fn()
+    return time.process_time() - started, len(records)
+
+
+def peak_memory(fn):
+    # A separate run: tracemalloc slows allocation-heavy code down too much to time it
+    db.session.expunge_all()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000])
+    parser.add_argument('--repeat', type=int, default=3, help='Best of this many runs')
+    add_drop_argument(parser)
+    args = parser.parse_args()
+    confirm_drop(parser, args)
+
+    app = create_app()
+    with app.app_context():
+        print(f"Database: {db.engine.url.render_as_string(hide_password=True)}\n")
+        print(f"{'model':<12} | {'rows':>7} | {'path':<4} | {'cpu s':>7} | {'cpu s/10k':>9} | "
+              f"{'peak MiB':>8} | {'MiB/10k':>7} | {'speedup':>7}")
+        print('-' * 82)
+
+        for count in args.rows:
+            db.drop_all()
+            db.create_all()
+            load_data(count)
+
+            for model, schema, query in implementations():
+                baseline = None
+                for name, path in (('orm', orm_path), ('rows', rows_path)):
+                    run = lambda: path(schema, query)
+                    elapsed, rows = min((cpu_time(run) for _ in range(args.repeat)), key=lambda result: result[0])
+                    peak = peak_memory(run) / 1024 / 1024
+                    baseline = baseline or elapsed
+                    per_10k = 10000 / rows if rows else 0
+                    print(f"{model:<12} | {rows:>7} | {name:<4} | {elapsed:>7.3f} | {elapsed * per_10k:>9.3f} | "
+                          f"{peak:>8.1f} | {peak * per_10k:>7.1f} | {baseline / elapsed:>6.1f}x")
+
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+"""
+Guard for the benchmarks that drop and recreate every table: SQLite (the
+throwaway default file) is always allowed, any other DATABASE_URL only with
+--yes-drop.
+"""
+import os
+
+from sqlalchemy.engine import make_url
+
+
+def add_drop_argument(parser):
+    parser.add_argument('--yes-drop', action='store_true', help='Allow dropping every table of a non-SQLite database')
+
+
+def confirm_drop(parser, args, alternative=None):
+    """Exit with a usage error unless DATABASE_URL is SQLite or --yes-drop was given"""
+    url = make_url(os.environ['DATABASE_URL'])
+    if url.get_backend_name() == 'sqlite' or args.yes_drop:
+        return
+
+    message = f'this drops every table in {url.render_as_string(hide_password=True)}; pass --yes-drop to confirm'
+    if alternative:
+        message += f', or {alternative}'
+    parser.error(message)
@@ -0,0 +1,247 @@
+"""
+Serialization benchmark
+
+Serializes large lists of Booking and User to a JSON response body three ways:
+
+- legacy:   query.all(), the original hand-written to_dict() (lazy loading
+            patient/doctor/allocated resources), stdlib json via Flask's provider
+- orm:      query.all() with Schema.loader_options(), Schema.dump(), stdlib json
+- rows:     Schema.dump_query() tuple projection, orjson provider
+
+Reports wall time, rows per second, speedup over the first path measured
+(legacy, unless skipped for large lists) and the number of SQL statements
+issued for each list size.
+
+Usage (from the backend directory):
+    python benchmarks/serialization_benchmark.py --sizes 1000 10000 50000 --skip-legacy-above 10000
+    DATABASE_URL=postgresql://... python benchmarks/serialization_benchmark.py --yes-drop
+
+Without DATABASE_URL a throwaway SQLite file is used. The benchmark drops and
+recreates all tables, so any other database is refused unless --yes-drop is
+given; never point it at a real one.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if not os.getenv('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'orego_serialization.db')}"
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+from app import create_app, db
+from app.models.booking import Booking, BookingResource
+from app.models.user import User
+from app.schemas.booking import BookingSchema
+from app.schemas.user import UserSchema
+from app.utils.json_provider import JSONProvider, create_json_provider
+from benchmarks.scratch_database import add_drop_argument, confirm_drop
+
+
+def load_data(count, chunk_size=5000):
+    """count patients plus 20 doctors and 20 nurses; count bookings with two allocations each"""
+    def user(i, role):
+        return {
+            'id': str(uuid.uuid4()),
+            'username': f'bench-{role}{i}',
+            'password_hash': 'x',
+            'role': role,
+            'name': f'Benchmark {role.title()} {i}',
+            'birthday': date(1990, 1, 1),
+            'id_card_number': f'{role[0]}{i:08d}V',
+            'address': 'Benchmark Address',
+            'phone_number': '0771234567',
+            'email': f'bench-{role}{i}@example.com',
+            'is_active': True,
+            'created_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow()
+        }
+
+    doctors = [user(i, 'doctor') for i in range(20)]
+    nurses = [user(i, 'nurse') for i in range(20)]
+    db.session.execute(User.__table__.insert(), doctors + nurses)
+
+    start_date = datetime(2030, 1, 1, 8)
+    for start in range(0, count, chunk_size):
+        patients, bookings, allocations = [], [], []
+        for i in range(start, min(start + chunk_size, count)):
+            patient = user(i, 'patient')
+            patients.append(patient)
+            scheduled = start_date + timedelta(hours=i)
+            booking_id = str(uuid.uuid4())
+            bookings.append({
+                'id': booking_id,
+                'patient_id': patient['id'],
+                'doctor_id': doctors[i % len(doctors)]['id'],
+                'booking_type': 'surgery',
+                'scheduled_date': scheduled,
+                'scheduled_end_date': scheduled + timedelta(hours=2),
+                'duration_hours': 2,
+                'status': 'scheduled',
+                'notes': 'Benchmark booking',
+                'created_at': datetime.utcnow(),
+                'updated_at': datetime.utcnow()
+            })
+            for nurse in (nurses[i % len(nurses)], nurses[(i + 1) % len(nurses)]):
+                allocations.append({
+                    'id': str(uuid.uuid4()),
+                    'booking_id': booking_id,
+                    'resource_type': 'nurse',
+                    'staff_id': nurse['id'],
+                    'allocated_at': datetime.utcnow()
+                })
+        db.session.execute(User.__table__.insert(), patients)
+        db.session.execute(Booking.__table__.insert(), bookings)
+        db.session.execute(BookingResource.__table__.insert(), allocations)
+    db.session.commit()
+
+
+def legacy_booking_resource_dict(br):
+    """The original hand-written to_dict() methods, kept here for comparison"""
+    return {
+        'id': br.id,
+        'booking_id': br.booking_id,
+        'resource_id': br.resource_id,
+        'resource_type': br.resource_type,
+        'resource_name': br.resource.name if br.resource else None,
+        'staff_id': br.staff_id,
+        'staff_name': br.staff.name if br.staff else None,
+        'allocated_at': br.allocated_at.isoformat() if br.allocated_at else None,
+        'released_at': br.released_at.isoformat() if br.released_at else None
+    }
+
+
+def legacy_booking_dict(booking):
+    return {
+        'id': booking.id,
+        'patient_id': booking.patient_id,
+        'patient_name': booking.patient.name if booking.patient else None,
+        'doctor_id': booking.doctor_id,
+        'doctor_name': booking.doctor.name if booking.doctor else None,
+        'booking_type': booking.booking_type,
+        'scheduled_date': booking.scheduled_date.isoformat() if booking.scheduled_date else None,
+        'scheduled_end_date': booking.scheduled_end_date.isoformat() if booking.scheduled_end_date else None,
+        'duration_hours': booking.duration_hours,
+        'status': booking.status,
+        'notes': booking.notes,
+        'allocated_resources': [legacy_booking_resource_dict(br) for br in booking.allocated_resources],
+        'created_at': booking.created_at.isoformat() if booking.created_at else None
+    }
+
+
+def legacy_user_dict(user):
+    return {
+        'id': user.id,
+        'username': user.username,
+        'role': user.role,
+        'name': user.name,
+        'birthday': user.birthday.isoformat() if user.birthday else None,
+        'id_card_number': user.id_card_number,
+        'address': user.address,
+        'phone_number': user.phone_number,
+        'email': user.email,
+        'speciality': user.speciality,
+        'medical_status': user.medical_status,
+        'operation_type': user.operation_type,
+        'is_active': user.is_active,
+        'hospital_id': user.hospital_id,
+        'created_at': user.created_at.isoformat() if user.created_at else None,
+        'last_login': user.last_login.isoformat() if user.last_login else None
+    }
+
+
+def implementations(app):
+    stdlib = DefaultJSONProvider(app)
+    schema_stdlib = JSONProvider(app)
+    fast = create_json_provider(app)
+
+    def bookings_query():
+        return Booking.query.order_by(Booking.scheduled_date.desc())
+
+    def users_query():
+        return User.query.filter_by(is_active=True)
+
+    return {
+        'Booking': [
+            ('legacy', lambda: stdlib.dumps([legacy_booking_dict(b) for b in bookings_query().all()])),
+            ('orm', lambda: schema_stdlib.dumps([
+                BookingSchema.dump(b) for b in bookings_query().options(*BookingSchema.loader_options()).all()
+            ])),
+            ('rows', lambda: fast.dumps(BookingSchema.dump_query(bookings_query()))),
+        ],
+        'User': [
+            ('legacy', lambda: stdlib.dumps([legacy_user_dict(u) for u in users_query().all()])),
+            ('orm', lambda: schema_stdlib.dumps([UserSchema.dump(u) for u in users_query().all()])),
+            ('rows', lambda: fast.dumps(UserSchema.dump_query(users_query()))),
+        ],
+    }
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def measure(fn, counter):
+    db.session.expunge_all()
+    counter.count = 0
+    started = time.perf_counter()
+    body = fn()
+    elapsed = time.perf_counter() - started
+    return elapsed, counter.count, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=3, help='Best of this many runs')
+    parser.add_argument('--skip-legacy-above', type=int, default=10000,
+                        help='Skip the lazy-loading legacy path for larger lists')
+    add_drop_argument(parser)
+    args = parser.parse_args()
+    confirm_drop(parser, args)
+
+    app = create_app()
+    with app.app_context():
+        print(f"Database: {db.engine.url.render_as_string(hide_password=True)}")
+        print(f"JSON provider: {type(app.json).__name__}\n")
+        print(f"{'model':<8} | {'rows':>7} | {'path':<6} | {'seconds':>8} | {'rows/s':>9} | "
+              f"{'speedup':>7} | {'queries':>7} | {'MiB':>6}")
+        print('-' * 78)
+
+        counter = StatementCounter(db.engine)
+        for size in args.sizes:
+            db.drop_all()
+            db.create_all()
+            load_data(size)
+
+            for model, paths in implementations(app).items():
+                rows = Booking.query.count() if model == 'Booking' else User.query.filter_by(is_active=True).count()
+                baseline = None
+                for name, fn in paths:
+                    if name == 'legacy' and size > args.skip_legacy_above:
+                        continue
+                    elapsed, queries, length = min(
+                        (measure(fn, counter) for _ in range(args.repeat)), key=lambda result: result[0]
+                    )
+                    baseline = baseline or elapsed
+                    print(f"{model:<8} | {rows:>7} | {name:<6} | {elapsed:>8.3f} | {rows / elapsed:>9.0f} | "
+                          f"{baseline / elapsed:>6.1f}x | {queries:>7} | {length / 1024 / 1024:>6.1f}")
+
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
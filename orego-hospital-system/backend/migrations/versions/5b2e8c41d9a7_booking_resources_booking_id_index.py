@@ -0,0 +1,27 @@
+"""Index booking_resources.booking_id
+
+Revision ID: 5b2e8c41d9a7
+Revises: c3f1a9d27b84
+Create Date: 2026-10-19 14:02:11.408215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2e8c41d9a7'
+down_revision = 'c3f1a9d27b84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Allocation versions in booking ETags and the allocation loaders look rows up by booking
+    with op.batch_alter_table('booking_resources', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_booking_resources_booking_id'), ['booking_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('booking_resources', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_booking_resources_booking_id'))
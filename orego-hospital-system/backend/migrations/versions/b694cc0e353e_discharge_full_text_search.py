@@ -0,0 +1,71 @@
+"""Discharge full-text search
+
+Revision ID: b694cc0e353e
+Revises: 6f76244ab074
+Create Date: 2026-10-19 03:14:47.036560
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b694cc0e353e'
+down_revision = '6f76244ab074'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(diagnosed_disease, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(prescribed_medicines, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(treatment_summary, '')), 'C')"
+)
+
+FTS_COLUMNS = 'discharge_id, diagnosed_disease, treatment_summary, prescribed_medicines'
+NEW_VALUES = 'new.id, new.diagnosed_disease, new.treatment_summary, new.prescribed_medicines'
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute(f"CREATE INDEX ix_discharges_search ON discharges USING gin (({SEARCH_VECTOR}))")
+
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE discharges_fts USING fts5("
+            "discharge_id UNINDEXED, diagnosed_disease, treatment_summary, prescribed_medicines, "
+            "tokenize='porter unicode61')"
+        )
+        op.execute(
+            f"CREATE TRIGGER discharges_fts_insert AFTER INSERT ON discharges BEGIN "
+            f"INSERT INTO discharges_fts ({FTS_COLUMNS}) VALUES ({NEW_VALUES}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER discharges_fts_update AFTER UPDATE OF "
+            f"diagnosed_disease, treatment_summary, prescribed_medicines ON discharges BEGIN "
+            f"DELETE FROM discharges_fts WHERE discharge_id = old.id; "
+            f"INSERT INTO discharges_fts ({FTS_COLUMNS}) VALUES ({NEW_VALUES}); END"
+        )
+        op.execute(
+            "CREATE TRIGGER discharges_fts_delete AFTER DELETE ON discharges BEGIN "
+            "DELETE FROM discharges_fts WHERE discharge_id = old.id; END"
+        )
+        op.execute(
+            f"INSERT INTO discharges_fts ({FTS_COLUMNS}) "
+            f"SELECT id, diagnosed_disease, treatment_summary, prescribed_medicines FROM discharges"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_discharges_search")
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS discharges_fts_insert")
+        op.execute("DROP TRIGGER IF EXISTS discharges_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS discharges_fts_delete")
+        op.execute("DROP TABLE IF EXISTS discharges_fts")
@@ -0,0 +1,40 @@
+"""Backfill notification counters
+
+Revision ID: c3f1a9d27b84
+Revises: e24ba685d92c
+Create Date: 2026-10-19 05:12:40.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f1a9d27b84'
+down_revision = 'e24ba685d92c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # New users get their counter row when they are created; existing users
+    # without one get it here, with the same total compute_unread_count() returns
+    op.execute(
+        "INSERT INTO notification_counters (user_id, unread_count, updated_at) "
+        "SELECT u.id, "
+        "(SELECT count(*) FROM notifications n WHERE n.recipient_id = u.id AND n.is_read = false) + "
+        "(SELECT count(*) FROM broadcast_notifications b "
+        " LEFT OUTER JOIN broadcast_receipts r ON r.broadcast_id = b.id AND r.user_id = u.id "
+        " WHERE (b.audience_role IS NULL OR b.audience_role = u.role) "
+        " AND (b.hospital_id IS NULL OR b.hospital_id = u.hospital_id) "
+        " AND (u.created_at IS NULL OR b.created_at >= u.created_at) "
+        " AND r.read_at IS NULL AND r.dismissed_at IS NULL), "
+        "CURRENT_TIMESTAMP "
+        "FROM users u "
+        "WHERE NOT EXISTS (SELECT 1 FROM notification_counters c WHERE c.user_id = u.id)"
+    )
+
+
+def downgrade():
+    # Counter rows are derived data and harmless to keep
+    pass
@@ -0,0 +1,124 @@
+"""Hospital tenancy
+
+Revision ID: e24ba685d92c
+Revises: 503831ec7466
+Create Date: 2026-10-19 03:25:47.832077
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e24ba685d92c'
+down_revision = '503831ec7466'
+branch_labels = None
+depends_on = None
+
+
+TENANT_TABLES = ['users', 'resources', 'bookings', 'discharges', 'notifications', 'broadcast_notifications']
+
+NOTIFICATION_PARTITIONS = 16
+
+NOTIFICATION_INDEXES = [
+    ('ix_notifications_id', ['id']),
+    ('ix_notifications_recipient_id_created_at', ['recipient_id', 'created_at']),
+    ('ix_notifications_type_created_at', ['type', 'created_at']),
+    ('ix_notifications_hospital_id', ['hospital_id']),
+]
+
+
+def _fk(table):
+    return f'fk_{table}_hospital_id_hospitals'
+
+
+def _backfill():
+    # Existing rows belong to the single hospital the deployment served so far
+    op.execute(
+        "UPDATE users SET hospital_id = (SELECT id FROM hospitals ORDER BY created_at LIMIT 1) "
+        "WHERE hospital_id IS NULL"
+    )
+    op.execute(
+        "UPDATE resources SET hospital_id = (SELECT id FROM hospitals ORDER BY created_at LIMIT 1) "
+        "WHERE hospital_id IS NULL"
+    )
+    for table, owner in [('bookings', 'patient_id'), ('discharges', 'patient_id'), ('notifications', 'recipient_id')]:
+        op.execute(
+            f"UPDATE {table} SET hospital_id = (SELECT users.hospital_id FROM users WHERE users.id = {table}.{owner}) "
+            f"WHERE hospital_id IS NULL"
+        )
+
+
+def _partition_notifications():
+    """Rebuild notifications as a table hash-partitioned by hospital_id (Postgres)"""
+    op.execute("ALTER TABLE notifications RENAME TO notifications_unpartitioned")
+    for name, _ in NOTIFICATION_INDEXES[1:]:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_old")
+
+    # A primary key on a partitioned table must contain the partition key, and
+    # hospital_id is nullable, so id is backed by a plain index instead
+    op.execute(
+        "CREATE TABLE notifications (LIKE notifications_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY HASH (hospital_id)"
+    )
+    for remainder in range(NOTIFICATION_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE notifications_p{remainder} PARTITION OF notifications "
+            f"FOR VALUES WITH (MODULUS {NOTIFICATION_PARTITIONS}, REMAINDER {remainder})"
+        )
+    op.execute("INSERT INTO notifications SELECT * FROM notifications_unpartitioned")
+    op.drop_table('notifications_unpartitioned')
+
+    op.create_foreign_key('fk_notifications_recipient_id_users', 'notifications', 'users', ['recipient_id'], ['id'])
+    op.create_foreign_key(_fk('notifications'), 'notifications', 'hospitals', ['hospital_id'], ['id'])
+    for name, columns in NOTIFICATION_INDEXES:
+        op.create_index(name, 'notifications', columns, unique=False)
+
+
+def _unpartition_notifications():
+    op.execute("ALTER TABLE notifications RENAME TO notifications_partitioned")
+    op.execute("CREATE TABLE notifications (LIKE notifications_partitioned INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO notifications SELECT * FROM notifications_partitioned")
+    op.drop_table('notifications_partitioned')
+
+    op.create_primary_key('notifications_pkey', 'notifications', ['id'])
+    op.create_foreign_key('notifications_recipient_id_fkey', 'notifications', 'users', ['recipient_id'], ['id'])
+    op.create_foreign_key(_fk('notifications'), 'notifications', 'hospitals', ['hospital_id'], ['id'])
+    for name, columns in NOTIFICATION_INDEXES[1:]:
+        op.create_index(name, 'notifications', columns, unique=False)
+
+
+def upgrade():
+    for table in TENANT_TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('hospital_id', sa.String(length=36), nullable=True))
+            batch_op.create_index(batch_op.f(f'ix_{table}_hospital_id'), ['hospital_id'], unique=False)
+            batch_op.create_foreign_key(_fk(table), 'hospitals', ['hospital_id'], ['id'])
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('ix_bookings_hospital_id_scheduled_date', ['hospital_id', 'scheduled_date'], unique=False)
+
+    with op.batch_alter_table('notifications_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('hospital_id', sa.String(length=36), nullable=True))
+
+    _backfill()
+
+    if op.get_bind().dialect.name == 'postgresql':
+        _partition_notifications()
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        _unpartition_notifications()
+
+    with op.batch_alter_table('notifications_archive', schema=None) as batch_op:
+        batch_op.drop_column('hospital_id')
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index('ix_bookings_hospital_id_scheduled_date')
+
+    for table in reversed(TENANT_TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_constraint(_fk(table), type_='foreignkey')
+            batch_op.drop_index(batch_op.f(f'ix_{table}_hospital_id'))
+            batch_op.drop_column('hospital_id')
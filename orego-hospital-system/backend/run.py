@@ -1,3 +1,4 @@
+import os
 from dotenv import load_dotenv
 from app import create_app, db
 from app.models.user import User
@@ -25,4 +26,10 @@ def make_shell_context():
     }
 
 if __name__ == '__main__':
+    # With the reloader only the child process (WERKZEUG_RUN_MAIN) serves requests
+    if app.config['OUTBOX_INPROCESS_WORKER'] and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        from app.services import outbox, booking_reminders
+        outbox.start_worker_thread(app)
+        booking_reminders.start_scheduler_thread(app)
+    
     app.run(debug=True, port=5000, host='0.0.0.0')
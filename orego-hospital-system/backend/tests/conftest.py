@@ -0,0 +1,101 @@
+import itertools
+from datetime import date
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.config import Config
+from app.middleware.tenancy import token_claims
+from app.models.hospital import Hospital
+from app.models.user import User
+from app.services import hospital_profile, slow_query_log
+from app.utils.security import hash_password
+
+PASSWORD = 'Password@123'
+PASSWORD_HASH = hash_password(PASSWORD)
+
+_sequence = itertools.count(1)
+
+
+class TestConfig(Config):
+    TESTING = True
+    # One in-memory database per app, shared by every connection of that app
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SLOW_QUERY_LOG_ENABLED = False
+    JWT_SECRET_KEY = 'test-jwt-secret-key-long-enough-for-hs256'
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+    # Process-wide caches must not carry one test's database into the next
+    hospital_profile.invalidate()
+    slow_query_log.log.clear()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_hospital(app):
+    """Creates a hospital and returns its id"""
+    def make(name=None):
+        n = next(_sequence)
+        with app.app_context():
+            hospital = Hospital(
+                name=name or f'Hospital {n}',
+                address='1 Hospital Road, Colombo',
+                phone_number='0112345678',
+                email=f'info{n}@hospital.lk',
+                registration_number=f'REG-{n:05d}'
+            )
+            db.session.add(hospital)
+            db.session.commit()
+            return hospital.id
+    return make
+
+
+@pytest.fixture
+def make_user(app):
+    """Creates an active user and returns its id"""
+    def make(role, hospital_id=None, **fields):
+        n = next(_sequence)
+        with app.app_context():
+            user = User(
+                username=f'{role}{n}',
+                password_hash=PASSWORD_HASH,
+                role=role,
+                name=fields.pop('name', f'{role.title()} {n}'),
+                birthday=date(1990, 1, 1),
+                id_card_number=f'{n:09d}V',
+                address='1 Galle Road, Colombo',
+                phone_number='0771234567',
+                email=f'{role}{n}@example.lk',
+                speciality='Cardiology' if role in ('doctor', 'staff') else None,
+                hospital_id=hospital_id,
+                **fields
+            )
+            db.session.add(user)
+            db.session.commit()
+            return user.id
+    return make
+
+
+@pytest.fixture
+def auth_headers(app):
+    """Authorization header for a user id, with the claims login would issue"""
+    def headers(user_id):
+        with app.app_context():
+            user = db.session.get(User, user_id)
+            token = create_access_token(identity=user.id, additional_claims=token_claims(user))
+        return {'Authorization': f'Bearer {token}'}
+    return headers
@@ -0,0 +1,39 @@
+from flask_jwt_extended import create_refresh_token, decode_token
+
+from app import db
+from app.middleware.tenancy import token_claims
+from app.models.user import User
+
+
+def refresh_headers(app, user_id):
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        token = create_refresh_token(identity=user.id, additional_claims=token_claims(user))
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_refresh_reloads_the_users_hospital(app, client, make_hospital, make_user):
+    first, second = make_hospital(), make_hospital()
+    user_id = make_user('nurse', first)
+    headers = refresh_headers(app, user_id)
+
+    with app.app_context():
+        db.session.get(User, user_id).hospital_id = second
+        db.session.commit()
+
+    response = client.post('/api/auth/refresh', headers=headers)
+
+    assert response.status_code == 200
+    with app.app_context():
+        assert decode_token(response.get_json()['access_token'])['hospital_id'] == second
+
+
+def test_refresh_refuses_a_deactivated_user(app, client, make_user):
+    user_id = make_user('nurse')
+    headers = refresh_headers(app, user_id)
+
+    with app.app_context():
+        db.session.get(User, user_id).is_active = False
+        db.session.commit()
+
+    assert client.post('/api/auth/refresh', headers=headers).status_code == 403
@@ -0,0 +1,45 @@
+import gzip
+
+import pytest
+from flask import jsonify
+
+
+@pytest.fixture
+def strong_etag_route(app):
+    @app.route('/test/strong-etag')
+    def strong_etag():
+        response = jsonify({'padding': 'x' * 4096})
+        response.set_etag('v1')
+        return response
+    return '/test/strong-etag'
+
+
+def test_compressing_weakens_a_strong_etag(client, strong_etag_route):
+    identity = client.get(strong_etag_route, headers={'Accept-Encoding': 'identity'})
+    compressed = client.get(strong_etag_route, headers={'Accept-Encoding': 'gzip'})
+
+    assert identity.headers['ETag'] == '"v1"'
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.headers['ETag'] == 'W/"v1"'
+    assert gzip.decompress(compressed.get_data()) == identity.get_data()
+
+
+@pytest.mark.parametrize('encoding', ['gzip', 'identity'])
+def test_compressed_responses_revalidate(client, make_user, auth_headers, encoding):
+    admin = make_user('admin')
+    for _ in range(10):
+        make_user('patient')
+    headers = {**auth_headers(admin), 'Accept-Encoding': encoding}
+
+    response = client.get('/api/users/', headers=headers)
+    assert response.headers.get('Content-Encoding') == (encoding if encoding == 'gzip' else None)
+    assert response.headers['ETag'].startswith('W/')
+
+    response = client.get('/api/users/', headers={**headers, 'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+    reference = client.get('/api/reference', headers={'Accept-Encoding': encoding})
+    assert reference.headers['ETag'].startswith('W/')
+    assert client.get('/api/reference', headers={
+        'Accept-Encoding': encoding, 'If-None-Match': reference.headers['ETag']
+    }).status_code == 304
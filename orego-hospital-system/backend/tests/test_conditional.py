@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+
+from app import db
+from app.models.booking import Booking, BookingResource
+from app.models.resource import Resource
+from app.models.user import User
+
+from conftest import PASSWORD
+
+
+def make_booking(app, patient_id, doctor_id):
+    with app.app_context():
+        start = datetime(2026, 3, 1, 9)
+        booking = Booking(
+            patient_id=patient_id,
+            doctor_id=doctor_id,
+            booking_type='appointment',
+            scheduled_date=start,
+            scheduled_end_date=start + timedelta(hours=1),
+            duration_hours=1
+        )
+        db.session.add(booking)
+        db.session.commit()
+        return booking.id
+
+
+def test_collections_revalidate_by_etag_only(app, client, make_user, auth_headers):
+    admin = make_user('admin')
+    make_booking(app, make_user('patient'), make_user('doctor'))
+
+    response = client.get('/api/bookings/', headers=auth_headers(admin))
+
+    assert response.status_code == 200
+    assert response.headers.get('ETag')
+    assert 'Last-Modified' not in response.headers
+
+    response = client.get('/api/bookings/', headers={
+        **auth_headers(admin),
+        'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'
+    })
+    assert response.status_code == 200
+
+
+def test_etag_changes_when_a_row_is_deleted(app, client, make_user, auth_headers):
+    admin = make_user('admin')
+    patient, doctor = make_user('patient'), make_user('doctor')
+    oldest = make_booking(app, patient, doctor)
+    make_booking(app, patient, doctor)
+    headers = auth_headers(admin)
+    etag = client.get('/api/bookings/', headers=headers).headers['ETag']
+
+    # The newest row is untouched, so max(updated_at) stays where it was
+    with app.app_context():
+        db.session.delete(db.session.get(Booking, oldest))
+        db.session.commit()
+
+    response = client.get('/api/bookings/', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['count'] == 1
+
+
+def test_booking_etag_follows_embedded_names(app, client, make_user, auth_headers):
+    admin = make_user('admin')
+    patient = make_user('patient', name='Old Name')
+    booking_id = make_booking(app, patient, make_user('doctor'))
+    headers = auth_headers(admin)
+    list_etag = client.get('/api/bookings/', headers=headers).headers['ETag']
+    detail_etag = client.get(f'/api/bookings/{booking_id}', headers=headers).headers['ETag']
+
+    assert client.get('/api/bookings/', headers={**headers, 'If-None-Match': list_etag}).status_code == 304
+
+    with app.app_context():
+        db.session.get(User, patient).name = 'New Name'
+        db.session.commit()
+
+    response = client.get('/api/bookings/', headers={**headers, 'If-None-Match': list_etag})
+    assert response.status_code == 200
+    assert response.get_json()['bookings'][0]['patient_name'] == 'New Name'
+
+    response = client.get(f'/api/bookings/{booking_id}', headers={**headers, 'If-None-Match': detail_etag})
+    assert response.status_code == 200
+
+
+def test_booking_etag_ignores_rows_it_does_not_embed(app, client, make_user, auth_headers):
+    patient = make_user('patient')
+    make_booking(app, patient, make_user('doctor'))
+    bystander = make_user('nurse')
+    headers = auth_headers(patient)
+    etag = client.get('/api/bookings/', headers=headers).headers['ETag']
+
+    with app.app_context():
+        db.session.get(User, bystander).name = 'Renamed Nurse'
+        username = db.session.get(User, patient).username
+        db.session.commit()
+    # Logging in records last_login without marking the user as edited
+    assert client.post('/api/auth/login', json={'username': username, 'password': PASSWORD}).status_code == 200
+
+    assert client.get('/api/bookings/', headers={**headers, 'If-None-Match': etag}).status_code == 304
+
+
+def test_user_etag_follows_last_login(app, client, make_user, auth_headers):
+    admin = make_user('admin')
+    patient = make_user('patient')
+    headers = auth_headers(admin)
+    etag = client.get(f'/api/users/{patient}', headers=headers).headers['ETag']
+    with app.app_context():
+        username = db.session.get(User, patient).username
+
+    client.post('/api/auth/login', json={'username': username, 'password': PASSWORD})
+
+    response = client.get(f'/api/users/{patient}', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['last_login'] is not None
+
+
+def test_booking_etag_follows_allocated_resources(app, client, make_user, auth_headers):
+    admin = make_user('admin')
+    booking_id = make_booking(app, make_user('patient'), make_user('doctor'))
+    with app.app_context():
+        theatre = Resource(type='operation_theatre', name='Theatre 1', ot_number='1')
+        db.session.add(theatre)
+        db.session.flush()
+        db.session.add(BookingResource(booking_id=booking_id, resource_id=theatre.id, resource_type=theatre.type))
+        db.session.commit()
+        theatre_id = theatre.id
+    headers = auth_headers(admin)
+    etag = client.get('/api/bookings/', headers=headers).headers['ETag']
+
+    with app.app_context():
+        db.session.get(Resource, theatre_id).name = 'Theatre A'
+        db.session.commit()
+
+    response = client.get('/api/bookings/', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['bookings'][0]['allocated_resources'][0]['resource_name'] == 'Theatre A'
@@ -0,0 +1,20 @@
+def test_slow_queries_are_scoped_to_the_callers_hospital(app, client, make_hospital, make_user, auth_headers):
+    first, second = make_hospital(), make_hospital()
+    first_admin, second_admin, platform_admin = make_user('admin', first), make_user('admin', second), make_user('admin')
+    app.config.update(SLOW_QUERY_LOG_ENABLED=True, SLOW_QUERY_MS=0, SLOW_QUERY_EXPLAIN_SAMPLE=0)
+
+    client.get('/api/bookings/', headers=auth_headers(first_admin))
+    client.get('/api/bookings/', headers=auth_headers(second_admin))
+
+    def hospitals(user_id):
+        response = client.get('/api/diagnostics/slow-queries?endpoint=bookings.get_all_bookings&limit=1000',
+                              headers=auth_headers(user_id))
+        return {entry['hospital_id'] for entry in response.get_json()['slow_queries']}
+
+    assert hospitals(first_admin) == {first}
+    assert hospitals(second_admin) == {second}
+    assert {first, second} <= hospitals(platform_admin)
+
+    client.delete('/api/diagnostics/slow-queries', headers=auth_headers(first_admin))
+    assert hospitals(first_admin) == set()
+    assert second in hospitals(platform_admin)
@@ -0,0 +1,46 @@
+from datetime import date
+
+from app import db
+from app.models.discharge import Discharge
+
+
+def make_discharge(app, patient_id, doctor_id, **fields):
+    with app.app_context():
+        discharge = Discharge(
+            patient_id=patient_id,
+            doctor_id=doctor_id,
+            admission_date=date(2026, 1, 1),
+            discharge_date=date(2026, 1, 5),
+            **fields
+        )
+        db.session.add(discharge)
+        db.session.commit()
+        return discharge.id
+
+
+def test_snippet_escapes_clinical_text(app, client, make_user, auth_headers):
+    admin = make_user('admin')
+    patient = make_user('patient')
+    doctor = make_user('doctor')
+    make_discharge(app, patient, doctor, diagnosed_disease='Dehydration',
+                   treatment_summary='IV fluids <script>alert(1)</script> given')
+
+    response = client.get('/api/discharges/search?q=script', headers=auth_headers(admin))
+
+    assert response.status_code == 200
+    snippet = response.get_json()['results'][0]['snippet']
+    assert '<script>' not in snippet
+    assert '&lt;<mark>script</mark>&gt;alert(1)&lt;/<mark>script</mark>&gt;' in snippet
+
+
+def test_search_is_scoped_to_the_callers_hospital(app, client, make_hospital, make_user, auth_headers):
+    first, second = make_hospital(), make_hospital()
+    admin = make_user('admin', first)
+    make_discharge(app, make_user('patient', first), make_user('doctor', first), diagnosed_disease='Malaria')
+    make_discharge(app, make_user('patient', second), make_user('doctor', second), diagnosed_disease='Secret malaria')
+
+    response = client.get('/api/discharges/search?q=malaria', headers=auth_headers(admin))
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['diagnosed_disease'] for result in results] == ['Malaria']
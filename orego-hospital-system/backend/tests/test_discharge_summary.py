@@ -0,0 +1,28 @@
+from datetime import date
+
+from app import db
+from app.models.discharge import Discharge
+from app.models.user import User
+
+
+def test_summary_is_rerendered_after_a_patient_rename(app, client, make_user, auth_headers):
+    admin = make_user('admin')
+    patient = make_user('patient', name='Old Name')
+    with app.app_context():
+        discharge = Discharge(patient_id=patient, doctor_id=make_user('doctor'),
+                              admission_date=date(2026, 1, 1), discharge_date=date(2026, 1, 5))
+        db.session.add(discharge)
+        db.session.commit()
+        path = f'/api/discharges/{discharge.id}/summary'
+    headers = auth_headers(admin)
+
+    first = client.get(path, headers=headers)
+    assert 'Old Name' in first.get_data(as_text=True)
+
+    with app.app_context():
+        db.session.get(User, patient).name = 'New Name'
+        db.session.commit()
+
+    second = client.get(path, headers=headers)
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert 'New Name' in second.get_data(as_text=True)
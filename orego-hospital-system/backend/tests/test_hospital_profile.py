@@ -0,0 +1,31 @@
+import uuid
+
+from app.utils.query_budget import query_budget
+
+
+def test_unknown_hospital_ids_are_answered_from_the_cache(client, make_hospital):
+    hospital_id = make_hospital()
+
+    with query_budget(1) as budget:
+        for _ in range(5):
+            assert client.get(f'/api/hospital/?hospital_id={uuid.uuid4()}').status_code == 404
+    assert budget.count == 1
+
+    with query_budget(1):
+        response = client.get(f'/api/hospital/?hospital_id={hospital_id}')
+    assert response.status_code == 200
+    assert response.get_json()['id'] == hospital_id
+
+
+def test_new_hospitals_are_found_after_create(client, make_hospital, make_user, auth_headers):
+    assert client.get(f'/api/hospital/?hospital_id={uuid.uuid4()}').status_code == 404
+
+    admin = make_user('admin')
+    response = client.post('/api/hospital/', headers=auth_headers(admin), json={
+        'name': 'Colombo General', 'address': 'Colombo', 'phone_number': '0112345678',
+        'email': 'info@cgh.lk', 'registration_number': 'CGH-1'
+    })
+    assert response.status_code in (200, 201), response.get_json()
+    hospital_id = response.get_json()['hospital']['id']
+
+    assert client.get(f'/api/hospital/?hospital_id={hospital_id}').status_code == 200
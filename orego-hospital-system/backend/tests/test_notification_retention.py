@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from app import db
+from app.models.notification import BroadcastNotification, BroadcastReceipt, NotificationCounter
+from app.models.user import User
+from app.services import notification_retention, notification_service
+
+
+def test_expired_broadcasts_are_purged_with_their_receipts(app, make_user):
+    reader, other = make_user('patient'), make_user('patient')
+    with app.app_context():
+        expiring = notification_service.broadcast('Ward closed', 'Ward 3 is closed today', 'alert')
+        kept = notification_service.broadcast('Discharges', 'New discharge desk', 'discharge')
+        db.session.commit()
+        notification_service.mark_broadcast_read(db.session.get(User, reader), expiring)
+        notification_service.mark_broadcast_read(db.session.get(User, reader), kept)
+        db.session.commit()
+        expiring, kept = expiring.id, kept.id
+        assert db.session.get(NotificationCounter, other).unread_count == 2
+
+        # Past the 30 days of alerts, within the 365 of discharges
+        later = datetime.utcnow() + timedelta(days=31)
+        dry_run = notification_retention.purge_expired_broadcasts(dry_run=True, now=later)
+        assert dry_run['alert'] == {'broadcasts': 1, 'receipts': 1}
+        assert db.session.get(BroadcastNotification, expiring) is not None
+
+        purged = notification_retention.purge_expired_broadcasts(batch_size=1, now=later)
+
+        assert purged['alert'] == {'broadcasts': 1, 'receipts': 1}
+        assert purged['discharge'] == {'broadcasts': 0, 'receipts': 0}
+        assert db.session.get(BroadcastNotification, expiring) is None
+        assert db.session.get(BroadcastNotification, kept) is not None
+        assert BroadcastReceipt.query.filter_by(broadcast_id=expiring).count() == 0
+        # The unread broadcast left the other user's counter; the reader's had already dropped it
+        for user_id, unread in ((reader, 0), (other, 1)):
+            user = db.session.get(User, user_id)
+            assert notification_service.unread_count(user) == notification_service.compute_unread_count(user) == unread
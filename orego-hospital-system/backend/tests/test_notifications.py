@@ -0,0 +1,57 @@
+import re
+from datetime import datetime
+
+from app import db
+from app.models.notification import Notification, NotificationCounter
+from app.services import notification_events, notification_service
+
+
+def test_counter_row_is_created_with_the_user(app, make_user):
+    user_id = make_user('patient')
+
+    with app.app_context():
+        counter = db.session.get(NotificationCounter, user_id)
+        assert counter is not None and counter.unread_count == 0
+
+        # The first notification is counted, not lost to a counter row that does not exist yet
+        db.session.add(Notification(recipient_id=user_id, title='Hi', message='Hello', type='general'))
+        db.session.commit()
+        assert db.session.get(NotificationCounter, user_id).unread_count == 1
+
+
+def test_unread_count_never_writes(app, client, make_user, auth_headers):
+    user_id = make_user('patient')
+    with app.app_context():
+        db.session.add(Notification(recipient_id=user_id, title='Hi', message='Hello', type='general'))
+        db.session.delete(db.session.get(NotificationCounter, user_id))
+        db.session.commit()
+
+    response = client.get('/api/notifications/unread-count', headers=auth_headers(user_id))
+
+    assert response.get_json() == {'unread_count': 1}
+    with app.app_context():
+        # Users without a row (bulk loads) are counted live until repair-counters creates it
+        assert db.session.get(NotificationCounter, user_id) is None
+        assert notification_service.repair_unread_counters(user_id) == 1
+        assert db.session.get(NotificationCounter, user_id).unread_count == 1
+
+
+def test_stream_replays_notifications_sharing_a_timestamp(app, client, make_user, auth_headers):
+    user_id = make_user('patient')
+    created_at = datetime(2026, 5, 1, 12, 0, 0)
+    with app.app_context():
+        notifications = [
+            Notification(recipient_id=user_id, title=f'N{n}', message='Hello', type='general', created_at=created_at)
+            for n in range(3)
+        ]
+        db.session.add_all(notifications)
+        db.session.commit()
+        first, *rest = sorted(notifications, key=lambda notification: notification.id)
+        seen = notification_events.event_id_for(first)
+        expected = [notification_events.event_id_for(notification) for notification in rest]
+    app.config['NOTIFICATION_STREAM_MAX_SECONDS'] = 0
+
+    response = client.get('/api/notifications/stream', headers={**auth_headers(user_id), 'Last-Event-ID': seen})
+
+    body = response.get_data(as_text=True)
+    assert re.findall(r'^id: (.+)$', body, re.MULTILINE) == expected
@@ -0,0 +1,22 @@
+from datetime import date
+
+from app import db
+from app.models.discharge import Discharge
+from app.models.notification import Notification
+from app.services import outbox
+
+
+def test_dispatch_handlers_are_registered_by_init_app(app, make_user):
+    patient = make_user('patient')
+    doctor = make_user('doctor')
+
+    with app.app_context():
+        discharge = Discharge(patient_id=patient, doctor_id=doctor,
+                              admission_date=date(2026, 1, 1), discharge_date=date(2026, 1, 5))
+        db.session.add(discharge)
+        db.session.flush()
+        outbox.record('discharge.created', discharge_id=discharge.id)
+        db.session.commit()
+
+        assert outbox.process_batch() == 1
+        assert [n.type for n in Notification.query.filter_by(recipient_id=patient)] == ['discharge']
@@ -0,0 +1,137 @@
+"""
+Every read endpoint's @query_budget holds at a handful of rows and past
+IN_CHUNK_SIZE rows. Budgets raise QueryBudgetExceeded under TESTING, which
+the test client propagates, so a 200 means the view stayed within its bound.
+"""
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models.booking import Booking, BookingResource
+from app.models.discharge import Discharge
+from app.models.notification import Notification
+from app.models.resource import Resource
+from app.models.user import User
+from app.schemas.base import IN_CHUNK_SIZE
+from app.utils.query_budget import QueryBudgetExceeded, query_budget
+
+SIZES = [3, IN_CHUNK_SIZE + 1]
+
+
+@pytest.fixture(params=SIZES, ids=['few', 'past-in-chunk'])
+def hospital(request, app, make_hospital, make_user):
+    """A hospital with `size` bookings, discharges, beds, patients and notifications"""
+    size = request.param
+    hospital_id = make_hospital()
+    people = {role: make_user(role, hospital_id) for role in ('admin', 'doctor', 'nurse', 'patient', 'staff')}
+
+    with app.app_context():
+        start = datetime(2026, 1, 1, 8)
+        beds = [
+            Resource(type='bed', name=f'Bed {n}', bed_number=str(n), ward_id='W1', hospital_id=hospital_id)
+            for n in range(size)
+        ]
+        patients = [
+            User(username=f'bulk-patient-{hospital_id}-{n}', password_hash='x', role='patient', name=f'Patient {n}',
+                 birthday=date(1990, 1, 1), id_card_number=f'P{n:08d}V', address='Colombo',
+                 phone_number='0771234567', email=f'p{n}@example.lk', hospital_id=hospital_id)
+            for n in range(size)
+        ]
+        db.session.add_all(beds + patients)
+        db.session.flush()
+
+        for n in range(size):
+            booking = Booking(
+                id=str(uuid.uuid4()), patient_id=people['patient'], doctor_id=people['doctor'],
+                booking_type='appointment', scheduled_date=start + timedelta(hours=n),
+                scheduled_end_date=start + timedelta(hours=n + 1), duration_hours=1, hospital_id=hospital_id
+            )
+            db.session.add(booking)
+            db.session.add_all([
+                BookingResource(booking_id=booking.id, resource_type='nurse', staff_id=people['nurse']),
+                BookingResource(booking_id=booking.id, resource_type='bed', resource_id=beds[n].id),
+            ])
+            db.session.add(Discharge(
+                patient_id=people['patient'], doctor_id=people['doctor'], admission_date=date(2026, 1, 1),
+                discharge_date=date(2026, 1, 3), diagnosed_disease='Dengue fever', bed_id=beds[n].id,
+                hospital_id=hospital_id
+            ))
+            db.session.add(Notification(
+                recipient_id=people['patient'], title='Booking Scheduled', message='Scheduled', type='booking',
+                hospital_id=hospital_id
+            ))
+        db.session.commit()
+
+    return {'size': size, 'people': people}
+
+
+@pytest.mark.parametrize('role, path, key', [
+    ('admin', '/api/bookings/', 'bookings'),
+    ('patient', '/api/bookings/', 'bookings'),
+    ('doctor', '/api/bookings/', 'bookings'),
+    ('nurse', '/api/bookings/', 'bookings'),
+    ('admin', '/api/discharges/?include=bed_info', 'discharges'),
+    ('doctor', '/api/discharges/', 'discharges'),
+    ('admin', '/api/users/', 'users'),
+    ('admin', '/api/users/patients', 'patients'),
+    ('admin', '/api/resources/', 'resources'),
+    ('admin', '/api/resources/beds', 'beds'),
+    ('patient', '/api/notifications/', 'notifications'),
+])
+def test_list_endpoints_stay_within_budget(client, auth_headers, hospital, role, path, key):
+    response = client.get(path, headers=auth_headers(hospital['people'][role]))
+
+    assert response.status_code == 200, response.get_json()
+    assert len(response.get_json()[key]) >= hospital['size']
+
+
+def test_nested_collections_are_complete_past_in_chunk(client, auth_headers, hospital):
+    response = client.get('/api/bookings/', headers=auth_headers(hospital['people']['admin']))
+
+    bookings = response.get_json()['bookings']
+    assert len(bookings) == hospital['size']
+    assert all(
+        sorted(allocation['resource_type'] for allocation in booking['allocated_resources']) == ['bed', 'nurse']
+        for booking in bookings
+    )
+    assert all(booking['allocated_resources'][0]['booking_id'] == booking['id'] for booking in bookings)
+
+
+def test_nested_subquery_keeps_tenant_scope(app, client, auth_headers, make_hospital, make_user, hospital):
+    # Another hospital's bookings must not be loaded (or attached) through the nested IN subquery
+    other = make_hospital()
+    patient, doctor = make_user('patient', other), make_user('doctor', other)
+    with app.app_context():
+        booking = Booking(patient_id=patient, doctor_id=doctor, booking_type='test', duration_hours=1,
+                          scheduled_date=datetime(2026, 2, 1, 9), scheduled_end_date=datetime(2026, 2, 1, 10),
+                          hospital_id=other)
+        db.session.add(booking)
+        db.session.flush()
+        db.session.add(BookingResource(booking_id=booking.id, resource_type='nurse', staff_id=make_user('nurse', other)))
+        db.session.commit()
+
+    with query_budget(8) as budget:
+        response = client.get('/api/bookings/', headers=auth_headers(hospital['people']['admin']))
+
+    assert len(response.get_json()['bookings']) == hospital['size']
+    assert all('hospital_id' in statement for statement in budget.statements if 'FROM booking_resources' in statement)
+
+
+def test_budget_overrun_raises_with_the_statements(app):
+    with app.app_context():
+        with pytest.raises(QueryBudgetExceeded) as error:
+            with query_budget(1):
+                db.session.execute(db.select(User.id)).all()
+                db.session.execute(db.select(Booking.id)).all()
+
+    assert len(error.value.statements) == 2
+
+
+def test_streamed_lists_match_buffered(client, auth_headers, hospital):
+    headers = auth_headers(hospital['people']['admin'])
+    for path, key in [('/api/bookings/', 'bookings'), ('/api/discharges/', 'discharges')]:
+        buffered = client.get(path, headers=headers).get_json()[key]
+        streamed = client.get(f'{path}?stream=json', headers=headers).get_json()[key]
+        assert streamed == buffered
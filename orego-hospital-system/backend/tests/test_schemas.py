@@ -0,0 +1,28 @@
+import pytest
+
+from app.schemas.booking import BookingSchema
+from app.schemas.user import UserSchema
+
+
+@pytest.mark.parametrize('query', ['?fields=', '?fields=,', '?fields=%20'])
+def test_empty_fields_returns_full_records(client, make_user, auth_headers, query):
+    admin = make_user('admin')
+
+    response = client.get(f'/api/users/{query}', headers=auth_headers(admin))
+
+    assert response.status_code == 200
+    assert set(response.get_json()['users'][0]) == set(UserSchema.keys())
+
+
+def test_unknown_fields_are_rejected(client, make_user, auth_headers):
+    admin = make_user('admin')
+
+    response = client.get('/api/users/?fields=id,password_hash', headers=auth_headers(admin))
+
+    assert response.status_code == 400
+
+
+def test_subset_needs_at_least_one_field():
+    with pytest.raises(ValueError):
+        BookingSchema.subset(fields=[])
+    assert BookingSchema.subset(fields=[], include=['allocated_resources']).keys() == ['allocated_resources']
@@ -0,0 +1,57 @@
+from app import db
+from app.models.resource import Resource
+
+
+def make_bed(app, hospital_id, status='booked'):
+    with app.app_context():
+        bed = Resource(type='bed', name='Bed 1', bed_number='1', status=status, hospital_id=hospital_id)
+        db.session.add(bed)
+        db.session.commit()
+        return bed.id
+
+
+def test_discharge_cannot_release_another_hospitals_bed(app, client, make_hospital, make_user, auth_headers):
+    first, second = make_hospital(), make_hospital()
+    admin = make_user('admin', first)
+    other_bed = make_bed(app, second)
+
+    response = client.post('/api/discharges/create', headers=auth_headers(admin), json={
+        'patient_id': make_user('patient', first),
+        'doctor_id': make_user('doctor', first),
+        'admission_date': '2026-01-01',
+        'discharge_date': '2026-01-05',
+        'bed_id': other_bed
+    })
+
+    assert response.status_code == 404
+    with app.app_context():
+        assert db.session.get(Resource, other_bed).status == 'booked'
+
+
+def test_discharge_releases_the_callers_bed(app, client, make_hospital, make_user, auth_headers):
+    hospital = make_hospital()
+    admin = make_user('admin', hospital)
+    bed = make_bed(app, hospital)
+    with app.app_context():
+        machine = Resource(type='machine', name='MRI', serial_number='SN-1', status='booked', hospital_id=hospital)
+        db.session.add(machine)
+        db.session.commit()
+        machine = machine.id
+    discharge = {
+        'patient_id': make_user('patient', hospital),
+        'doctor_id': make_user('doctor', hospital),
+        'admission_date': '2026-01-01',
+        'discharge_date': '2026-01-05'
+    }
+
+    response = client.post('/api/discharges/create', headers=auth_headers(admin), json={**discharge, 'bed_id': machine})
+    assert response.status_code == 400
+
+    response = client.post('/api/discharges/create', headers=auth_headers(admin), json={**discharge, 'bed_id': bed})
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['released']['resources'] == 1
+    assert body['discharge']['bed_info']['id'] == bed
+    with app.app_context():
+        assert db.session.get(Resource, bed).status == 'available'
+        assert db.session.get(Resource, machine).status == 'booked'
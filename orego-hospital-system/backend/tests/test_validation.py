@@ -0,0 +1,38 @@
+import pytest
+
+from app import db
+from app.models.booking import Booking
+from app.models.resource import Resource
+
+
+def test_create_booking_rejects_unknown_booking_type(app, client, make_user, auth_headers):
+    admin = make_user('admin')
+    response = client.post('/api/bookings/create', headers=auth_headers(admin), json={
+        'patient_id': make_user('patient'),
+        'doctor_id': make_user('doctor'),
+        'booking_type': 'vaccination',
+        'scheduled_date': '2026-03-01T09:00:00',
+        'duration_hours': 1
+    })
+
+    assert response.status_code == 400
+    assert 'booking_type must be one of' in response.get_json()['error']
+    with app.app_context():
+        assert db.session.query(Booking).count() == 0
+
+
+@pytest.mark.parametrize('method, path', [('POST', '/api/resources/register'), ('PUT', '/api/resources/{id}')])
+def test_resource_status_must_be_known(app, client, make_user, auth_headers, method, path):
+    with app.app_context():
+        resource = Resource(type='bed', name='Bed 1', bed_number='B1')
+        db.session.add(resource)
+        db.session.commit()
+        resource_id = resource.id
+
+    response = client.open(path.format(id=resource_id), method=method, headers=auth_headers(make_user('admin')),
+                           json={'type': 'bed', 'name': 'Bed 2', 'bed_number': 'B2', 'status': 'broken'})
+
+    assert response.status_code == 400
+    assert 'Status must be one of' in response.get_json()['error']
+    with app.app_context():
+        assert [r.status for r in db.session.query(Resource)] == ['available']
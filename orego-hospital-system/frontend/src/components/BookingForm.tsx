@@ -71,11 +71,11 @@ const BookingForm: React.FC<BookingFormProps> = ({ open, onClose, onSuccess }) =
     try {
       setLoadingData(true);
       const [patientsData, doctorsData, nursesData, staffData, resourcesData] = await Promise.all([
-        userService.getPatients(),
-        userService.getDoctors(),
-        userService.getNurses(),
-        userService.getStaff(),
-        resourceService.getAllResources(),
+        userService.getPatients(['id', 'name', 'id_card_number']),
+        userService.getDoctors(['id', 'name', 'speciality']),
+        userService.getNurses(['id', 'name']),
+        userService.getStaff(['id', 'name', 'speciality']),
+        resourceService.getAllResources(undefined, undefined, ['id', 'type', 'name', 'status', 'location']),
       ]);
       
       setPatients(patientsData.patients || []);
@@ -55,9 +55,9 @@ const DischargeForm: React.FC<DischargeFormProps> = ({ open, onClose, onSuccess
     try {
       setLoadingData(true);
       const [patientsData, doctorsData, resourcesData] = await Promise.all([
-        userService.getPatients(),
-        userService.getDoctors(),
-        resourceService.getAllResources('bed'),
+        userService.getPatients(['id', 'name', 'id_card_number']),
+        userService.getDoctors(['id', 'name', 'speciality']),
+        resourceService.getAllResources('bed', undefined, ['id', 'name', 'location']),
       ]);
       
       setPatients(patientsData.patients || []);
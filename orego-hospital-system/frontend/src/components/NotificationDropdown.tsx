@@ -79,7 +79,6 @@ const NotificationDropdown: React.FC<NotificationDropdownProps> = ({ onNotificat
           notif.id === notificationId ? { ...notif, is_read: true } : notif
         )
       );
-      setUnreadCount(prev => Math.max(0, prev - 1));
       onNotificationUpdate?.();
     } catch (error) {
       console.error('Failed to mark notification as read:', error);
@@ -92,7 +91,6 @@ const NotificationDropdown: React.FC<NotificationDropdownProps> = ({ onNotificat
       setNotifications(prev => 
         prev.map(notif => ({ ...notif, is_read: true }))
       );
-      setUnreadCount(0);
       onNotificationUpdate?.();
     } catch (error) {
       console.error('Failed to mark all notifications as read:', error);
@@ -103,11 +101,7 @@ const NotificationDropdown: React.FC<NotificationDropdownProps> = ({ onNotificat
     event.stopPropagation();
     try {
       await notificationService.deleteNotification(notificationId);
-      const wasUnread = notifications.find(n => n.id === notificationId)?.is_read === false;
       setNotifications(prev => prev.filter(notif => notif.id !== notificationId));
-      if (wasUnread) {
-        setUnreadCount(prev => Math.max(0, prev - 1));
-      }
       onNotificationUpdate?.();
     } catch (error) {
       console.error('Failed to delete notification:', error);
@@ -135,13 +129,34 @@ const NotificationDropdown: React.FC<NotificationDropdownProps> = ({ onNotificat
     }
   };
 
-  // Initial load and periodic refresh
+  // Initial load, then live updates pushed over Server-Sent Events.
+  // The unread badge is driven entirely by the stream's unread_count events.
   useEffect(() => {
     fetchNotifications();
     
-    // Refresh notifications every 30 seconds
-    const interval = setInterval(fetchNotifications, 30000);
-    return () => clearInterval(interval);
+    const stream = notificationService.openStream();
+    
+    stream.addEventListener('notification', (event) => {
+      const notification: Notification = JSON.parse((event as MessageEvent).data);
+      if ((notification as any).truncated) {
+        fetchNotifications();
+        return;
+      }
+      setNotifications(prev =>
+        prev.some(n => n.id === notification.id) ? prev : [notification, ...prev]
+      );
+    });
+    
+    stream.addEventListener('unread_count', (event) => {
+      const data = JSON.parse((event as MessageEvent).data);
+      if (data.unread_count !== undefined) {
+        setUnreadCount(data.unread_count);
+      } else if (data.delta !== undefined) {
+        setUnreadCount(prev => Math.max(0, prev + data.delta));
+      }
+    });
+    
+    return () => stream.close();
   }, []);
 
   return (
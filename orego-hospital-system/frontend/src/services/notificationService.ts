@@ -11,6 +11,17 @@ export const notificationService = {
     return response.data;
   },
 
+  getUnreadCount: async (): Promise<number> => {
+    const response = await api.get('/notifications/unread-count');
+    return response.data.unread_count;
+  },
+
+  openStream: (): EventSource => {
+    // EventSource cannot set headers, so the access token travels as ?jwt=
+    const token = localStorage.getItem('access_token') || '';
+    return new EventSource(`${api.defaults.baseURL}/notifications/stream?jwt=${encodeURIComponent(token)}`);
+  },
+
   markAsRead: async (notificationId: string) => {
     const response = await api.post(`/notifications/${notificationId}/read/`);
     return response.data;
@@ -0,0 +1,36 @@
+import api from './api';
+import { ReferenceData } from '../types';
+
+const STORAGE_KEY = 'reference_data';
+
+let pending: Promise<ReferenceData> | null = null;
+
+const readStored = (): ReferenceData | null => {
+  try {
+    const stored = localStorage.getItem(STORAGE_KEY);
+    return stored ? JSON.parse(stored) : null;
+  } catch {
+    return null;
+  }
+};
+
+export const referenceService = {
+  // One request per page load; the ETag makes it a 304 unless the bundle changed
+  getReference: (): Promise<ReferenceData> => {
+    if (!pending) {
+      pending = api
+        .get<ReferenceData>('/reference')
+        .then((response) => {
+          localStorage.setItem(STORAGE_KEY, JSON.stringify(response.data));
+          return response.data;
+        })
+        .catch((error) => {
+          pending = null;
+          const stored = readStored();
+          if (stored) return stored;
+          throw error;
+        });
+    }
+    return pending;
+  },
+};
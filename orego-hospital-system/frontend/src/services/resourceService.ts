@@ -7,10 +7,11 @@ export const resourceService = {
     return response.data;
   },
 
-  getAllResources: async (type?: string, status?: string) => {
+  getAllResources: async (type?: string, status?: string, fields?: string[]) => {
     const params = new URLSearchParams();
     if (type) params.append('type', type);
     if (status) params.append('status', status);
+    if (fields) params.append('fields', fields.join(','));
     
     const response = await api.get(`/resources/?${params.toString()}`);
     return response.data;
@@ -1,5 +1,6 @@
 import api from './api';
 import { User } from '../types';
+import { referenceService } from './referenceService';
 
 export const userService = {
   registerUser: async (userData: any) => {
@@ -38,27 +39,43 @@ export const userService = {
   },
 
   getSpecialities: async () => {
-    const response = await api.get('/users/specialities');
-    return response.data;
+    const reference = await referenceService.getReference();
+    return { specialities: reference.specialities };
   },
 
-  getDoctors: async () => {
-    const response = await api.get('/users/doctors');
+  // fields limits the columns the backend selects, e.g. ['id', 'name'] for pickers
+  getDoctors: async (fields?: string[]) => {
+    const params = new URLSearchParams();
+    if (fields) params.append('fields', fields.join(','));
+    
+    const response = await api.get(`/users/doctors?${params.toString()}`);
     return response.data;
   },
 
-  getNurses: async () => {
-    const response = await api.get('/users/nurses');
+  // fields limits the columns the backend selects, e.g. ['id', 'name'] for pickers
+  getNurses: async (fields?: string[]) => {
+    const params = new URLSearchParams();
+    if (fields) params.append('fields', fields.join(','));
+    
+    const response = await api.get(`/users/nurses?${params.toString()}`);
     return response.data;
   },
 
-  getStaff: async () => {
-    const response = await api.get('/users/staff');
+  // fields limits the columns the backend selects, e.g. ['id', 'name'] for pickers
+  getStaff: async (fields?: string[]) => {
+    const params = new URLSearchParams();
+    if (fields) params.append('fields', fields.join(','));
+    
+    const response = await api.get(`/users/staff?${params.toString()}`);
     return response.data;
   },
 
-  getPatients: async () => {
-    const response = await api.get('/users/patients');
+  // fields limits the columns the backend selects, e.g. ['id', 'name'] for pickers
+  getPatients: async (fields?: string[]) => {
+    const params = new URLSearchParams();
+    if (fields) params.append('fields', fields.join(','));
+    
+    const response = await api.get(`/users/patients?${params.toString()}`);
     return response.data;
   },
 };
@@ -11,6 +11,7 @@ export interface User {
   speciality?: string;
   medical_status?: string;
   operation_type?: string;
+  hospital_id?: string | null;
   is_active: boolean;
   created_at: string;
   last_login?: string;
@@ -86,6 +87,7 @@ export interface Notification {
   type: 'booking' | 'discharge' | 'alert' | 'general';
   is_read: boolean;
   related_id?: string;
+  is_broadcast?: boolean;
   created_at: string;
 }
 
@@ -120,3 +122,16 @@ export interface AuthResponse {
   refresh_token: string;
   user: User;
 }
+
+export interface ReferenceData {
+  version: string;
+  specialities: string[];
+  operation_types: string[];
+  roles: string[];
+  resource_types: string[];
+  resource_statuses: string[];
+  allocation_types: string[];
+  booking_types: string[];
+  booking_statuses: string[];
+  notification_types: string[];
+}